@@ -37,14 +37,59 @@ class Settings(BaseSettings):
     model_endpoint: str | None = None
     model_timeout: int = 60
     model_max_retries: int = 3
+    model_micro_batch_size: int = 8  # Prompts sent to the model in one batched request
+    model_concurrency_initial: int = 4  # Model calls in flight before the limit adapts
+    model_concurrency_max: int = 32  # Highest adaptive limit of model calls in flight
+    model_queue_size: int = 16  # Calls waiting for a slot; more fall back at once
+    model_queue_timeout: float = 5.0  # Seconds a call waits for a slot before falling back
+    model_latency_target: float = 30.0  # Slower model calls shrink the concurrency limit
+    model_breaker_failure_threshold: int = 5  # Connection failures in a row that open the circuit
+    model_breaker_recovery_timeout: float = 30.0  # Seconds an open circuit waits for a trial call
+    model_endpoints: str | None = None  # Comma-separated model servers to balance over
+    model_hedge_percentile: float = 95.0  # Calls slower than this latency percentile are hedged
+    model_hedge_budget: float = 0.1  # Largest share of model calls that may be hedged
+    model_probe_interval: float = 15.0  # Seconds between background model connectivity probes
+    model_probe_timeout: float = 2.0  # Seconds a connectivity probe waits for a model server
+    context_max_tokens: int = 2048  # Token budget of an engineered generation prompt
+    context_asset_cache_size: int = 4096  # Asset summaries kept for prompt packing
+    asset_retrieval_top_k: int = 8  # Project assets retrieved into each prompt by similarity
+    asset_retrieval_min_score: float = 0.2  # Least similarity of a retrieved asset to the prompt
+    asset_embedding_model: str | None = None  # sentence-transformers model; None hashes words
 
     # File Upload
     max_upload_size: int = 100 * 1024 * 1024  # 100MB
     allowed_image_types: list = ["image/jpeg", "image/png", "image/gif", "image/webp"]
     allowed_audio_types: list = ["audio/mpeg", "audio/wav", "audio/ogg", "audio/webm"]
     allowed_video_types: list = ["video/mp4", "video/webm", "video/ogg"]
+    max_bulk_upload_size: int = 1024 * 1024 * 1024  # 1GB per archive
+    bulk_upload_concurrency: int = 8  # Parallel sanitize/upload workers per bulk job
+    bulk_upload_max_entries: int = 5000  # Maximum files accepted from one bulk upload
+    asset_cache_max_age: int = 3600  # Cache-Control max-age for streamed asset content
     # Processing
     background_task_timeout: int = 300  # 5 minutes
+    export_asset_concurrency: int = 8  # Parallel asset downloads per export
+    scene_cache_max_bytes: int = 64 * 1024 * 1024  # Serialized scenes kept in memory
+    precompress_scenes: bool = True  # Compress scene JSON once, on first read
+    compression_minimum_size: int = 1024  # Smallest response body worth compressing
+    scene_snapshot_interval: int = 20  # Full scene snapshot every N versions
+    collab_tick_rate: int = 20  # Collaborative edit batches broadcast per second
+    collab_persist_interval: float = 2.0  # Seconds between saves of live-edited scenes
+    collab_max_queue: int = 256  # Messages queued per subscriber before it is dropped
+    collab_backplane: str = "memory"  # "memory" (single worker) or "postgres" (LISTEN/NOTIFY)
+    validate_playability: bool = True  # Check goal reachability of every generated scene
+    playability_cell_size: int = 16  # Pixels per navigation grid cell
+    playability_max_cells: int = 4_000_000  # Larger levels are rasterized with coarser cells
+    playability_jump_height: float = 128.0  # Highest jump of the player, in pixels
+    playability_jump_distance: float = 192.0  # Widest gap the player can jump across
+    playability_cache_size: int = 256  # Navigation graphs kept in memory
+    simulate_physics: bool = False  # Run the physics sanity simulation on generated scenes
+    physics_sim_steps: int = 120  # Fixed timesteps simulated per scene
+    physics_sim_timestep: float = 1 / 60  # Seconds per simulated step
+    physics_sim_gravity: float = 980.0  # Pixels per second squared
+    physics_sim_max_drift: float = 32.0  # Pixels an entity may settle from its spawn
+    generation_batch_max_size: int = 50  # Scenes one batch generation request may produce
+    generation_job_concurrency: int = 4  # Generation jobs calling each model endpoint at once
+    generation_job_heartbeat: float = 15.0  # Seconds between keep-alives on job event streams
 
     class Config:
         env_file = ".env"
@@ -10,6 +10,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import settings
+from .utils.serialization import dumps_str, loads
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,9 @@ engine = create_engine(
     pool_size=10,
     max_overflow=20,
     echo=settings.debug,  # Log SQL queries in debug mode
+    # Scenes and generation payloads are large JSON documents; use orjson for them
+    json_serializer=dumps_str,
+    json_deserializer=loads,
 )
 
 # Create SessionLocal class
@@ -11,7 +11,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
 from .database import init_db
-from .routers import assets, export, generation, health, projects
+from .routers import assets, export, generation, health, projects, scenes
+from .services.collaboration import collaboration_hub
+from .services.generation_jobs import generation_jobs
+from .services.inference_client import inference_client
+from .utils.compression import CompressionMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -39,9 +43,13 @@ async def lifespan(_: FastAPI):
             # Continue anyway in development, but in production this should fail
             if not settings.debug:
                 raise
+    inference_client.start_prober()
     yield
     # Shutdown
     logger.info("Shutting down OSSGameForge Backend...")
+    await collaboration_hub.close()
+    await generation_jobs.close()
+    await inference_client.close()
 
 
 # Create FastAPI app
@@ -61,6 +69,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiate gzip/brotli/zstd for API responses
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
 # Include health router for comprehensive health checks
 app.include_router(health.router, prefix="/health", tags=["Health"])
 
@@ -78,4 +89,5 @@ async def root():
 app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(assets.router, prefix="/api", tags=["Assets"])
 app.include_router(generation.router, prefix="/api/generation", tags=["Generation"])
+app.include_router(scenes.router, prefix="/api/scenes", tags=["Scenes"])
 app.include_router(export.router, prefix="/api", tags=["Export"])
@@ -0,0 +1,31 @@
+"""
+Scene version history model
+
+Each edit of a scene is stored as a JSON Patch against the previous
+version, with a full snapshot every ``settings.scene_snapshot_interval``
+versions so any version can be rebuilt from a bounded number of patches.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class SceneVersion(Base):
+    __tablename__ = "scene_versions"
+    __table_args__ = (UniqueConstraint("scene_id", "version", name="uq_scene_versions_version"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Type follows scenes.id
+    scene_id = Column(ForeignKey("scenes.id", ondelete="CASCADE"), nullable=False, index=True)
+    version = Column(Integer, nullable=False)
+    # Full scene data, on snapshot versions
+    snapshot = Column(JSON(none_as_null=True), nullable=True)
+    # JSON Patch from the previous version
+    patch = Column(JSON(none_as_null=True), nullable=True)
+    patch_size = Column(Integer, nullable=False, default=0)  # Serialized patch bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
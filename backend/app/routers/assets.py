@@ -4,6 +4,8 @@ Assets router for OSSGameForge API
 
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 from uuid import uuid4
 
@@ -14,17 +16,29 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Request,
+    Response,
     UploadFile,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..database import get_db
-from ..schemas.asset import AssetResponse, AssetUploadResponse
+from ..schemas.asset import (
+    AssetResponse,
+    AssetUploadResponse,
+    BulkUploadResponse,
+    BulkUploadStatus,
+)
 from ..services import asset_service
+from ..services.job_registry import JOB_COMPLETED, job_registry
+from ..utils.http import RangeNotSatisfiable, etag_matches, parse_range_header, quote_etag
+from ..utils.serialization import FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
 
@@ -139,6 +153,109 @@ async def upload_asset(
         ) from e
 
 
+async def _spool_upload(file: UploadFile, limit: int) -> tuple[str, int]:
+    """Copy an upload part to a temp file in chunks, enforcing a size limit"""
+    chunk_size = 1024 * 1024
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename or "").suffix) as tmp:
+        try:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > limit:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"{file.filename} exceeds maximum allowed size of {limit} bytes",
+                    )
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name, size
+
+
+@router.post(
+    "/projects/{project_id}/assets/bulk",
+    response_model=BulkUploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def bulk_upload_assets(
+    project_id: str,
+    background_tasks: BackgroundTasks,
+    files: list[UploadFile] = File(...),
+    user_consent: bool = Form(...),
+    tags: list[str] | None = Form(None),
+):
+    """
+    Upload many assets at once, as zip/tar archives and/or multiple file parts
+
+    Files are spooled to disk and imported by a background job; poll
+    ``GET /assets/bulk/{job_id}`` for progress.
+    """
+    # Validate user consent - CRITICAL SECURITY CHECK
+    if not user_consent:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User consent is mandatory and must be explicitly set to 'true'.",
+        )
+
+    if settings.mock_mode:
+        logger.info(f"Mock mode: simulating bulk upload of {len(files)} files")
+        job = job_registry.create("bulk_upload", total=len(files), project_id=project_id)
+        job_registry.update(
+            job["job_id"], status=JOB_COMPLETED, processed=len(files), result={"asset_ids": []}
+        )
+        return {
+            "job_id": job["job_id"],
+            "status": JOB_COMPLETED,
+            "files_received": len(files),
+            "message": "Bulk upload simulated (mock mode)",
+        }
+
+    sources: list[tuple[str, str, str | None]] = []
+    try:
+        for file in files:
+            filename = file.filename or "unknown_file"
+            limit = (
+                settings.max_bulk_upload_size
+                if asset_service.is_archive(filename, file.content_type)
+                else settings.max_upload_size
+            )
+            temp_path, _ = await _spool_upload(file, limit)
+            sources.append((filename, temp_path, file.content_type))
+    except BaseException:
+        for _, temp_path, _ in sources:
+            os.unlink(temp_path)
+        raise
+
+    job = job_registry.create("bulk_upload", project_id=project_id)
+    background_tasks.add_task(
+        asset_service.process_bulk_upload,
+        job_id=job["job_id"],
+        project_id=project_id,
+        sources=sources,
+        tags=tags,
+    )
+
+    logger.info(f"Bulk upload job {job['job_id']} accepted with {len(sources)} files")
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "files_received": len(sources),
+        "message": "Bulk upload accepted, processing in background",
+    }
+
+
+@router.get("/assets/bulk/{job_id}", response_model=BulkUploadStatus)
+async def get_bulk_upload_status(job_id: str):
+    """Get progress of a bulk upload job"""
+    job = job_registry.get(job_id)
+    if not job or job["kind"] != "bulk_upload":
+        raise HTTPException(status_code=404, detail="Bulk upload job not found")
+
+    return {**job, "asset_ids": (job["result"] or {}).get("asset_ids", [])}
+
+
 @router.get("/projects/{project_id}/assets", response_model=list[AssetResponse])
 async def list_project_assets(project_id: str, db: Session = Depends(get_db)):
     """List all assets for a project"""
@@ -196,3 +313,73 @@ async def get_asset(asset_id: str, db: Session = Depends(get_db)):
         "created_at": asset.created_at.isoformat() if asset.created_at else None,
         "updated_at": asset.updated_at.isoformat() if asset.updated_at else None,
     }
+
+
+@router.get("/assets/{asset_id}/content")
+async def get_asset_content(asset_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Stream asset bytes from storage
+
+    Supports single byte ranges (``Range``) for audio/video seeking and
+    conditional requests (``If-None-Match``). Data is piped from the storage
+    response in chunks and never buffered as a whole.
+    """
+    if settings.mock_mode:
+        raise HTTPException(status_code=404, detail="Asset content is not available in mock mode")
+
+    asset = asset_service.get_asset_by_id(db, asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    info = await run_in_threadpool(asset_service.get_asset_content_info, asset)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Asset content not found")
+
+    headers = {
+        "ETag": quote_etag(info.etag),
+        "Cache-Control": f"private, max-age={settings.asset_cache_max_age}",
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request.headers.get("if-none-match"), info.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = info.size
+    try:
+        byte_range = parse_range_header(request.headers.get("range"), size)
+    except RangeNotSatisfiable as e:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        ) from e
+
+    status_code = status.HTTP_200_OK
+    offset, length = 0, size
+    if byte_range:
+        start, end = byte_range
+        offset, length = start, end - start + 1
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+
+    media_type = (
+        (asset.asset_metadata or {}).get("content_type")
+        or info.content_type
+        or "application/octet-stream"
+    )
+    if length == 0:
+        return Response(content=b"", media_type=media_type, headers=headers)
+
+    try:
+        chunks = await run_in_threadpool(
+            asset_service.stream_asset_content, asset, offset=offset, length=length
+        )
+    except Exception as e:
+        logger.error(f"Failed to open asset {asset_id} content: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to read asset content"
+        ) from e
+
+    return StreamingResponse(
+        chunks, status_code=status_code, media_type=media_type, headers=headers
+    )
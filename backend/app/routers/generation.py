@@ -9,24 +9,49 @@ This module orchestrates the entire generation pipeline:
 4. Audit logging for all requests
 """
 
+import asyncio
 import hashlib
 import logging
+import math
 import time
 from typing import Any
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..database import get_db
-from ..models.core_models import Asset, GenerationLog, Scene
-from ..schemas.generation import GenerationRequest, GenerationResponse
+from ..models.core_models import GenerationLog
+from ..schemas.generation import (
+    BatchGenerationRequest,
+    BatchGenerationResponse,
+    GenerationJobAccepted,
+    GenerationJobStatus,
+    GenerationRequest,
+    GenerationResponse,
+)
+from ..services import scene_service
 from ..services.context_builder import context_builder
+from ..services.generation_jobs import (
+    JOB_KIND,
+    fetch_assets,
+    generation_jobs,
+    generation_metadata,
+    input_hash,
+    related_assets_by_prompt,
+)
 from ..services.inference_client import inference_client
+from ..services.job_registry import FINISHED_STATES, job_registry
 from ..services.postprocessor import postprocessor
+from ..services.scene_cache import scene_cache, serialize_scene
+from ..utils.http import quote_etag
+from ..utils.scene_codec import SCENE_BINARY_MEDIA_TYPE, encode_scene, wants_binary_scene
+from ..utils.serialization import FastJSONResponse, dumps_str, json_fragment
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 async def log_generation(
@@ -80,7 +105,7 @@ async def save_scene_to_db(
     db: Session, project_id: str, scene_data: dict[str, Any], generation_log_id: str | None = None
 ) -> None:
     """
-    Save generated scene to database
+    Save generated scene to database as the first version of a new scene
 
     Args:
         db: Database session
@@ -89,21 +114,37 @@ async def save_scene_to_db(
         generation_log_id: Associated generation log ID
     """
     try:
-        scene = Scene(
-            project_id=project_id,
-            name=scene_data.get("scene_name", "Untitled Scene"),
-            style=scene_data.get("style", "platformer"),
-            scene_data=scene_data,
-            generation_log_id=generation_log_id,
-        )
-        db.add(scene)
-        db.commit()
-        logger.info(f"Scene saved: {scene.id}")
+        scene_service.create_scene(db, project_id, scene_data, generation_log_id=generation_log_id)
     except Exception as e:
         logger.error(f"Failed to save scene: {e}")
         db.rollback()
 
 
+async def save_batch_to_db(
+    db: Session, project_id: str, logs: list[dict[str, Any]], scenes: list[dict[str, Any]]
+) -> None:
+    """
+    Log a batch of generations and save their scenes in one transaction
+
+    Args:
+        db: Database session
+        project_id: Project identifier
+        logs: GenerationLog fields of each generation
+        scenes: Complete data of each generated scene
+    """
+    try:
+        log_entries = [GenerationLog(**log) for log in logs]
+        db.add_all(log_entries)
+        db.flush()
+        scene_service.create_scenes(
+            db, project_id, scenes, generation_log_ids=[entry.id for entry in log_entries]
+        )
+        logger.info(f"Batch of {len(logs)} generations logged")
+    except Exception as e:
+        logger.error(f"Failed to save generation batch: {e}")
+        db.rollback()
+
+
 @router.post("/", response_model=GenerationResponse)
 async def generate_scene(
     request: GenerationRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
@@ -124,24 +165,15 @@ async def generate_scene(
     user_id = request.user_id or "anonymous"
 
     # Create input hash for deduplication
-    input_data = f"{request.prompt}_{request.project_id}_{request.style or 'default'}"
-    if request.assets:
-        input_data += f"_{'_'.join(request.assets)}"
-    input_hash = hashlib.sha256(input_data.encode()).hexdigest()[:16]
+    request_hash = input_hash(request.prompt, request.project_id, request.style, request.assets)
 
     try:
         # Step 1: Build context using ContextBuilder
         logger.info(f"Building context for project {request.project_id}")
 
         # Fetch assets from database if provided
-        assets_data = []
-        if request.assets:
-            assets = (
-                db.query(Asset)
-                .filter(Asset.id.in_(request.assets), Asset.project_id == request.project_id)
-                .all()
-            )
-            assets_data = [asset.to_dict() for asset in assets]
+        assets_data = fetch_assets(db, request.project_id, request.assets)
+        related = await related_assets_by_prompt(db, request.project_id, [request.prompt])
 
         context = context_builder.build_generation_prompt(
             user_prompt=request.prompt,
@@ -149,6 +181,7 @@ async def generate_scene(
             style=request.style,
             assets=assets_data,
             constraints=request.constraints,
+            related_assets=related[request.prompt],
         )
 
         # Step 2: Call InferenceClient for generation
@@ -157,19 +190,16 @@ async def generate_scene(
             context=context, model_version=request.model_version
         )
 
-        # Step 3: Post-process the generated scene
+        # Step 3: Post-process (normalize, validate and enhance) the generated scene
         logger.info("Post-processing generated scene")
-        processed_scene = postprocessor.process_scene(
-            raw_scene=generation_result["scene"], project_id=request.project_id, assets=assets_data
+        enhancements = {"simulate_physics": True} if settings.simulate_physics else None
+        enhanced_scene, postprocessing = postprocessor.run_pipeline(
+            raw_scene=generation_result["scene"],
+            project_id=request.project_id,
+            assets=assets_data,
+            enhancements=enhancements,
         )
 
-        # Validate the processed scene
-        if not postprocessor.validate_scene(processed_scene):
-            raise ValueError("Generated scene failed validation")
-
-        # Enhance the scene with additional features
-        enhanced_scene = postprocessor.enhance_scene(processed_scene)
-
         # Calculate total latency
         latency_ms = int((time.time() - start_time) * 1000)
 
@@ -179,7 +209,7 @@ async def generate_scene(
             log_generation,
             db=db,
             user_id=user_id,
-            input_hash=input_hash,
+            input_hash=request_hash,
             prompt_hash=context["prompt_hash"],
             model_version=generation_result["metadata"]["model_version"],
             status=generation_result["metadata"]["status"],
@@ -199,17 +229,19 @@ async def generate_scene(
 
         # Step 5: Return response
         logger.info(f"Generation successful - Status: {generation_result['metadata']['status']}")
-        return GenerationResponse(
-            scene_id=enhanced_scene["id"],
-            scene=enhanced_scene,
-            generation_time=latency_ms / 1000.0,
-            metadata={
-                "status": generation_result["metadata"]["status"],
-                "model_version": generation_result["metadata"]["model_version"],
-                "use_local_model": generation_result["metadata"].get("use_local_model", False),
-                "fallback_sample": generation_result["metadata"].get("fallback_sample"),
-                "prompt_hash": context["prompt_hash"],
-            },
+        # Serialize the scene once and embed the bytes, rather than running the
+        # whole scene through response_model validation and the stdlib encoder
+        serialized = serialize_scene(enhanced_scene)
+        metadata = generation_metadata(
+            generation_result, context, postprocessing, enhanced_scene, serialized.etag
+        )
+        return FastJSONResponse(
+            content={
+                "scene_id": enhanced_scene["id"],
+                "scene": json_fragment(serialized.json),
+                "generation_time": latency_ms / 1000.0,
+                "metadata": metadata,
+            }
         )
 
     except Exception as e:
@@ -221,7 +253,7 @@ async def generate_scene(
             log_generation,
             db=db,
             user_id=user_id,
-            input_hash=input_hash,
+            input_hash=request_hash,
             prompt_hash=hashlib.sha256(request.prompt.encode()).hexdigest()[:16],
             model_version="error",
             status="error",
@@ -235,6 +267,196 @@ async def generate_scene(
         ) from e
 
 
+@router.post("/batch", response_model=BatchGenerationResponse)
+async def generate_batch(
+    request: BatchGenerationRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Generate several scenes: variations of one prompt, or many prompts
+
+    The prompts are sent to the model in micro-batches rather than one
+    request each, the results are post-processed in parallel, and every
+    generation log and scene of the batch is saved in one transaction.
+    """
+    start_time = time.time()
+    prompts = request.expanded_prompts()
+    if len(prompts) > settings.generation_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A batch may generate at most {settings.generation_batch_max_size} scenes",
+        )
+
+    user_id = request.user_id or "anonymous"
+    batch_id = str(uuid4())
+
+    try:
+        assets_data = fetch_assets(db, request.project_id, request.assets)
+        related = await related_assets_by_prompt(db, request.project_id, prompts)
+        contexts = [
+            context_builder.build_generation_prompt(
+                user_prompt=prompt,
+                project_id=request.project_id,
+                style=request.style,
+                assets=assets_data,
+                constraints=request.constraints,
+                related_assets=related[prompt],
+            )
+            for prompt in prompts
+        ]
+
+        logger.info(f"Generating batch {batch_id} of {len(prompts)} scenes")
+        generation_results = await inference_client.generate_scenes(
+            contexts, model_version=request.model_version
+        )
+
+        batch_size = max(inference_client.micro_batch_size, 1)
+
+        enhancements = {"simulate_physics": True} if settings.simulate_physics else None
+        processed = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    postprocessor.run_pipeline,
+                    raw_scene=result["scene"],
+                    project_id=request.project_id,
+                    assets=assets_data,
+                    enhancements=enhancements,
+                )
+                for result in generation_results
+            )
+        )
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        request_payload = request.dict(exclude={"prompts", "variations"})
+        items, logs, scenes = [], [], []
+        scene_ids = set()
+        for index, (prompt, context, result, (scene, postprocessing)) in enumerate(
+            zip(prompts, contexts, generation_results, processed, strict=True)
+        ):
+            if scene["id"] in scene_ids:
+                # Variations falling back to the same golden sample share its ID
+                scene["id"] = f"scene_{uuid4().hex[:8]}"
+            scene_ids.add(scene["id"])
+            serialized = serialize_scene(scene)
+            metadata = generation_metadata(result, context, postprocessing, scene, serialized.etag)
+            items.append(
+                {
+                    "scene_id": scene["id"],
+                    "prompt": prompt,
+                    "scene": json_fragment(serialized.json),
+                    "metadata": metadata,
+                }
+            )
+            logs.append(
+                {
+                    "user_id": user_id,
+                    "input_hash": input_hash(
+                        prompt, request.project_id, request.style, request.assets
+                    ),
+                    "prompt_hash": context["prompt_hash"],
+                    "model_version": result["metadata"]["model_version"],
+                    "status": result["metadata"]["status"],
+                    "latency_ms": latency_ms,
+                    "request_payload": {
+                        **request_payload,
+                        "prompt": prompt,
+                        "batch_id": batch_id,
+                        "batch_index": index,
+                    },
+                    "response_payload": scene,
+                }
+            )
+            scenes.append(scene)
+
+        background_tasks.add_task(
+            save_batch_to_db, db=db, project_id=request.project_id, logs=logs, scenes=scenes
+        )
+
+        return FastJSONResponse(
+            content={
+                "batch_id": batch_id,
+                "items": items,
+                "total": len(items),
+                "generation_time": latency_ms / 1000.0,
+                "metadata": {
+                    "micro_batch_size": batch_size,
+                    "micro_batches": math.ceil(len(prompts) / batch_size),
+                },
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Batch generation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch generation failed: {str(e)}",
+        ) from e
+
+
+@router.post("/jobs", response_model=GenerationJobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def submit_generation_job(request: GenerationRequest):
+    """
+    Generate a scene in the background
+
+    Returns a job ID at once instead of waiting for the model. Poll
+    ``GET /jobs/{job_id}`` or stream ``GET /jobs/{job_id}/events`` for
+    progress; the finished job's result holds the same fields as the
+    response of ``POST /``.
+    """
+    job = generation_jobs.submit(request.dict())
+    return {"job_id": job["job_id"], "status": job["status"], "stage": job["stage"]}
+
+
+def _generation_job(job_id: str) -> dict[str, Any]:
+    job = job_registry.get(job_id)
+    if not job or job["kind"] != JOB_KIND:
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobStatus)
+async def get_generation_job(job_id: str):
+    """Get progress (and, once completed, the result) of a generation job"""
+    return FastJSONResponse(content=_generation_job(job_id))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job(job_id: str):
+    """
+    Stream a generation job's progress as server-sent events
+
+    Sends the job, as JSON, whenever it changes, in an event named after
+    its status; the stream ends after the ``completed`` or ``failed``
+    event. Comment lines keep idle connections alive.
+    """
+    _generation_job(job_id)
+
+    async def events():
+        sent = None
+        while True:
+            # Watch before reading: the job may change while its event is being sent
+            changed = generation_jobs.watch(job_id)
+            job = job_registry.get(job_id)
+            if job is None:
+                return
+            if job != sent:
+                yield f"event: {job['status']}\ndata: {dumps_str(job)}\n\n"
+                sent = job
+            if job["status"] in FINISHED_STATES:
+                return
+            if not await generation_jobs.wait_for_update(
+                job_id, settings.generation_job_heartbeat, changed=changed
+            ):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/status")
 async def get_generation_status():
     """
@@ -244,8 +466,12 @@ async def get_generation_status():
     - Model connectivity
     - Available golden samples
     - Service statistics
+    - Latency of each postprocessing stage
     """
-    return inference_client.get_model_status()
+    return {
+        **inference_client.get_model_status(),
+        "postprocessing_stages": postprocessor.get_stage_stats(),
+    }
 
 
 @router.get("/samples")
@@ -262,10 +488,18 @@ async def list_golden_samples():
 
 
 @router.get("/samples/{sample_name}")
-async def get_golden_sample(sample_name: str):
+async def get_golden_sample(
+    sample_name: str,
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
     """
     Get a specific golden sample by name
 
+    Returns the binary scene encoding when requested with
+    ``Accept: application/vnd.ossgameforge.scene``, JSON otherwise. JSON is
+    served precompressed according to Accept-Encoding.
+
     Args:
         sample_name: Name of the sample to retrieve
     """
@@ -274,4 +508,17 @@ async def get_golden_sample(sample_name: str):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Golden sample '{sample_name}' not found"
         )
-    return sample
+    if wants_binary_scene(accept):
+        return Response(
+            content=encode_scene(sample),
+            media_type=SCENE_BINARY_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+    serialized = scene_cache.serialize(
+        f"sample:{sample_name}", sample, precompress=settings.precompress_scenes
+    )
+    body, encoding = serialized.body_for(accept_encoding)
+    headers = {"Vary": "Accept, Accept-Encoding", "ETag": quote_etag(serialized.etag)}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..database import check_db_connection, get_db
+from ..services.inference_client import inference_client
+from ..utils.circuit_breaker import CIRCUIT_CLOSED, CIRCUIT_OPEN
 
 router = APIRouter()
 
@@ -52,10 +54,21 @@ async def check_health(db: Session = Depends(get_db)):
         health_status["services"]["storage"] = {"status": "mocked", "type": "minio"}
 
     # Check model service status
+    circuit = inference_client.pool.state()
+    inference_status = "ok" if settings.use_local_model else "fallback"
+    if settings.use_local_model and circuit == CIRCUIT_OPEN:
+        # Generations are still served, from the golden samples
+        inference_status = "fallback"
+    elif settings.use_local_model and circuit != CIRCUIT_CLOSED:
+        inference_status = "degraded"
     health_status["services"]["inference"] = {
-        "status": "ok" if settings.use_local_model else "fallback",
+        "status": inference_status,
         "mode": "local_model" if settings.use_local_model else "golden_samples",
+        "circuit_breaker": circuit,
     }
+    if settings.use_local_model:
+        # Cached by the background prober, so this never waits on the model
+        health_status["services"]["inference"].update(inference_client.connectivity_status())
 
     return health_status
 
@@ -0,0 +1,285 @@
+"""
+Scenes router for OSSGameForge API
+
+CRUD for stored scenes and access to their version history. Scene data is
+served like the golden samples: as precompressed JSON negotiated with
+Accept-Encoding, or in the binary scene format when requested with
+``Accept: application/vnd.ossgameforge.scene``.
+"""
+
+import asyncio
+import logging
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas.scene import (
+    EntityEditOperation,
+    PlayabilityResponse,
+    SceneCreate,
+    SceneEditRequest,
+    SceneEditResponse,
+    SceneResponse,
+    SceneUpdate,
+    SceneVersionResponse,
+)
+from ..services import scene_service
+from ..services.collaboration import Submission, Subscriber, collaboration_hub
+from ..services.playability import playability_validator
+from ..services.postprocessor import SceneEditError
+from ..utils.http import etag_matches, quote_etag
+from ..utils.scene_codec import SCENE_BINARY_MEDIA_TYPE, encode_scene, wants_binary_scene
+from ..utils.serialization import FastJSONResponse, dumps_str, loads
+
+router = APIRouter(default_response_class=FastJSONResponse)
+logger = logging.getLogger(__name__)
+
+
+def _scene_response(scene, version: int) -> dict:
+    return {
+        "id": str(scene.id),
+        "project_id": scene.project_id,
+        "name": scene.name,
+        "style": scene.style,
+        "version": version,
+        "created_at": scene.created_at.isoformat() if scene.created_at else None,
+        "updated_at": scene.updated_at.isoformat() if scene.updated_at else None,
+    }
+
+
+def _get_scene_or_404(db: Session, scene_id: str):
+    scene = scene_service.get_scene(db, scene_id)
+    if not scene:
+        raise HTTPException(status_code=404, detail="Scene not found")
+    return scene
+
+
+@router.get("/", response_model=list[SceneResponse])
+async def list_scenes(
+    project_id: str | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """List stored scenes, most recently updated first"""
+    scenes = scene_service.list_scenes(db, project_id=project_id, limit=limit, offset=offset)
+    versions = scene_service.head_versions(db, [scene.id for scene in scenes])
+    return [_scene_response(scene, versions[str(scene.id)]) for scene in scenes]
+
+
+@router.post("/", response_model=SceneResponse, status_code=status.HTTP_201_CREATED)
+async def create_scene(request: SceneCreate, db: Session = Depends(get_db)):
+    """Store a new scene as version 1"""
+    scene = scene_service.create_scene(
+        db, request.project_id, request.scene_data, name=request.name, style=request.style
+    )
+    return _scene_response(scene, 1)
+
+
+@router.get("/{scene_id}")
+async def get_scene(
+    scene_id: str,
+    version: int | None = Query(default=None, ge=1),
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a scene's data, at its latest version or at ``?version=n``
+
+    Past versions are rebuilt from the nearest snapshot and the patches
+    after it, then cached. The version served is reported in
+    ``X-Scene-Version``.
+    """
+    scene = _get_scene_or_404(db, scene_id)
+    # The first read of a version compresses it, which takes a while for big scenes
+    result = await asyncio.to_thread(scene_service.serialize_scene_version, db, scene, version)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Scene version {version} not found")
+    served_version, serialized = result
+
+    binary = wants_binary_scene(accept)
+    etag = f"{serialized.etag}-bin" if binary else serialized.etag
+    headers = {
+        "ETag": quote_etag(etag),
+        "Vary": "Accept, Accept-Encoding",
+        "X-Scene-Version": str(served_version),
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if binary:
+        return Response(
+            content=encode_scene(loads(serialized.json)),
+            media_type=SCENE_BINARY_MEDIA_TYPE,
+            headers=headers,
+        )
+    body, encoding = serialized.body_for(accept_encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.put("/{scene_id}", response_model=SceneResponse)
+async def update_scene(scene_id: str, request: SceneUpdate, db: Session = Depends(get_db)):
+    """Replace a scene's data, storing the change as a new version"""
+    scene = _get_scene_or_404(db, scene_id)
+    try:
+        version = scene_service.update_scene(db, scene, request.scene_data, name=request.name)
+    except IntegrityError as e:
+        # Another writer recorded the same version number first
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Scene was modified concurrently"
+        ) from e
+    return _scene_response(scene, version)
+
+
+@router.patch("/{scene_id}", response_model=SceneEditResponse)
+async def edit_scene(scene_id: str, request: SceneEditRequest, db: Session = Depends(get_db)):
+    """
+    Apply entity-level edits (add, update, remove) as a new version
+
+    Only the touched entities are re-normalized and re-validated, and
+    overlaps are resolved against their spatial neighbours only, instead of
+    re-processing the whole scene.
+    """
+    scene = _get_scene_or_404(db, scene_id)
+    operations = [operation.model_dump(exclude_none=True) for operation in request.operations]
+    try:
+        version, touched = scene_service.edit_scene(db, scene, operations, name=request.name)
+    except SceneEditError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)) from e
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Scene was modified concurrently"
+        ) from e
+    return {**_scene_response(scene, version), "touched_entities": touched}
+
+
+@router.delete("/{scene_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_scene(scene_id: str, db: Session = Depends(get_db)):
+    """Delete a scene and its version history"""
+    scene = _get_scene_or_404(db, scene_id)
+    scene_service.delete_scene(db, scene)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{scene_id}/versions", response_model=list[SceneVersionResponse])
+async def list_scene_versions(scene_id: str, db: Session = Depends(get_db)):
+    """List a scene's version history"""
+    scene = _get_scene_or_404(db, scene_id)
+    rows = scene_service.list_versions(db, scene.id)
+    if not rows:
+        # Scene stored before version history existed
+        return [{"version": 1, "snapshot": True, "patch_size": 0, "created_at": None}]
+    return [
+        {
+            "version": row.version,
+            "snapshot": bool(row.snapshot),
+            "patch_size": row.patch_size or 0,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+        for row in rows
+    ]
+
+
+@router.get("/{scene_id}/playability", response_model=PlayabilityResponse)
+async def get_scene_playability(
+    scene_id: str,
+    version: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+):
+    """
+    Check that every goal of a scene version is reachable from the player spawn
+
+    The navigation graph of each version is built once and cached.
+    """
+    scene = _get_scene_or_404(db, scene_id)
+    if version is None:
+        version, scene_data = scene_service.head_version(db, scene.id), scene.scene_data
+    else:
+        scene_data = scene_service.get_scene_version(db, scene, version)
+    if scene_data is None:
+        raise HTTPException(status_code=404, detail=f"Scene version {version} not found")
+    report = playability_validator.validate(scene_data, cache_key=(str(scene.id), version))
+    return {"version": version, **report.to_dict()}
+
+
+async def _send_queued(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Forward a subscriber's queued messages; a None marks it as dropped"""
+    while True:
+        message = await subscriber.queue.get()
+        if message is None:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+        await websocket.send_text(message)
+
+
+@router.websocket("/{scene_id}/live")
+async def live_scene(websocket: WebSocket, scene_id: str):
+    """
+    Collaborative editing channel of a scene
+
+    The server first sends ``{"type": "snapshot", "client_id", "seq",
+    "version", "scene"}``. Clients send ``{"type": "ops", "client_seq",
+    "operations": [...]}`` with the operations accepted by ``PATCH``. At a
+    fixed tick rate every subscriber receives ``{"type": "batch", "seq",
+    "operations", "acks"}`` with the coalesced operations applied since the
+    previous batch and the last ``client_seq`` applied per client; rejected
+    submissions are answered with ``{"type": "error", "client_seq",
+    "detail"}`` and periodic saves with ``{"type": "saved", "version"}``. A
+    save that had to merge changes made outside the session (through this
+    API) sends a new ``{"type": "snapshot", "seq", "version", "scene"}``
+    instead, which replaces the client's copy.
+    """
+    await websocket.accept()
+    channel = collaboration_hub.channel(scene_id)
+    try:
+        subscriber = await channel.join()
+    except LookupError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Scene not found")
+        return
+
+    sender = asyncio.create_task(_send_queued(websocket, subscriber))
+    try:
+        while True:
+            text = await websocket.receive_text()
+            client_seq = None
+            try:
+                message = loads(text)
+                if isinstance(message, dict):
+                    client_seq = message.get("client_seq")
+                if not isinstance(message, dict) or message.get("type") != "ops":
+                    raise ValueError("Expected an 'ops' message")
+                operations = [
+                    EntityEditOperation.model_validate(operation).model_dump(exclude_none=True)
+                    for operation in message.get("operations") or []
+                ]
+                await collaboration_hub.submit(
+                    channel, Submission(subscriber.client_id, client_seq, operations)
+                )
+            except (ValueError, ValidationError) as e:
+                subscriber.offer(
+                    dumps_str({"type": "error", "client_seq": client_seq, "detail": str(e)})
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await channel.leave(subscriber)
@@ -62,3 +62,26 @@ class Asset(AssetResponse):
     """Full asset schema"""
 
     pass
+
+
+class BulkUploadResponse(BaseModel):
+    """Response for a bulk asset upload"""
+
+    job_id: str
+    status: str
+    files_received: int
+    message: str = "Bulk upload accepted"
+
+
+class BulkUploadStatus(BaseModel):
+    """Progress of a bulk asset upload job"""
+
+    job_id: str
+    status: str
+    total: int = 0
+    processed: int = 0
+    failed: int = 0
+    errors: list[str] = []
+    asset_ids: list[str] = []
+    created_at: str
+    updated_at: str
@@ -3,7 +3,7 @@ Generation schemas for OSSGameForge API
 """
 
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any
 
 from pydantic import BaseModel, Field
 
@@ -107,3 +107,62 @@ class GenerationResponse(BaseModel):
     scene: dict[str, Any]  # Changed from Scene to dict to match actual usage
     generation_time: float = Field(..., description="Generation time in seconds")
     metadata: dict[str, Any] | None = None
+
+
+class BatchGenerationRequest(BaseModel):
+    """Request for several scenes: each prompt is generated ``variations`` times"""
+
+    prompts: list[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(..., min_length=1)
+    variations: int = Field(default=1, ge=1)
+    project_id: str
+    assets: list[str] | None = []
+    style: GameStyle | None = None
+    user_id: str | None = None
+    constraints: dict[str, Any] | None = None
+    model_version: str | None = None
+
+    def expanded_prompts(self) -> list[str]:
+        """One prompt per scene to generate, variations of a prompt together"""
+        return [prompt for prompt in self.prompts for _ in range(self.variations)]
+
+
+class BatchGenerationItem(BaseModel):
+    """One scene of a batch generation"""
+
+    scene_id: str
+    prompt: str
+    scene: dict[str, Any]
+    metadata: dict[str, Any] | None = None
+
+
+class BatchGenerationResponse(BaseModel):
+    """Response for batch scene generation"""
+
+    batch_id: str
+    items: list[BatchGenerationItem]
+    total: int
+    generation_time: float = Field(..., description="Generation time in seconds")
+    metadata: dict[str, Any] | None = None
+
+
+class GenerationJobAccepted(BaseModel):
+    """Response for a submitted generation job"""
+
+    job_id: str
+    status: str
+    stage: str
+
+
+class GenerationJobStatus(BaseModel):
+    """Progress of a generation job"""
+
+    job_id: str
+    status: str
+    stage: str
+    processed: int = Field(..., description="Stages finished")
+    total: int = Field(..., description="Stages in a generation")
+    model_endpoint: str
+    errors: list[str] = []
+    result: dict[str, Any] | None = None
+    created_at: str
+    updated_at: str
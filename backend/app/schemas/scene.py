@@ -0,0 +1,90 @@
+"""
+Scene schemas for OSSGameForge API
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class SceneCreate(BaseModel):
+    """Schema for storing a new scene"""
+
+    project_id: str = Field(..., min_length=1)
+    name: str | None = Field(None, min_length=1, max_length=200)
+    style: str | None = None
+    scene_data: dict[str, Any]
+
+
+class SceneUpdate(BaseModel):
+    """Schema for replacing a scene's data"""
+
+    name: str | None = Field(None, min_length=1, max_length=200)
+    scene_data: dict[str, Any]
+
+
+class EntityEditOperation(BaseModel):
+    """A single entity-level edit"""
+
+    op: Literal["add", "update", "remove"]
+    id: str | None = None  # Entity to update or remove
+    entity: dict[str, Any] | None = None  # Entity to add
+    changes: dict[str, Any] | None = None  # Fields to merge into the entity
+
+
+class SceneEditRequest(BaseModel):
+    """Schema for incremental scene edits"""
+
+    operations: list[EntityEditOperation] = Field(..., min_length=1)
+    name: str | None = Field(None, min_length=1, max_length=200)
+
+
+class SceneResponse(BaseModel):
+    """Schema for scene details (without the scene data itself)"""
+
+    id: str
+    project_id: str
+    name: str
+    style: str | None = None
+    version: int
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+class SceneVersionResponse(BaseModel):
+    """Schema for an entry of a scene's version history"""
+
+    version: int
+    snapshot: bool
+    patch_size: int
+    created_at: str | None = None
+
+
+class SceneEditResponse(SceneResponse):
+    """Schema for the result of an incremental edit"""
+
+    touched_entities: list[str] = []
+
+
+class GoalReachability(BaseModel):
+    """Whether a goal can be reached from the player spawn"""
+
+    id: str
+    reachable: bool
+    cost: float | None = None
+    path: list[dict[str, float]] = []
+
+
+class PlayabilityResponse(BaseModel):
+    """Schema for the playability report of a scene version"""
+
+    version: int
+    playable: bool
+    reason: str | None = None
+    spawn: str | None = None
+    goals: list[GoalReachability] = []
+    surfaces: int
+    links: int
+    cell_size: float
+    cached: bool
+    elapsed_ms: float
@@ -2,6 +2,38 @@
 Services module for OSSGameForge
 """
 
-from . import asset_service, context_builder, inference_client, postprocessor
+from . import (
+    asset_index,
+    asset_service,
+    asset_summaries,
+    collaboration,
+    context_builder,
+    export_service,
+    generation_jobs,
+    godot_exporter,
+    inference_client,
+    job_registry,
+    physics_sim,
+    playability,
+    postprocessor,
+    scene_cache,
+    scene_service,
+)
 
-__all__ = ["asset_service", "context_builder", "inference_client", "postprocessor"]
+__all__ = [
+    "asset_index",
+    "asset_service",
+    "asset_summaries",
+    "collaboration",
+    "context_builder",
+    "export_service",
+    "generation_jobs",
+    "godot_exporter",
+    "inference_client",
+    "job_registry",
+    "physics_sim",
+    "playability",
+    "postprocessor",
+    "scene_cache",
+    "scene_service",
+]
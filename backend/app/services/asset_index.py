@@ -0,0 +1,204 @@
+"""
+Asset Index Service
+
+Finds the assets of a project most relevant to a generation prompt, so
+prompts can offer the model assets the client did not name. Each project
+gets a vector index of its asset summaries (name, type, tags and
+metadata), embedded by the configured embedding model. An index is built
+on the first search in its project and brought up to date on later
+searches: one aggregate query tells whether any asset of the project was
+added, changed or deleted since. Changed assets are embedded again and
+deleted ones dropped; nothing else is.
+
+Searching is split in two steps, so that callers on the event loop can
+query with their own session and embed in a worker thread: ``changes``
+reads what changed from the database, and ``search_many`` applies it and
+searches.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Asset
+from ..utils.embeddings import Embedder, load_embedder
+from ..utils.vector_index import VectorIndex
+from .asset_summaries import asset_summaries
+
+logger = logging.getLogger(__name__)
+
+
+def asset_text(asset: dict[str, Any]) -> str:
+    """Text of an asset summary that is embedded for search"""
+    metadata = " ".join(f"{key} {value}" for key, value in asset["metadata"].items())
+    return f"{asset['name']} {asset['type']} {' '.join(asset['tags'])} {metadata}"
+
+
+@dataclass(frozen=True)
+class IndexChanges:
+    """Asset changes of a project not yet in its index"""
+
+    # (asset count, latest updated_at) of the project once applied
+    version: tuple
+    # Added and changed assets, as from ``Asset.to_dict()``
+    assets: list[dict[str, Any]]
+    # IDs of every asset of the project, when some were deleted
+    asset_ids: frozenset[str] | None = None
+
+
+@dataclass
+class _ProjectIndex:
+    index: VectorIndex
+    assets: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Keys of ``assets``, replaced whole so other threads can read them while it changes
+    keys: frozenset[str] = frozenset()
+    # (asset count, latest updated_at) the index reflects
+    version: tuple = (0, None)
+
+
+class AssetIndex:
+    """Service searching project assets by similarity to a prompt"""
+
+    def __init__(self, embedder: Embedder | None = None):
+        self._embedder = embedder
+        self._projects: dict[str, _ProjectIndex] = {}
+        # One lock per project, so building one index does not hold up searches in others
+        self._project_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self) -> Embedder:
+        # Loaded on first use, as a model takes a while to load
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = load_embedder(settings.asset_embedding_model)
+            return self._embedder
+
+    def search(
+        self, db: Session, project_id: str, query: str, k: int, min_score: float = 0.0
+    ) -> list[dict[str, Any]]:
+        """
+        Summaries of the ``k`` assets of a project most similar to a query
+
+        Args:
+            db: Database session
+            project_id: Project to search in
+            query: Text to match, typically the user's prompt
+            k: Most assets to return
+            min_score: Least cosine similarity of a returned asset
+
+        Returns:
+            Asset summaries, most similar first
+        """
+        changes = self.changes(db, project_id)
+        return self.search_many(project_id, changes, [query], k, min_score)[query]
+
+    def changes(self, db: Session, project_id: str) -> IndexChanges | None:
+        """
+        Read the asset changes of a project since its index was last updated
+
+        Returns:
+            The changes, or None when the index is up to date
+        """
+        version = tuple(
+            db.query(func.count(Asset.id), func.max(Asset.updated_at))
+            .filter(Asset.project_id == project_id)
+            .one()
+        )
+        project = self._projects.get(project_id)
+        if project is not None and project.version == version:
+            return None
+
+        rows = db.query(Asset).filter(Asset.project_id == project_id)
+        if project is not None and project.version[1] is not None:
+            rows = rows.filter(Asset.updated_at >= project.version[1])
+        assets = [asset.to_dict() for asset in rows.all()]
+        asset_ids = None
+        if project is not None:
+            added = {str(asset["id"]) for asset in assets} - project.keys
+            if len(project.keys) + len(added) != version[0]:
+                # Assets were deleted: list the remaining ones
+                ids = db.query(Asset.id).filter(Asset.project_id == project_id)
+                asset_ids = frozenset(str(asset_id) for (asset_id,) in ids)
+        return IndexChanges(version=version, assets=assets, asset_ids=asset_ids)
+
+    def search_many(
+        self,
+        project_id: str,
+        changes: IndexChanges | None,
+        queries: list[str],
+        k: int,
+        min_score: float = 0.0,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Apply a project's changes to its index, then search it for each query
+
+        Embeds the changed assets and the queries, in one call each, so call
+        it off the event loop.
+
+        Returns:
+            Asset summaries for each query, most similar first
+        """
+        found: dict[str, list[dict[str, Any]]] = {query: [] for query in queries}
+        searched = [query for query in found if query.strip()]
+        if k <= 0 or not searched:
+            return found
+        with self._project_lock(project_id):
+            project = self._apply(project_id, changes)
+            if project is None or not project.assets:
+                return found
+            for query, vector in zip(searched, self.embedder.embed(searched), strict=True):
+                hits = project.index.search(vector, k)
+                found[query] = [project.assets[key] for key, score in hits if score >= min_score]
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._projects.clear()
+
+    def _project_lock(self, project_id: str) -> threading.Lock:
+        with self._lock:
+            return self._project_locks.setdefault(project_id, threading.Lock())
+
+    def _apply(self, project_id: str, changes: IndexChanges | None) -> _ProjectIndex | None:
+        """
+        The project's index, updated with changes
+
+        Changes read before another caller's are harmless when applied
+        after them: the index then records their older version, and the
+        next ``changes`` brings it up to date again.
+        """
+        project = self._projects.get(project_id)
+        if changes is None or (project is not None and project.version == changes.version):
+            return project
+        if project is None:
+            project = _ProjectIndex(index=VectorIndex(self.embedder.dim))
+        self._load(project, changes.assets)
+        if changes.asset_ids is not None:
+            # Drop deleted assets without embedding the rest again
+            for key in project.assets.keys() - changes.asset_ids:
+                project.index.remove(key)
+                del project.assets[key]
+        project.keys = frozenset(project.assets)
+        project.version = changes.version
+        self._projects[project_id] = project
+        return project
+
+    def _load(self, project: _ProjectIndex, assets: list[dict[str, Any]]) -> None:
+        summaries = [asset_summaries.summarize(asset).asset for asset in assets]
+        # Assets at the latest updated_at seen come back on every sync: skip unchanged ones
+        summaries = [s for s in summaries if project.assets.get(s["id"]) != s]
+        if summaries:
+            keys = [summary["id"] for summary in summaries]
+            project.index.add(keys, self.embedder.embed([asset_text(s) for s in summaries]))
+            project.assets.update(zip(keys, summaries, strict=True))
+            logger.info(f"Indexed {len(summaries)} assets")
+
+
+# Module-level singleton instance
+asset_index = AssetIndex()
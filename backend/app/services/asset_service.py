@@ -6,25 +6,66 @@ Handles asset processing including:
 - EXIF stripping for privacy protection
 - Metadata extraction from various file types
 - Async processing with database management
+- Bulk imports from archives or multipart batches with bounded parallelism
 """
 
+import asyncio
+import contextlib
 import hashlib
 import io
 import logging
+import mimetypes
+import os
+import tarfile
 import tempfile
 import time
-from pathlib import Path
+import uuid
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+from typing import Any
 
 import tinytag
 from PIL import Image
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..database import SessionLocal
 from ..models import Asset
-from ..storage import download_file_from_storage, get_minio_client, upload_file_to_storage
+from ..storage import (
+    delete_file_from_storage,
+    download_file_from_storage,
+    get_minio_client,
+    stat_file_in_storage,
+    stream_file_from_storage,
+    upload_file_to_storage,
+)
+from .asset_summaries import asset_summaries
+from .job_registry import JOB_COMPLETED, JOB_FAILED, JOB_RUNNING, job_registry
 
 logger = logging.getLogger(__name__)
 
+# Bucket holding all uploaded project assets
+ASSET_BUCKET = "ossgameforge-assets"
+
+# Archive formats accepted by the bulk upload endpoint
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_CONTENT_TYPES = (
+    "application/zip",
+    "application/x-zip-compressed",
+    "application/x-tar",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+)
+
+# Platform MIME names normalized to the names used in the upload allow-lists
+_CONTENT_TYPE_ALIASES = {"audio/x-wav": "audio/wav", "audio/wave": "audio/wav"}
+
+# Archive entries that are never game assets
+_IGNORED_ENTRY_NAMES = {"thumbs.db", "desktop.ini"}
+
 
 def create_initial_asset_record(
     db: Session, project_id: str, filename: str, content_type: str, file_size: int = 0
@@ -42,6 +83,20 @@ def create_initial_asset_record(
     Returns:
         Created Asset model instance
     """
+    new_asset = _build_asset_record(project_id, filename, content_type, file_size)
+
+    db.add(new_asset)
+    db.commit()
+    db.refresh(new_asset)
+
+    logger.info(f"Created asset record: {new_asset.id}")
+    return new_asset
+
+
+def _build_asset_record(
+    project_id: str, filename: str, content_type: str, file_size: int = 0
+) -> Asset:
+    """Build an unsaved Asset instance with consent tracking and base metadata"""
     # Create consent hash for tracking
     user_id = "user_placeholder_123"  # TODO: Get from auth context
     consent_hash = hashlib.sha256(f"{user_id}{filename}{time.time()}".encode()).hexdigest()
@@ -49,8 +104,7 @@ def create_initial_asset_record(
     # Determine asset type from content type
     asset_type = _determine_asset_type(content_type)
 
-    # Create new asset record
-    new_asset = Asset(
+    return Asset(
         project_id=project_id,
         path="pending",  # Will be updated after storage
         type=asset_type,
@@ -64,12 +118,22 @@ def create_initial_asset_record(
         },
     )
 
-    db.add(new_asset)
-    db.commit()
-    db.refresh(new_asset)
 
-    logger.info(f"Created asset record: {new_asset.id}")
-    return new_asset
+def _storage_path(asset: Asset, original_filename: str) -> str:
+    """Object name of an asset in the assets bucket"""
+    file_extension = Path(original_filename).suffix
+    return f"projects/{asset.project_id}/assets/{asset.id}{file_extension}"
+
+
+def is_allowed_content_type(content_type: str) -> bool:
+    """Check a MIME type against the configured image/audio/video allow-lists"""
+    if content_type.startswith("image/"):
+        return content_type in settings.allowed_image_types
+    if content_type.startswith("audio/"):
+        return content_type in settings.allowed_audio_types
+    if content_type.startswith("video/"):
+        return content_type in settings.allowed_video_types
+    return True
 
 
 def _determine_asset_type(content_type: str) -> str:
@@ -102,8 +166,7 @@ async def process_and_store_file(
         Storage path in MinIO
     """
     # Generate storage path
-    file_extension = Path(original_filename).suffix
-    storage_path = f"projects/{asset.project_id}/assets/{asset.id}{file_extension}"
+    storage_path = _storage_path(asset, original_filename)
 
     try:
         # Process based on file type
@@ -114,7 +177,7 @@ async def process_and_store_file(
             processed_data = file_data
 
         # Upload to MinIO
-        bucket_name = "ossgameforge-assets"
+        bucket_name = ASSET_BUCKET
         _ensure_bucket_exists(bucket_name)
 
         upload_file_to_storage(
@@ -129,6 +192,8 @@ async def process_and_store_file(
         asset.path = storage_path
         asset.status = "uploaded"
         db.commit()
+        # Image metadata is extracted during upload
+        asset_summaries.refresh(asset)
 
         logger.info(f"Stored asset {asset.id} at {storage_path}")
         return storage_path
@@ -152,6 +217,11 @@ async def _process_image(file_data: bytes, asset: Asset) -> bytes:
     Returns:
         Processed image data without EXIF
     """
+    return _strip_image_metadata(file_data, asset)
+
+
+def _strip_image_metadata(file_data: bytes, asset: Asset) -> bytes:
+    """Synchronous EXIF stripping, safe to run in a worker thread"""
     try:
         # Open image from bytes
         image = Image.open(io.BytesIO(file_data))
@@ -228,7 +298,7 @@ def extract_metadata_task(asset_id: str):
         logger.info(f"Extracting metadata for asset {asset_id}")
 
         # Download file from storage for processing
-        bucket_name = "ossgameforge-assets"
+        bucket_name = ASSET_BUCKET
 
         with tempfile.NamedTemporaryFile(delete=True) as temp_file:
             try:
@@ -254,6 +324,7 @@ def extract_metadata_task(asset_id: str):
                 if asset.status != "error":
                     asset.status = "processed"
                     db.commit()
+                    asset_summaries.refresh(asset)
                     logger.info(f"Successfully processed asset {asset_id}")
 
             except Exception as e:
@@ -335,6 +406,47 @@ def get_asset_by_id(db: Session, asset_id: str) -> Asset | None:
     return db.query(Asset).filter(Asset.id == asset_id).first()
 
 
+def get_asset_content_info(asset: Asset) -> Any | None:
+    """
+    Get storage information (size, ETag, content type) for an asset's bytes
+
+    Args:
+        asset: Asset instance
+
+    Returns:
+        MinIO object stat or None if the asset has no stored content
+    """
+    if not asset.path or asset.path == "pending":
+        return None
+    return stat_file_in_storage(ASSET_BUCKET, asset.path)
+
+
+def stream_asset_content(asset: Asset, offset: int = 0, length: int = 0) -> Iterator[bytes]:
+    """
+    Open a streaming reader over an asset's stored bytes
+
+    Args:
+        asset: Asset instance
+        offset: Start byte of the range to read
+        length: Number of bytes to read (0 reads to the end)
+
+    Returns:
+        Iterator over content chunks
+    """
+    return stream_file_from_storage(ASSET_BUCKET, asset.path, offset=offset, length=length)
+
+
+def iter_asset_content(asset: Asset) -> Iterator[bytes]:
+    """
+    Lazily stream an asset's bytes
+
+    Unlike ``stream_asset_content`` the storage request is only made when
+    iteration starts, which lets exporters queue many assets without opening
+    a connection for each one up front.
+    """
+    yield from stream_asset_content(asset)
+
+
 def list_project_assets(db: Session, project_id: str) -> list:
     """
     List all assets for a project
@@ -365,4 +477,256 @@ def update_asset_status(db: Session, asset_id: str, status: str, metadata: dict
         if metadata:
             asset.asset_metadata.update(metadata)
         db.commit()
+        asset_summaries.refresh(asset)
         logger.info(f"Updated asset {asset_id} status to {status}")
+
+
+def is_archive(filename: str, content_type: str | None = None) -> bool:
+    """Check whether an uploaded part is an archive to be expanded"""
+    name = filename.lower()
+    return name.endswith(ARCHIVE_SUFFIXES) or (content_type or "") in ARCHIVE_CONTENT_TYPES
+
+
+def _sanitize_entry_name(name: str) -> str | None:
+    """
+    Normalize an archive entry name
+
+    Rejects absolute paths, parent-directory traversal, hidden files and
+    OS metadata so that nothing outside the archive's own tree is imported.
+
+    Returns:
+        The normalized relative path or None if the entry should be skipped
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or not path.parts:
+        return None
+    if any(part in ("", ".", "..") for part in path.parts):
+        return None
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return None
+    if path.name.lower() in _IGNORED_ENTRY_NAMES:
+        return None
+    return str(path)
+
+
+def iter_upload_entries(
+    sources: list[tuple[str, str, str | None]],
+) -> Iterator[tuple[str, str, bytes | None]]:
+    """
+    Lazily yield files from uploaded parts, expanding archives entry by entry
+
+    Only one entry is held in memory at a time. Tar archives are read in
+    streaming mode; zip archives are read through their central directory.
+    Entries larger than ``settings.max_upload_size`` are yielded without
+    being read, with None as their data.
+
+    Args:
+        sources: List of (original filename, spooled temp path, content type)
+
+    Yields:
+        Tuples of (relative filename, content type, file data or None)
+    """
+    for filename, temp_path, content_type in sources:
+        if not is_archive(filename, content_type):
+            name = _sanitize_entry_name(Path(filename).name)
+            if name is None:
+                continue
+            with open(temp_path, "rb") as f:
+                data = f.read()
+            yield name, content_type or _guess_content_type(name), data
+        elif zipfile.is_zipfile(temp_path):
+            yield from _iter_zip_entries(temp_path)
+        else:
+            yield from _iter_tar_entries(temp_path)
+
+
+def _iter_zip_entries(path: str) -> Iterator[tuple[str, str, bytes | None]]:
+    """Yield regular files from a zip archive"""
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            name = _sanitize_entry_name(info.filename)
+            if name is None:
+                continue
+            if info.file_size > settings.max_upload_size:
+                yield name, _guess_content_type(name), None
+                continue
+            yield name, _guess_content_type(name), archive.read(info)
+
+
+def _iter_tar_entries(path: str) -> Iterator[tuple[str, str, bytes | None]]:
+    """Yield regular files from a (possibly compressed) tar stream"""
+    with tarfile.open(path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            name = _sanitize_entry_name(member.name)
+            if name is None:
+                continue
+            if member.size > settings.max_upload_size:
+                yield name, _guess_content_type(name), None
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is None:
+                continue
+            yield name, _guess_content_type(name), extracted.read()
+
+
+def _guess_content_type(filename: str) -> str:
+    """Guess a MIME type from a filename"""
+    content_type, _ = mimetypes.guess_type(filename)
+    content_type = content_type or "application/octet-stream"
+    return _CONTENT_TYPE_ALIASES.get(content_type, content_type)
+
+
+def _store_bulk_entry(
+    project_id: str, filename: str, content_type: str, data: bytes | None, tags: list[str] | None
+) -> Asset:
+    """
+    Sanitize and upload one bulk entry (runs in a worker thread)
+
+    The Asset row is built but not added to a session; the caller inserts
+    all successful rows in a single transaction.
+    """
+    if data is None:
+        raise ValueError(f"exceeds maximum upload size of {settings.max_upload_size} bytes")
+    if not is_allowed_content_type(content_type):
+        raise ValueError(f"unsupported content type {content_type}")
+
+    asset = _build_asset_record(project_id, Path(filename).name, content_type, len(data))
+    asset.id = uuid.uuid4()
+    asset.asset_metadata["archive_path"] = filename
+    if tags:
+        asset.asset_metadata["tags"] = list(tags)
+
+    if asset.type == "image":
+        data = _strip_image_metadata(data, asset)
+        asset.exif_stripped = True
+
+    storage_path = _storage_path(asset, filename)
+    uploaded = upload_file_to_storage(
+        bucket_name=ASSET_BUCKET,
+        object_name=storage_path,
+        data=io.BytesIO(data),
+        length=len(data),
+        content_type=content_type,
+        ensure_bucket=False,
+    )
+    if not uploaded:
+        raise RuntimeError("upload to storage failed")
+
+    asset.path = storage_path
+    # Image metadata is complete once EXIF is stripped; audio/video still need extraction
+    asset.status = "processed" if asset.type == "image" else "uploaded"
+    return asset
+
+
+async def process_bulk_upload(
+    job_id: str,
+    project_id: str,
+    sources: list[tuple[str, str, str | None]],
+    tags: list[str] | None = None,
+) -> None:
+    """
+    Background task importing many assets at once
+
+    Entries are extracted one at a time off the event loop, sanitized and
+    uploaded by at most ``settings.bulk_upload_concurrency`` workers, and all
+    resulting Asset rows are inserted in one transaction. Progress is
+    reported through the job registry.
+
+    Args:
+        job_id: Job registry identifier
+        project_id: Project identifier
+        sources: List of (original filename, spooled temp path, content type)
+        tags: Optional tags recorded on every imported asset
+    """
+    job_registry.update(job_id, status=JOB_RUNNING)
+    semaphore = asyncio.Semaphore(max(1, settings.bulk_upload_concurrency))
+    stored: list[Asset] = []
+    workers: list[asyncio.Task] = []
+
+    async def _worker(filename: str, content_type: str, data: bytes | None) -> None:
+        try:
+            asset = await asyncio.to_thread(
+                _store_bulk_entry, project_id, filename, content_type, data, tags
+            )
+            stored.append(asset)
+            job_registry.increment(job_id, "processed")
+        except Exception as e:
+            logger.warning(f"Bulk job {job_id}: skipped {filename}: {e}")
+            job_registry.increment(job_id, "failed")
+            job_registry.add_error(job_id, f"{filename}: {e}")
+        finally:
+            semaphore.release()
+
+    try:
+        await asyncio.to_thread(_ensure_bucket_exists, ASSET_BUCKET)
+
+        entries = iter_upload_entries(sources)
+        count = 0
+        while True:
+            # Bound read-ahead: never hold more entries than there are free workers
+            await semaphore.acquire()
+            entry = await asyncio.to_thread(next, entries, None)
+            if entry is None:
+                semaphore.release()
+                break
+            count += 1
+            if count > settings.bulk_upload_max_entries:
+                semaphore.release()
+                job_registry.add_error(
+                    job_id, f"Entry limit of {settings.bulk_upload_max_entries} reached"
+                )
+                break
+            job_registry.update(job_id, total=count)
+            workers.append(asyncio.create_task(_worker(*entry)))
+
+        await asyncio.gather(*workers)
+
+        asset_ids = [str(asset.id) for asset in stored]
+        media_ids = [str(asset.id) for asset in stored if asset.type in ("audio", "video")]
+        if stored:
+            inserted = list(stored)
+            # From here on _insert_assets owns the objects, deleting them if it fails
+            stored.clear()
+            await asyncio.to_thread(_insert_assets, inserted)
+
+        job_registry.update(job_id, status=JOB_COMPLETED, result={"asset_ids": asset_ids})
+        logger.info(f"Bulk job {job_id}: imported {len(asset_ids)} assets into {project_id}")
+
+        for asset_id in media_ids:
+            await asyncio.to_thread(extract_metadata_task, asset_id=asset_id)
+
+    except Exception as e:
+        logger.error(f"Bulk job {job_id} failed: {e}")
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Objects uploaded before the failure have no row: remove them
+        await asyncio.to_thread(_delete_objects, stored)
+        job_registry.update(job_id, status=JOB_FAILED)
+        job_registry.add_error(job_id, str(e))
+    finally:
+        for _, temp_path, _ in sources:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+
+
+def _insert_assets(assets: list[Asset]) -> None:
+    """Insert Asset rows in one transaction, removing stored objects on failure"""
+    db = SessionLocal()
+    try:
+        db.add_all(assets)
+        db.commit()
+    except Exception:
+        db.rollback()
+        _delete_objects(assets)
+        raise
+    finally:
+        db.close()
+
+
+def _delete_objects(assets: list[Asset]) -> None:
+    """Remove the stored objects of assets that were never inserted"""
+    for asset in assets:
+        delete_file_from_storage(ASSET_BUCKET, asset.path)
@@ -0,0 +1,159 @@
+"""
+Asset Summaries Service
+
+Keeps compact, prompt-ready summaries of assets for context building. A
+summary holds the fields generation needs (id, type, name, path, tags and
+the metadata worth showing the model) together with the asset's prompt
+line, its token count and its words for relevance ranking. Summaries are
+keyed by ``(asset_id, updated_at)``, so a changed asset gets a new one,
+and are built when metadata extraction finishes, off the request path.
+
+Fetching the assets of a generation checks versions with one narrow query
+and loads the full rows of cache misses only, with a second one.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Asset
+from ..utils.frozen import freeze
+from ..utils.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Metadata fields shown to the model
+RELEVANT_METADATA = ("width", "height", "duration", "format", "size")
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def words(text: str) -> frozenset[str]:
+    """Words of a text that are worth matching on"""
+    return frozenset(word for word in _WORDS.findall(text.lower()) if len(word) > 2)
+
+
+@dataclass(frozen=True)
+class AssetSummary:
+    """Prompt-ready summary of one version of an asset"""
+
+    asset: dict[str, Any]
+    line: str
+    tokens: int
+    words: frozenset[str]
+
+
+def _version(updated_at: Any) -> str | None:
+    return updated_at.isoformat() if hasattr(updated_at, "isoformat") else updated_at
+
+
+class AssetSummaryCache:
+    """Service caching asset summaries per asset version"""
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size or settings.context_asset_cache_size
+        self._summaries: OrderedDict[tuple[Any, str | None], AssetSummary] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def summarize(self, asset: dict[str, Any]) -> AssetSummary:
+        """
+        Summary of an asset, from the cache when this version was seen before
+
+        Args:
+            asset: An asset dict, as from ``Asset.to_dict()``, or a summary's
+                own ``asset`` dict
+        """
+        key = (asset.get("id"), _version(asset.get("updated_at")))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+                self.stats["hits"] += 1
+                return summary
+            self.stats["misses"] += 1
+
+        summary = self._build(asset)
+        if key[0] is not None:
+            with self._lock:
+                self._summaries[key] = summary
+                while len(self._summaries) > self.max_size:
+                    self._summaries.popitem(last=False)
+        return summary
+
+    def refresh(self, asset: Asset) -> AssetSummary | None:
+        """Summarize an asset whose metadata has just been extracted"""
+        try:
+            return self.summarize(asset.to_dict())
+        except Exception as e:
+            # Only an optimization; the asset is summarized on first use instead
+            logger.warning(f"Failed to summarize asset {asset.id}: {e}")
+            return None
+
+    def fetch(self, db: Session, project_id: str, asset_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        Summarized assets of a project, in the order requested
+
+        Unknown ids and assets of other projects are left out.
+        """
+        if not asset_ids:
+            return []
+        versions = (
+            db.query(Asset.id, Asset.updated_at)
+            .filter(Asset.id.in_(asset_ids), Asset.project_id == project_id)
+            .all()
+        )
+        current = {str(asset_id): _version(updated_at) for asset_id, updated_at in versions}
+        with self._lock:
+            found = {
+                asset_id: self._summaries.get((asset_id, version))
+                for asset_id, version in current.items()
+            }
+        missing = [asset_id for asset_id, summary in found.items() if summary is None]
+        if missing:
+            for asset in db.query(Asset).filter(Asset.id.in_(missing)).all():
+                found[str(asset.id)] = self.summarize(asset.to_dict())
+        with self._lock:
+            self.stats["hits"] += len(current) - len(missing)
+
+        return [found[asset_id].asset for asset_id in asset_ids if found.get(asset_id)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summaries.clear()
+
+    @staticmethod
+    def _build(asset: dict[str, Any]) -> AssetSummary:
+        metadata = asset.get("metadata") or {}
+        name = asset.get("name") or metadata.get("original_filename", "")
+        tags = [str(tag) for tag in asset.get("tags") or metadata.get("tags", [])]
+        compact = {
+            "id": asset.get("id"),
+            "type": asset.get("type"),
+            "name": name,
+            "path": asset.get("path"),
+            "tags": tags,
+            "metadata": {k: v for k, v in metadata.items() if k in RELEVANT_METADATA},
+            "updated_at": _version(asset.get("updated_at")),
+        }
+        line = f"- {name or compact['id']} ({compact['type']}, id {compact['id']})"
+        if compact["metadata"]:
+            line += ": " + ", ".join(f"{k}={v}" for k, v in compact["metadata"].items())
+        return AssetSummary(
+            # Shared by every generation using this asset version
+            asset=freeze(compact),
+            line=line,
+            # One more token for the line break
+            tokens=count_tokens(line) + 1,
+            words=words(f"{name} {compact['type']} {' '.join(tags)}"),
+        )
+
+
+# Module-level singleton instance
+asset_summaries = AssetSummaryCache()
@@ -0,0 +1,539 @@
+"""
+Collaboration Service
+
+Real-time collaborative editing of stored scenes. Every scene being edited
+has a channel holding the authoritative scene state in memory. Clients
+submit entity edit operations (the same operations as ``PATCH
+/api/scenes/{id}``); the channel queues them in arrival order and, at a fixed
+tick rate, coalesces them (rapid updates of one entity collapse into one),
+applies them through ``Postprocessor.apply_entity_edits`` and broadcasts the
+resulting batch to every subscriber. Each batch is serialized once and the
+same text is queued for all subscribers; a subscriber that falls too far
+behind is disconnected and resyncs from a fresh snapshot on reconnect.
+
+The edited scene is persisted as a new version every
+``settings.collab_persist_interval`` seconds while it changes, and when the
+last subscriber leaves. If the scene was changed outside the session since
+(through the REST API), the operations applied since the last save are
+replayed on top of the stored scene instead of overwriting it, and every
+subscriber is resynced with a fresh snapshot.
+
+With several workers, ``settings.collab_backplane = "postgres"`` relays
+submissions through Postgres LISTEN/NOTIFY. Every worker receives the
+submissions in the same (commit) order and applies them to its own copy of
+the scene, so all copies stay identical; entity IDs of added entities are
+assigned before publishing for that reason. NOTIFY payloads are limited to
+8000 bytes, so larger submissions are rejected in that mode.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.serialization import dumps_str, loads
+from . import scene_service
+from .postprocessor import SceneEditError, postprocessor
+
+logger = logging.getLogger(__name__)
+
+# Fields of an update whose values are merged rather than replaced
+_MERGED_FIELDS = ("position", "size", "properties")
+
+# Largest NOTIFY payload Postgres accepts
+_MAX_NOTIFY_BYTES = 7999
+
+
+def coalesce_operations(operations: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merge repeated updates of the same entity into one operation
+
+    A drag produces a stream of position updates for one entity; only the
+    final state matters. Updates are merged into the first pending update of
+    their entity, until an add or remove of that entity ends the run.
+
+    Args:
+        operations: Entity edit operations in submission order
+
+    Returns:
+        Equivalent, usually much shorter, list of operations
+    """
+    coalesced: list[dict[str, Any]] = []
+    pending_updates: dict[Any, dict[str, Any]] = {}
+    for operation in operations:
+        kind = operation.get("op")
+        entity_id = (
+            (operation.get("entity") or {}).get("id") if kind == "add" else operation.get("id")
+        )
+        if kind != "update":
+            pending_updates.pop(entity_id, None)
+            coalesced.append(operation)
+            continue
+
+        changes = operation.get("changes") or {}
+        merged = pending_updates.get(entity_id)
+        if merged is None or "id" in changes:
+            merged = {"op": "update", "id": entity_id, "changes": {}}
+            pending_updates[entity_id] = merged
+            coalesced.append(merged)
+        for key, value in changes.items():
+            current = merged["changes"].get(key)
+            if key in _MERGED_FIELDS and isinstance(value, dict) and isinstance(current, dict):
+                merged["changes"][key] = {**current, **value}
+            else:
+                merged["changes"][key] = value
+    return coalesced
+
+
+def replay_operations(
+    scene_data: dict[str, Any], batches: list[list[dict[str, Any]]]
+) -> dict[str, Any]:
+    """
+    Apply batches of operations to a scene, skipping operations that no longer apply
+
+    Used to rebase live edits onto a scene changed outside the session, for
+    example an update of an entity that has since been removed.
+    """
+    for operations in batches:
+        try:
+            scene_data, _ = postprocessor.apply_entity_edits(scene_data, operations)
+        except SceneEditError:
+            for operation in operations:
+                try:
+                    scene_data, _ = postprocessor.apply_entity_edits(scene_data, [operation])
+                except SceneEditError as e:
+                    logger.info(f"Dropping live edit that no longer applies: {e}")
+    return scene_data
+
+
+def assign_entity_ids(operations: list[dict[str, Any]]) -> None:
+    """Give every added entity without an ID one, so all workers apply the same add"""
+    for operation in operations:
+        entity = operation.get("entity")
+        if operation.get("op") == "add" and isinstance(entity, dict) and "id" not in entity:
+            entity["id"] = f"entity_{uuid.uuid4().hex[:8]}"
+
+
+@dataclass
+class Submission:
+    """Operations submitted by one client in one message"""
+
+    client_id: str
+    client_seq: int | None
+    operations: list[dict[str, Any]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "client_id": self.client_id,
+            "client_seq": self.client_seq,
+            "operations": self.operations,
+        }
+
+
+@dataclass
+class Subscriber:
+    """A client connection's outgoing message queue"""
+
+    client_id: str
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(settings.collab_max_queue))
+    overflowed: bool = False
+
+    def offer(self, message: str) -> bool:
+        """Queue a message; on overflow drop the backlog and signal disconnection"""
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class SceneChannel:
+    """Authoritative in-memory state and subscribers of one scene"""
+
+    def __init__(self, hub: "CollaborationHub", scene_id: str):
+        self.hub = hub
+        self.scene_id = scene_id
+        self.scene_data: dict[str, Any] | None = None
+        self.version = 0
+        self.seq = 0
+        self.subscribers: dict[str, Subscriber] = {}
+        self._pending: list[Submission] = []
+        # Batches applied since the last save, replayed if the save has to rebase
+        self._unsaved: list[list[dict[str, Any]]] = []
+        self._load_lock = asyncio.Lock()
+        self._tick_task: asyncio.Task | None = None
+        self._dirty = False
+        self._last_persist = time.monotonic()
+
+    async def join(self) -> Subscriber:
+        """
+        Subscribe a new client, queueing the current snapshot as its first message
+
+        Raises:
+            LookupError: If the scene does not exist
+        """
+        async with self._load_lock:
+            if self.scene_data is None:
+                loaded = await asyncio.to_thread(self.hub.load_scene, self.scene_id)
+                if loaded is None:
+                    if not self.subscribers:
+                        self.hub.discard(self)
+                    raise LookupError(f"Scene {self.scene_id} not found")
+                self.scene_data, self.version = loaded
+        subscriber = Subscriber(client_id=uuid.uuid4().hex[:12])
+        subscriber.offer(
+            dumps_str(
+                {
+                    "type": "snapshot",
+                    "client_id": subscriber.client_id,
+                    "seq": self.seq,
+                    "version": self.version,
+                    "scene": self.scene_data,
+                }
+            )
+        )
+        self.subscribers[subscriber.client_id] = subscriber
+        if self._tick_task is None:
+            self._tick_task = asyncio.create_task(self._run())
+        return subscriber
+
+    async def leave(self, subscriber: Subscriber) -> None:
+        """Unsubscribe a client, flushing and persisting when it was the last one"""
+        self.subscribers.pop(subscriber.client_id, None)
+        if self.subscribers:
+            return
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        self.flush()
+        await self.persist()
+        if self.subscribers:
+            return
+        if self._dirty:
+            # The save failed: keep the channel and retry rather than lose the edits
+            self._tick_task = asyncio.create_task(self._run())
+            return
+        self.hub.discard(self)
+
+    def submit(self, submission: Submission) -> None:
+        """Queue operations for the next tick"""
+        self._pending.append(submission)
+
+    async def _run(self) -> None:
+        interval = 1.0 / max(settings.collab_tick_rate, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.flush()
+                if (
+                    self._dirty
+                    and time.monotonic() - self._last_persist >= settings.collab_persist_interval
+                ):
+                    await self.persist()
+            except Exception as e:
+                logger.error(f"Collaboration tick failed for scene {self.scene_id}: {e}")
+            if not self.subscribers and not self._dirty and not self._pending:
+                # Edits left behind by the last subscriber are saved now
+                self._tick_task = None
+                self.hub.discard(self)
+                return
+
+    def flush(self) -> None:
+        """Apply the queued operations and broadcast them as one batch"""
+        if not self._pending or self.scene_data is None:
+            return
+        submissions, self._pending = self._pending, []
+
+        operations = coalesce_operations(
+            list(itertools.chain.from_iterable(s.operations for s in submissions))
+        )
+        try:
+            self.scene_data, _ = postprocessor.apply_entity_edits(self.scene_data, operations)
+            applied = submissions
+        except SceneEditError:
+            # Isolate the failing submissions and apply the rest in order
+            applied, operations = [], []
+            for submission in submissions:
+                try:
+                    self.scene_data, _ = postprocessor.apply_entity_edits(
+                        self.scene_data, submission.operations
+                    )
+                except SceneEditError as e:
+                    self._send_error(submission, str(e))
+                    continue
+                applied.append(submission)
+                operations.extend(submission.operations)
+            operations = coalesce_operations(operations)
+        if not applied:
+            return
+
+        self.seq += 1
+        self._dirty = True
+        self._unsaved.append(operations)
+        acks: dict[str, int | None] = {}
+        for submission in applied:
+            acks[submission.client_id] = submission.client_seq
+        self.broadcast({"type": "batch", "seq": self.seq, "operations": operations, "acks": acks})
+
+    def broadcast(self, message: dict[str, Any]) -> None:
+        """Serialize a message once and queue it for every subscriber"""
+        text = dumps_str(message)
+        for subscriber in list(self.subscribers.values()):
+            if not subscriber.offer(text):
+                logger.warning(
+                    f"Dropping slow subscriber {subscriber.client_id} of scene {self.scene_id}"
+                )
+
+    def _send_error(self, submission: Submission, detail: str) -> None:
+        subscriber = self.subscribers.get(submission.client_id)
+        if subscriber is not None:
+            subscriber.offer(
+                dumps_str({"type": "error", "client_seq": submission.client_seq, "detail": detail})
+            )
+
+    async def persist(self) -> None:
+        """Store the current state as a new scene version if it changed"""
+        if not self._dirty or self.scene_data is None:
+            return
+        self._dirty = False
+        self._last_persist = time.monotonic()
+        scene_data, unsaved = self.scene_data, self._unsaved
+        self._unsaved = []
+        try:
+            saved = await asyncio.to_thread(
+                self.hub.save_scene, self.scene_id, scene_data, self.version, unsaved
+            )
+        except LookupError:
+            logger.warning(f"Scene {self.scene_id} was deleted; dropping its live edits")
+            return
+        if saved is None:
+            # Retried at the next persist, with the batches applied meanwhile
+            self._unsaved = unsaved + self._unsaved
+            self._dirty = True
+            return
+        self.version, stored = saved
+        if stored is scene_data:
+            self.broadcast({"type": "saved", "seq": self.seq, "version": self.version})
+            return
+
+        # Rebased onto changes made outside the session: resync every subscriber,
+        # keeping the batches applied while saving
+        self.scene_data = replay_operations(stored, self._unsaved)
+        self.seq += 1
+        self.broadcast(
+            {"type": "snapshot", "seq": self.seq, "version": self.version, "scene": self.scene_data}
+        )
+
+
+class PostgresBackplane:
+    """Relays submissions between workers through Postgres LISTEN/NOTIFY"""
+
+    CHANNEL = "scene_collaboration"
+
+    def __init__(self, dsn: str, deliver: Callable[[str, Submission], None]):
+        self.dsn = dsn
+        self.deliver = deliver
+        self._listen_conn = None
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self) -> None:
+        """Open the listening connection and watch it on the event loop"""
+        import psycopg2
+        import psycopg2.extensions
+
+        def connect():
+            conn = psycopg2.connect(self.dsn)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            return conn
+
+        self._listen_conn = await asyncio.to_thread(connect)
+        self._notify_conn = await asyncio.to_thread(connect)
+        with self._listen_conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.CHANNEL}")
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._listen_conn.fileno(), self._on_readable)
+        logger.info("Collaboration backplane listening on Postgres")
+
+    def _on_readable(self) -> None:
+        self._listen_conn.poll()
+        while self._listen_conn.notifies:
+            notify = self._listen_conn.notifies.pop(0)
+            try:
+                payload = loads(notify.payload)
+                submission = Submission(
+                    client_id=payload["client_id"],
+                    client_seq=payload.get("client_seq"),
+                    operations=payload["operations"],
+                )
+                self.deliver(payload["scene_id"], submission)
+            except Exception as e:
+                logger.error(f"Invalid collaboration notification: {e}")
+
+    async def publish(self, scene_id: str, submission: Submission) -> None:
+        """
+        Broadcast a submission to every worker (including this one)
+
+        Raises:
+            ValueError: If the submission exceeds the NOTIFY payload limit
+        """
+        payload = dumps_str({"scene_id": scene_id, **submission.to_dict()})
+        if len(payload.encode("utf-8")) > _MAX_NOTIFY_BYTES:
+            raise ValueError("Submission too large for the Postgres backplane")
+        await asyncio.to_thread(self._notify, payload)
+
+    def _notify(self, payload: str) -> None:
+        with self._notify_lock, self._notify_conn.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", (self.CHANNEL, payload))
+
+    async def close(self) -> None:
+        if self._loop is not None and self._listen_conn is not None:
+            self._loop.remove_reader(self._listen_conn.fileno())
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn is not None:
+                conn.close()
+        self._listen_conn = self._notify_conn = None
+
+
+def _postgres_dsn(database_url: str) -> str:
+    """Turn a SQLAlchemy database URL into a libpq connection string"""
+    from sqlalchemy.engine import make_url
+
+    return make_url(database_url).set(drivername="postgresql").render_as_string(False)
+
+
+class CollaborationHub:
+    """Registry of scene channels and the optional cross-worker backplane"""
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+        self._channels: dict[str, SceneChannel] = {}
+        self._backplane: PostgresBackplane | None = None
+        self._backplane_lock = asyncio.Lock()
+
+    def channel(self, scene_id: str) -> SceneChannel:
+        """Get or create the channel of a scene"""
+        channel = self._channels.get(scene_id)
+        if channel is None:
+            channel = self._channels[scene_id] = SceneChannel(self, scene_id)
+        return channel
+
+    def discard(self, channel: SceneChannel) -> None:
+        if self._channels.get(channel.scene_id) is channel:
+            del self._channels[channel.scene_id]
+
+    async def submit(self, channel: SceneChannel, submission: Submission) -> None:
+        """Order a submission, through the backplane when one is configured"""
+        assign_entity_ids(submission.operations)
+        backplane = await self._get_backplane()
+        if backplane is None:
+            channel.submit(submission)
+        else:
+            await backplane.publish(channel.scene_id, submission)
+
+    def _deliver(self, scene_id: str, submission: Submission) -> None:
+        channel = self._channels.get(scene_id)
+        if channel is not None:
+            channel.submit(submission)
+
+    async def _get_backplane(self) -> PostgresBackplane | None:
+        if settings.collab_backplane != "postgres":
+            return None
+        async with self._backplane_lock:
+            if self._backplane is None:
+                backplane = PostgresBackplane(_postgres_dsn(settings.database_url), self._deliver)
+                await backplane.start()
+                self._backplane = backplane
+        return self._backplane
+
+    async def close(self) -> None:
+        """Persist every open channel and stop the backplane"""
+        for channel in list(self._channels.values()):
+            channel.flush()
+            await channel.persist()
+        self._channels.clear()
+        if self._backplane is not None:
+            await self._backplane.close()
+            self._backplane = None
+
+    def load_scene(self, scene_id: str) -> tuple[dict[str, Any], int] | None:
+        """Load a scene's latest data and version number"""
+        db = self.session_factory()
+        try:
+            scene = scene_service.get_scene(db, scene_id)
+            if scene is None:
+                return None
+            return scene.scene_data or {}, scene_service.head_version(db, scene.id)
+        finally:
+            db.close()
+
+    def save_scene(
+        self,
+        scene_id: str,
+        scene_data: dict[str, Any],
+        base_version: int,
+        unsaved: list[list[dict[str, Any]]],
+    ) -> tuple[int, dict[str, Any]] | None:
+        """
+        Store edited scene data as a new version
+
+        When the scene is no longer at ``base_version``, the ``unsaved``
+        operation batches are replayed onto its latest data instead, so
+        changes made outside the session are kept.
+
+        Returns:
+            The version number and the data stored (``scene_data`` itself
+            unless it had to be rebased), or None if the save failed
+
+        Raises:
+            LookupError: If the scene no longer exists
+        """
+        db = self.session_factory()
+        try:
+            scene = scene_service.get_scene(db, scene_id)
+            if scene is None:
+                raise LookupError(f"Scene {scene_id} not found")
+            head = scene_service.head_version(db, scene.id)
+            if head != base_version:
+                current = scene.scene_data or {}
+                if current == scene_data:
+                    # Another worker stored the same edits first
+                    return head, scene_data
+                scene_data = replay_operations(current, unsaved)
+            return scene_service.update_scene(db, scene, scene_data), scene_data
+        except IntegrityError:
+            # Another worker stored the same edits (or rebased them the same way) first
+            db.rollback()
+            loaded = self.load_scene(scene_id)
+            if loaded is None:
+                raise LookupError(f"Scene {scene_id} not found") from None
+            stored, version = loaded
+            return version, scene_data if stored == scene_data else stored
+        except LookupError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to persist collaborative edits of scene {scene_id}: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+
+# Module-level singleton instance
+collaboration_hub = CollaborationHub()
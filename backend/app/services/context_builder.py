@@ -4,19 +4,50 @@ Context Builder Service
 This service is responsible for constructing prompts for AI generation.
 It takes user input and project context to create optimized prompts
 for the inference engine.
+
+Engineered prompts are held to ``max_context_length`` tokens: assets are
+ranked by how many words they share with the user's prompt, and the most
+relevant are described in the prompt for as long as they fit. Asset lines
+and token counts come from the asset summary cache, so repeated
+generations over the same project only rank and pack.
+
+Prompts are rendered from the templates in ``prompt_templates/``:
+``system.txt`` and ``styles/<style>.txt`` make up the prompt prefix sent as
+the system message, and ``request.txt`` the per-request part. The prefix
+is the same for every request of a style, so model servers with prefix
+caching reuse its computation. Templates are compiled on first use and
+recompiled when their file changes.
 """
 
 import hashlib
 import json
+import re
+from pathlib import Path
+from string import Template
 from typing import Any
 
+from ..config import settings
+from ..utils.tokens import count_tokens
+from .asset_summaries import asset_summaries, words
+
+ASSETS_HEADER = "Available assets:"
+
+_STYLE_NAME = re.compile(r"[a-z0-9_]+")
+
+
+def _style_name(style: Any) -> str:
+    """Plain name of a style, which may be given as a GameStyle"""
+    return str(getattr(style, "value", style))
+
 
 class ContextBuilder:
     """Service for building generation contexts and prompts"""
 
     def __init__(self):
-        self.max_context_length = 2048
-        self.template_cache = {}
+        self.max_context_length = settings.context_max_tokens
+        self.templates_path = Path(__file__).parent.parent / "prompt_templates"
+        # Template name -> (file mtime, compiled template, token count)
+        self.template_cache: dict[str, tuple[int, Template, int]] = {}
 
     def build_generation_prompt(
         self,
@@ -26,6 +57,7 @@ class ContextBuilder:
         style: str | None = None,
         additional_context: dict[str, Any] | None = None,
         constraints: dict[str, Any] | None = None,
+        related_assets: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         """
         Build a structured prompt for scene generation
@@ -36,6 +68,8 @@ class ContextBuilder:
             assets: List of available assets with metadata
             style: The desired game style (platformer, rpg, etc.)
             additional_context: Any additional context parameters
+            related_assets: Further assets found relevant to the prompt, most
+                relevant first, offered once the requested assets are in
 
         Returns:
             A structured prompt dictionary ready for inference
@@ -50,7 +84,6 @@ class ContextBuilder:
 
         # Add asset context if provided
         if assets:
-            context["assets"] = self._process_assets(assets)
             context["asset_count"] = len(assets)
 
         # Add constraints if provided
@@ -61,11 +94,27 @@ class ContextBuilder:
         if additional_context:
             context.update(additional_context)
 
+        # Apply prompt engineering techniques
+        context["prompt_prefix"], prefix_tokens = self._prompt_prefix(context["style"])
+        engineered = self._engineer_prompt(user_prompt, context)
+        if assets or related_assets:
+            budget = (
+                self.max_context_length
+                - prefix_tokens
+                - count_tokens(engineered)
+                - count_tokens(ASSETS_HEADER)
+            )
+            context["assets"], lines = self._process_assets(
+                assets or [], user_prompt, budget, related_assets or []
+            )
+            engineered = self._engineer_prompt(user_prompt, context)
+            if lines:
+                engineered += "\n" + "\n".join([ASSETS_HEADER, *lines])
+        context["engineered_prompt"] = engineered
+
         # Generate prompt hash for caching
         context["prompt_hash"] = self._generate_prompt_hash(context)
-
-        # Apply prompt engineering techniques
-        context["engineered_prompt"] = self._engineer_prompt(user_prompt, context)
+        context["prompt_tokens"] = prefix_tokens + count_tokens(engineered)
 
         return context
 
@@ -108,40 +157,83 @@ class ContextBuilder:
             for field in required_fields
         )
 
-    def _process_assets(self, assets: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Process and filter assets for context inclusion"""
-        processed = []
-        for asset in assets[:50]:  # Limit to prevent context overflow
-            processed.append(
-                {
-                    "id": asset.get("id"),
-                    "type": asset.get("type"),
-                    "name": asset.get("name", ""),
-                    "metadata": self._extract_relevant_metadata(asset.get("metadata", {})),
-                }
-            )
-        return processed
+    def _process_assets(
+        self,
+        assets: list[dict[str, Any]],
+        user_prompt: str,
+        budget: int,
+        related_assets: list[dict[str, Any]],
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Pick the assets most relevant to the prompt that fit the token budget
+
+        Requested assets are ranked by the words they share with the prompt;
+        related assets follow in the order given, if there is room left.
 
-    def _extract_relevant_metadata(self, metadata: dict[str, Any]) -> dict[str, Any]:
-        """Extract only relevant metadata fields"""
-        relevant_fields = ["width", "height", "duration", "format", "size"]
-        return {k: v for k, v in metadata.items() if k in relevant_fields}
+        Returns:
+            Context entries and prompt lines of the picked assets
+        """
+        prompt_words = words(user_prompt)
+        summaries = [asset_summaries.summarize(asset) for asset in assets]
+        # Stable, so equally relevant assets keep the order they were given in
+        summaries.sort(key=lambda summary: len(prompt_words & summary.words), reverse=True)
+        requested = {summary.asset["id"] for summary in summaries}
+        summaries += [
+            asset_summaries.summarize(asset)
+            for asset in related_assets
+            if asset.get("id") not in requested
+        ]
+
+        processed, lines = [], []
+        for summary in summaries:
+            if summary.tokens > budget:
+                continue
+            budget -= summary.tokens
+            processed.append(summary.asset)
+            lines.append(summary.line)
+        return processed, lines
 
     def _engineer_prompt(self, user_prompt: str, context: dict[str, Any]) -> str:
         """Apply prompt engineering techniques"""
-        style = context.get("style", "platformer")
-        asset_count = context.get("asset_count", 0)
-
-        engineered = (
-            f"Create a {style} game scene based on the following description: {user_prompt}"
+        style = _style_name(context.get("style", "platformer"))
+        # Once assets are packed, only those that made it into the prompt count
+        asset_count = (
+            len(context["assets"]) if "assets" in context else context.get("asset_count", 0)
         )
-
+        asset_note = ""
         if asset_count > 0:
-            engineered += f" The scene should incorporate {asset_count} available assets."
-
-        engineered += " Generate a structured JSON scene with entities, positions, and properties."
+            asset_note = f" The scene should incorporate {asset_count} available assets."
+
+        template, _ = self._template("request")
+        return template.substitute(style=style, user_prompt=user_prompt, asset_note=asset_note)
+
+    def _prompt_prefix(self, style: Any) -> tuple[str, int]:
+        """Shared system section and style guidance, with its token count"""
+        sections = [self._template("system")]
+        name = _style_name(style)
+        if (
+            _STYLE_NAME.fullmatch(name)
+            and (self.templates_path / "styles" / f"{name}.txt").exists()
+        ):
+            sections.append(self._template(f"styles/{name}"))
+        prefix = "\n\n".join(template.template for template, _ in sections)
+        return prefix, sum(tokens for _, tokens in sections) + len(sections) - 1
+
+    def _template(self, name: str) -> tuple[Template, int]:
+        """
+        Compiled template and its token count, recompiled when its file changes
 
-        return engineered
+        Raises:
+            FileNotFoundError: The template does not exist
+        """
+        path = self.templates_path / f"{name}.txt"
+        mtime = path.stat().st_mtime_ns
+        cached = self.template_cache.get(name)
+        if cached is None or cached[0] != mtime:
+            text = path.read_text(encoding="utf-8").strip()
+            cached = (mtime, Template(text), count_tokens(text))
+            self.template_cache[name] = cached
+        return cached[1], cached[2]
 
     def _generate_prompt_hash(self, context: dict[str, Any]) -> str:
         """Generate a hash for prompt caching"""
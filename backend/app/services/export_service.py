@@ -0,0 +1,438 @@
+"""
+Export Service
+
+Builds playable export packages from scenes:
+- HTML5 runner packages streamed as zip archives
+- Godot 4 text scenes (see godot_exporter)
+- Real-mode exports with assets fetched from storage in parallel
+- An export cache in object storage keyed on scene content, engine and
+  runner version, so unchanged scenes are re-exported instantly
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.core_models import Asset, Scene
+from ..storage import (
+    download_file_to_path,
+    stat_file_in_storage,
+    stream_file_from_storage,
+    upload_file_to_storage,
+)
+from ..utils.scene_codec import SCENE_DECODER_JS, encode_scene
+from ..utils.serialization import dumps
+from ..utils.zip_stream import ZipEntry, stream_zip
+from . import godot_exporter
+from .asset_service import ASSET_BUCKET
+
+logger = logging.getLogger(__name__)
+
+# Bucket holding cached export packages
+EXPORT_BUCKET = "ossgameforge-exports"
+
+# Bump when an engine's output format changes so cached packages are rebuilt
+RUNNER_VERSIONS = {"html5": "2", "godot": "2"}
+
+EXPORT_MEDIA_TYPES = {"html5": "application/zip", "godot": "text/plain"}
+EXPORT_EXTENSIONS = {"html5": "zip", "godot": "tscn"}
+
+_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=1)
+def _scene_decoder_js() -> str:
+    """Browser-side binary scene decoder inlined into the HTML5 runner"""
+    return SCENE_DECODER_JS.read_text(encoding="utf-8")
+
+
+def _render_html5_runner(scene_data: dict) -> str:
+    """Render the HTML5 runner page with the scene inlined"""
+    return """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>OSSGameForge - {title}</title>
+    <style>
+        body {{
+            margin: 0;
+            padding: 0;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+            background: #222;
+            font-family: Arial, sans-serif;
+        }}
+        #gameCanvas {{
+            border: 2px solid #444;
+            background: {bg_color};
+        }}
+        .info {{
+            position: absolute;
+            top: 10px;
+            left: 10px;
+            color: white;
+            font-size: 14px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="info">
+        <h3>{title}</h3>
+        <p>{description}</p>
+        <p>Use arrow keys to move (mock export)</p>
+    </div>
+    <canvas id="gameCanvas" width="{width}" height="{height}"></canvas>
+    <script>
+{scene_decoder}
+    </script>
+    <script>
+        // Scene is embedded in the compact binary scene format (see scene_codec.py)
+        const sceneData = (function () {{
+            const raw = atob('{scene_base64}');
+            const bytes = new Uint8Array(raw.length);
+            for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+            return decodeScene(bytes.buffer);
+        }})();
+        const canvas = document.getElementById('gameCanvas');
+        const ctx = canvas.getContext('2d');
+
+        // Simple render function
+        function render() {{
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+            // Render entities
+            if (sceneData.entities) {{
+                sceneData.entities.forEach(entity => {{
+                    if (entity.color) {{
+                        ctx.fillStyle = entity.color;
+                        ctx.fillRect(
+                            entity.position.x,
+                            entity.position.y,
+                            entity.size.width,
+                            entity.size.height
+                        );
+                    }}
+
+                    // Draw entity name
+                    ctx.fillStyle = 'white';
+                    ctx.font = '12px Arial';
+                    ctx.fillText(
+                        entity.name || entity.type,
+                        entity.position.x,
+                        entity.position.y - 5
+                    );
+                }});
+            }}
+        }}
+
+        // Initial render
+        render();
+
+        // Simple game loop
+        function gameLoop() {{
+            render();
+            requestAnimationFrame(gameLoop);
+        }}
+
+        gameLoop();
+    </script>
+</body>
+</html>""".format(
+        title=scene_data.get("name", "Untitled Game"),
+        description=scene_data.get("description", ""),
+        width=scene_data.get("metadata", {}).get("width", 1920),
+        height=scene_data.get("metadata", {}).get("height", 1080),
+        bg_color=scene_data.get("metadata", {}).get("background_color", "#87CEEB"),
+        scene_decoder=_scene_decoder_js(),
+        scene_base64=base64.b64encode(encode_scene(scene_data)).decode("ascii"),
+    )
+
+
+def _render_readme(scene_data: dict) -> str:
+    """Render the README bundled with exports"""
+    return f"""# {scene_data.get("name", "OSSGameForge Game")}
+
+## Description
+{scene_data.get("description", "Generated with OSSGameForge")}
+
+## How to Play
+1. Open index.html in a web browser
+2. Use arrow keys to move (if implemented)
+3. Enjoy your game!
+
+## Scene Information
+- Scene ID: {scene_data.get("id", "unknown")}
+- Created: {scene_data.get("created_at", "unknown")}
+- Version: {scene_data.get("version", "1.0.0")}
+
+Generated with OSSGameForge
+"""
+
+
+def iter_html5_export(
+    scene_data: dict,
+    assets: Iterable[ZipEntry] | None = None,
+    asset_manifest: dict[str, str] | None = None,
+) -> Iterator[bytes]:
+    """
+    Stream an HTML5 export package as zip bytes
+
+    The runner page, scene JSON and README are rendered up front; asset
+    entries are pulled lazily and written under ``assets/`` as their chunks
+    arrive, so memory use does not grow with the size of the export.
+
+    Args:
+        scene_data: Scene to export
+        assets: Optional (relative path, content or chunk iterable) entries
+        asset_manifest: Optional mapping of scene asset paths to package paths,
+            written as ``asset_manifest.json``
+
+    Returns:
+        Iterator over the encoded zip archive
+    """
+    documents: list[ZipEntry] = [
+        ("index.html", _render_html5_runner(scene_data)),
+        ("scene.json", dumps(scene_data, indent=True)),
+        ("README.md", _render_readme(scene_data)),
+    ]
+    if asset_manifest:
+        documents.append(("asset_manifest.json", dumps(asset_manifest, indent=True)))
+
+    def _entries() -> Iterator[ZipEntry]:
+        yield from documents
+        for name, content in assets or ():
+            yield f"assets/{name.lstrip('/')}", content
+
+    return stream_zip(_entries())
+
+
+def create_html5_export(scene_data: dict) -> bytes:
+    """Create a simple HTML5 export package"""
+    return b"".join(iter_html5_export(scene_data))
+
+
+def render_godot_scene(scene_data: dict) -> str:
+    """Render a scene as a Godot 4 text scene (.tscn)"""
+    return godot_exporter.render_tscn(scene_data)
+
+
+@dataclass
+class ExportPackage:
+    """A finished export ready to be streamed to the client"""
+
+    chunks: Iterator[bytes]
+    media_type: str
+    size: int
+    cache_key: str
+    cache_hit: bool
+
+
+def scene_content_hash(scene_data: dict[str, Any]) -> str:
+    """Stable hash of a scene's content, independent of key order"""
+    return hashlib.sha256(dumps(scene_data, sort_keys=True)).hexdigest()
+
+
+def export_cache_key(scene_data: dict[str, Any], engine: str, include_assets: bool) -> str:
+    """Object name of a cached export for (scene content, engine, runner version)"""
+    suffix = "-assets" if include_assets and engine == "html5" else ""
+    return (
+        f"{engine}/v{RUNNER_VERSIONS[engine]}/"
+        f"{scene_content_hash(scene_data)}{suffix}.{EXPORT_EXTENSIONS[engine]}"
+    )
+
+
+def referenced_asset_ids(scene_data: dict[str, Any]) -> list[str]:
+    """IDs of stored assets referenced by a scene, in first-seen order"""
+    ids: dict[str, None] = {}
+    for ref in scene_data.get("assets") or []:
+        if isinstance(ref, dict) and ref.get("id"):
+            ids[str(ref["id"])] = None
+    return list(ids)
+
+
+def resolve_scene_assets(db: Session, scene: Scene) -> list[Asset]:
+    """Load the stored assets a scene references, limited to its project"""
+    asset_ids = referenced_asset_ids(scene.scene_data or {})
+    if not asset_ids:
+        return []
+    return (
+        db.query(Asset).filter(Asset.id.in_(asset_ids), Asset.project_id == scene.project_id).all()
+    )
+
+
+async def fetch_assets(assets: list[Asset], dest_dir: str) -> list[tuple[str, str]]:
+    """
+    Download assets to a local directory with bounded parallelism
+
+    At most ``settings.export_asset_concurrency`` downloads run at once and
+    each object is written straight to disk, so memory use stays flat.
+
+    Args:
+        assets: Assets to fetch
+        dest_dir: Directory to download into
+
+    Returns:
+        List of (storage path, local path) for successfully fetched assets
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.export_asset_concurrency))
+
+    async def _fetch(asset: Asset) -> tuple[str, str] | None:
+        if not asset.path or asset.path == "pending":
+            return None
+        name = Path(asset.path).name
+        local_path = os.path.join(dest_dir, name)
+        async with semaphore:
+            ok = await asyncio.to_thread(
+                download_file_to_path, ASSET_BUCKET, asset.path, local_path
+            )
+        if not ok:
+            logger.warning(f"Skipping asset {asset.id} in export: download failed")
+            return None
+        return asset.path, local_path
+
+    results = await asyncio.gather(*(_fetch(asset) for asset in assets))
+    return [result for result in results if result is not None]
+
+
+def _iter_file(path: str) -> Iterator[bytes]:
+    """Lazily read a local file in chunks"""
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            yield chunk
+
+
+def _iter_file_and_cleanup(path: str, cleanup_dir: str) -> Iterator[bytes]:
+    """Read a local file in chunks, removing its directory once done"""
+    try:
+        yield from _iter_file(path)
+    finally:
+        shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+def _render_package(
+    engine: str, scene_data: dict[str, Any], asset_files: list[tuple[str, str]]
+) -> Iterator[bytes]:
+    """Encode an export package for an engine"""
+    if engine == "html5":
+        # Map storage paths referenced by the scene to their location in the package
+        manifest = {path: f"assets/{Path(path).name}" for path, _ in asset_files}
+        entries: list[ZipEntry] = [
+            (Path(path).name, _iter_file(local_path)) for path, local_path in asset_files
+        ]
+        return iter_html5_export(scene_data, entries, manifest)
+    if engine == "godot":
+        return (chunk.encode() for chunk in godot_exporter.iter_tscn(scene_data))
+    raise ValueError(f"Export engine {engine} not yet supported")
+
+
+def _write_package(chunks: Iterable[bytes], path: str) -> int:
+    """Write package chunks to a local file, returning its size"""
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+# Per-key locks so concurrent exports of the same scene build only once
+_build_locks: dict[str, asyncio.Lock] = {}
+
+
+async def get_or_build_export(
+    db: Session, scene: Scene, engine: str, include_assets: bool = True
+) -> ExportPackage:
+    """
+    Return a cached export package or build, cache and return a new one
+
+    Args:
+        db: Database session
+        scene: Scene to export
+        engine: Target engine ("html5" or "godot")
+        include_assets: Bundle referenced assets (HTML5 only)
+
+    Returns:
+        ExportPackage streaming either from the cache or a fresh build
+    """
+    if engine not in RUNNER_VERSIONS:
+        raise ValueError(f"Export engine {engine} not yet supported")
+
+    scene_data = scene.scene_data or {}
+    key = export_cache_key(scene_data, engine, include_assets)
+    media_type = EXPORT_MEDIA_TYPES[engine]
+
+    lock = _build_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            info = await asyncio.to_thread(stat_file_in_storage, EXPORT_BUCKET, key)
+            if info is not None:
+                logger.info(f"Export cache hit for scene {scene.id} ({key})")
+                chunks = await asyncio.to_thread(stream_file_from_storage, EXPORT_BUCKET, key)
+                return ExportPackage(chunks, media_type, info.size, key, cache_hit=True)
+
+            work_dir = tempfile.mkdtemp(prefix="export_")
+            try:
+                package_path, size = await _build_package(
+                    db, scene, engine, include_assets, key, work_dir
+                )
+            except BaseException:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                raise
+
+            return ExportPackage(
+                _iter_file_and_cleanup(package_path, work_dir),
+                media_type,
+                size,
+                key,
+                cache_hit=False,
+            )
+    finally:
+        # Waiters keep their own reference to the lock, so it can be dropped here
+        if not lock.locked():
+            _build_locks.pop(key, None)
+
+
+async def _build_package(
+    db: Session, scene: Scene, engine: str, include_assets: bool, key: str, work_dir: str
+) -> tuple[str, int]:
+    """Build an export package in a work directory and store it in the cache"""
+    scene_data = scene.scene_data or {}
+    asset_files: list[tuple[str, str]] = []
+    if include_assets and engine == "html5":
+        assets = resolve_scene_assets(db, scene)
+        asset_files = await fetch_assets(assets, work_dir)
+
+    package_path = os.path.join(work_dir, f"package.{EXPORT_EXTENSIONS[engine]}")
+    size = await asyncio.to_thread(
+        lambda: _write_package(_render_package(engine, scene_data, asset_files), package_path)
+    )
+
+    with open(package_path, "rb") as package:
+        cached = await asyncio.to_thread(
+            upload_file_to_storage,
+            EXPORT_BUCKET,
+            key,
+            package,
+            size,
+            EXPORT_MEDIA_TYPES[engine],
+        )
+    if not cached:
+        logger.warning(f"Could not cache export {key}")
+
+    logger.info(f"Built export for scene {scene.id} ({size} bytes, {key})")
+    return package_path, size
@@ -0,0 +1,326 @@
+"""
+Generation Jobs Service
+
+Runs scene generations as background jobs, so clients do not hold a
+connection open for the whole model call. A submitted job is tracked in
+the job registry and runs as a task on the event loop: context building,
+then inference, then postprocessing (in a worker thread), then saving the
+generation log and scene. At most ``settings.generation_job_concurrency``
+jobs per model server run inference at once; the others wait in the
+``queued`` stage.
+
+Every change of a job wakes the clients streaming its progress, so they
+need not poll.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.core_models import GenerationLog
+from . import scene_service
+from .asset_index import asset_index
+from .asset_summaries import asset_summaries
+from .context_builder import context_builder
+from .inference_client import inference_client
+from .job_registry import JOB_COMPLETED, JOB_FAILED, JOB_RUNNING, job_registry
+from .playability import playability_validator
+from .postprocessor import postprocessor
+from .scene_cache import serialize_scene
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "generation"
+
+# Stages a generation job goes through, in order
+STAGES = ("queued", "building_context", "inference", "postprocessing", "saving")
+
+
+def input_hash(prompt: str, project_id: str, style: str | None, assets: list[str] | None) -> str:
+    """Hash of a generation's input, for deduplication"""
+    input_data = f"{prompt}_{project_id}_{style or 'default'}"
+    if assets:
+        input_data += f"_{'_'.join(assets)}"
+    return hashlib.sha256(input_data.encode()).hexdigest()[:16]
+
+
+def fetch_assets(db: Session, project_id: str, asset_ids: list[str] | None) -> list[dict]:
+    """Fetch prompt-ready summaries of the requested assets of a project"""
+    if not asset_ids:
+        return []
+    return asset_summaries.fetch(db, project_id, asset_ids)
+
+
+def find_related_assets(db: Session, project_id: str, prompt: str) -> list[dict]:
+    """
+    Assets of a project most similar to a prompt, offered to the model besides requested ones
+
+    May embed the project's new assets first, so call it off the event loop,
+    with a session of that thread.
+    """
+    try:
+        return asset_index.search(
+            db,
+            project_id,
+            prompt,
+            settings.asset_retrieval_top_k,
+            min_score=settings.asset_retrieval_min_score,
+        )
+    except Exception as e:
+        # Generation works without them
+        logger.warning(f"Asset retrieval failed for project {project_id}: {e}")
+        return []
+
+
+async def related_assets_by_prompt(
+    db: Session, project_id: str, prompts: list[str]
+) -> dict[str, list[dict]]:
+    """
+    ``find_related_assets`` of several prompts, for callers on the event loop
+
+    Reads the index changes with ``db`` on the loop, then embeds changed
+    assets and all prompts in one worker thread call; the session never
+    leaves its thread.
+    """
+    try:
+        changes = asset_index.changes(db, project_id)
+        return await asyncio.to_thread(
+            asset_index.search_many,
+            project_id,
+            changes,
+            list(dict.fromkeys(prompts)),
+            settings.asset_retrieval_top_k,
+            min_score=settings.asset_retrieval_min_score,
+        )
+    except Exception as e:
+        logger.warning(f"Asset retrieval failed for project {project_id}: {e}")
+        return {prompt: [] for prompt in prompts}
+
+
+def generation_metadata(
+    generation_result: dict[str, Any],
+    context: dict[str, Any],
+    postprocessing: dict[str, Any],
+    scene: dict[str, Any],
+    etag: str,
+) -> dict[str, Any]:
+    """Metadata returned alongside a generated scene"""
+    metadata = {
+        "status": generation_result["metadata"]["status"],
+        "model_version": generation_result["metadata"]["model_version"],
+        "use_local_model": generation_result["metadata"].get("use_local_model", False),
+        "fallback_sample": generation_result["metadata"].get("fallback_sample"),
+        "prompt_hash": context["prompt_hash"],
+        "postprocessing": postprocessing,
+    }
+    if settings.validate_playability:
+        # Keyed by content, so repeated fallback samples reuse their navigation graph
+        metadata["playability"] = playability_validator.validate(scene, cache_key=etag).to_dict()
+    return metadata
+
+
+class GenerationJobRunner:
+    """Service running scene generations in the background"""
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._updated: dict[str, asyncio.Event] = {}
+
+    def submit(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Start generating a scene in the background
+
+        Must be called from the event loop.
+
+        Args:
+            request: Fields of a GenerationRequest
+
+        Returns:
+            A snapshot of the created job
+        """
+        endpoint = self._endpoint()
+        job = job_registry.create(
+            JOB_KIND,
+            total=len(STAGES),
+            stage=STAGES[0],
+            project_id=request["project_id"],
+            model_endpoint=endpoint,
+        )
+        task = asyncio.create_task(self._run(job["job_id"], request, endpoint))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Generation job {job['job_id']} accepted")
+        return job
+
+    def watch(self, job_id: str) -> asyncio.Event:
+        """
+        Event set at a job's next change
+
+        Take it before reading the job, so that a change made while the
+        reader is busy with what it read is not missed.
+        """
+        return self._updated.setdefault(job_id, asyncio.Event())
+
+    async def wait_for_update(
+        self, job_id: str, timeout: float, changed: asyncio.Event | None = None
+    ) -> bool:
+        """
+        Wait until a job changes
+
+        Args:
+            job_id: Job to wait for
+            timeout: Seconds to wait at most
+            changed: Event from ``watch``, taken before the job was last read
+
+        Returns:
+            True if it changed, False if the timeout passed first
+        """
+        event = changed or self.watch(job_id)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """Cancel running jobs"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    def _endpoint() -> str:
+        return inference_client.model_endpoint if inference_client.use_local_model else "fallback"
+
+    def _slot(self, endpoint: str) -> asyncio.Semaphore:
+        if endpoint not in self._slots:
+            servers = len(inference_client.pool.endpoints) if endpoint != "fallback" else 1
+            self._slots[endpoint] = asyncio.Semaphore(
+                max(settings.generation_job_concurrency, 1) * servers
+            )
+        return self._slots[endpoint]
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        job_registry.update(job_id, **fields)
+        event = self._updated.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _advance(self, job_id: str, stage: str) -> None:
+        self._update(job_id, status=JOB_RUNNING, stage=stage, processed=STAGES.index(stage))
+
+    async def _run(self, job_id: str, request: dict[str, Any], endpoint: str) -> None:
+        start_time = time.time()
+        try:
+            async with self._slot(endpoint):
+                self._advance(job_id, "building_context")
+                assets_data, related = await asyncio.to_thread(self._load_assets, request)
+                context = context_builder.build_generation_prompt(
+                    user_prompt=request["prompt"],
+                    project_id=request["project_id"],
+                    style=request.get("style"),
+                    assets=assets_data,
+                    constraints=request.get("constraints"),
+                    related_assets=related,
+                )
+
+                self._advance(job_id, "inference")
+                generation_result = await inference_client.generate_scene(
+                    context=context, model_version=request.get("model_version")
+                )
+
+            self._advance(job_id, "postprocessing")
+            enhancements = {"simulate_physics": True} if settings.simulate_physics else None
+            scene, postprocessing = await asyncio.to_thread(
+                postprocessor.run_pipeline,
+                raw_scene=generation_result["scene"],
+                project_id=request["project_id"],
+                assets=assets_data,
+                enhancements=enhancements,
+            )
+            serialized = serialize_scene(scene)
+            metadata = generation_metadata(
+                generation_result, context, postprocessing, scene, serialized.etag
+            )
+            latency_ms = int((time.time() - start_time) * 1000)
+
+            self._advance(job_id, "saving")
+            log = {
+                "user_id": request.get("user_id") or "anonymous",
+                "input_hash": input_hash(
+                    request["prompt"],
+                    request["project_id"],
+                    request.get("style"),
+                    request.get("assets"),
+                ),
+                "prompt_hash": context["prompt_hash"],
+                "model_version": generation_result["metadata"]["model_version"],
+                "status": generation_result["metadata"]["status"],
+                "latency_ms": latency_ms,
+                "request_payload": {**request, "job_id": job_id},
+                "response_payload": scene,
+            }
+            stored_scene_id = await asyncio.to_thread(self._save, request["project_id"], log, scene)
+
+            self._update(
+                job_id,
+                status=JOB_COMPLETED,
+                stage="completed",
+                processed=len(STAGES),
+                result={
+                    "scene_id": scene["id"],
+                    "stored_scene_id": stored_scene_id,
+                    "scene": scene,
+                    "generation_time": latency_ms / 1000.0,
+                    "metadata": metadata,
+                },
+            )
+            logger.info(f"Generation job {job_id} completed in {latency_ms}ms")
+
+        except asyncio.CancelledError:
+            self._update(job_id, status=JOB_FAILED, errors=["Cancelled on shutdown"])
+            raise
+        except Exception as e:
+            logger.error(f"Generation job {job_id} failed: {e}")
+            job_registry.add_error(job_id, str(e))
+            self._update(job_id, status=JOB_FAILED)
+
+    def _load_assets(self, request: dict[str, Any]) -> tuple[list[dict], list[dict]]:
+        """Requested assets and assets related to the prompt"""
+        db = self.session_factory()
+        try:
+            assets = fetch_assets(db, request["project_id"], request.get("assets"))
+            related = find_related_assets(db, request["project_id"], request["prompt"])
+            return assets, related
+        finally:
+            db.close()
+
+    def _save(self, project_id: str, log: dict[str, Any], scene: dict[str, Any]) -> str:
+        """Store the generation log and scene in one transaction"""
+        db = self.session_factory()
+        try:
+            log_entry = GenerationLog(**log)
+            db.add(log_entry)
+            db.flush()
+            stored = scene_service.create_scenes(
+                db, project_id, [scene], generation_log_ids=[log_entry.id]
+            )
+            return str(stored[0].id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Module-level singleton instance
+generation_jobs = GenerationJobRunner()
@@ -0,0 +1,828 @@
+"""
+Godot Exporter Service
+
+Converts scenes into Godot 4 text scenes (.tscn).
+
+Every entity type produced by the generator and found in the golden samples
+is mapped to a Godot node: physics bodies and areas get a CollisionShape2D
+backed by a shared RectangleShape2D sub_resource, sprites reference their
+textures as ext_resources, gradients, particles, lights and UI elements map
+to the matching built-in nodes, and layers and entity groups become Node2D
+containers. Entity IDs and types are kept as node metadata so scenes can be
+read back with ``parse_tscn``.
+
+Output is produced by a two-pass streaming writer: a cheap first pass
+collects resources (needed up front for the header), the second emits node
+blocks in batches, so large scenes never go through repeated string
+concatenation.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import Any
+
+# Entity type -> (Godot node type, group) for physics bodies
+BODY_TYPES = {
+    "player": ("CharacterBody2D", "player"),
+    "player_sprite": ("CharacterBody2D", "player"),
+    "enemy": ("CharacterBody2D", "enemies"),
+    "platform": ("StaticBody2D", "platforms"),
+    "tiled_platform": ("StaticBody2D", "platforms"),
+    "moving_platform": ("AnimatableBody2D", "platforms"),
+    "interactive_mechanism": ("AnimatableBody2D", "mechanisms"),
+    "static_object": ("StaticBody2D", "objects"),
+    "obstacle": ("StaticBody2D", "obstacles"),
+}
+
+# Entity type -> group for trigger areas (Area2D)
+AREA_TYPES = {
+    "collectible": "collectibles",
+    "collectible_sprite": "collectibles",
+    "item": "collectibles",
+    "goal": "goals",
+    "trigger_switch": "triggers",
+}
+
+# Purely visual entity types, drawn as Sprite2D (with a texture) or ColorRect
+VISUAL_TYPES = {"background_image", "foreground_image", "decoration", "background"}
+
+# Node group -> key in the scene's collision_layers bitmask table
+COLLISION_LAYER_GROUPS = {
+    "player": "player",
+    "platforms": "platforms",
+    "obstacles": "platforms",
+    "objects": "platforms",
+    "mechanisms": "platforms",
+    "enemies": "enemies",
+    "collectibles": "collectibles",
+    "goals": "triggers",
+    "triggers": "triggers",
+}
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".ogg"}
+_AUDIO_RESOURCE_TYPES = {
+    ".wav": "AudioStreamWAV",
+    ".mp3": "AudioStreamMP3",
+    ".ogg": "AudioStreamOggVorbis",
+}
+
+# Names of the helper children added under entity nodes
+_HELPER_NODE_NAMES = ("CollisionShape2D", "Sprite2D", "ColorRect", "Camera2D")
+
+_INVALID_NAME_CHARS = re.compile(r'[.:@/"%]')
+
+# Number of entities emitted per yielded chunk
+DEFAULT_BATCH_SIZE = 512
+
+
+_STRING_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_VARIANT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(", ", ": "), default=str)
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+def _float(value: Any) -> float:
+    """Coerce scene data to a float, treating junk as zero"""
+    if type(value) is int or type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _num(value: Any) -> str:
+    """Format a number the way Godot writes it"""
+    if type(value) is int:
+        return str(value)
+    v = _float(value)
+    if v.is_integer():
+        return str(int(v))
+    return repr(v)
+
+
+def _color(value: Any, alpha: float = 1.0) -> str:
+    """Convert #RGB/#RRGGBB/#RRGGBBAA colors to a Godot Color(); anything else is white"""
+    return _hex_color(value if isinstance(value, str) else None, alpha)
+
+
+@lru_cache(maxsize=1024)
+def _hex_color(value: str | None, alpha: float) -> str:
+    hex_value = (value or "").lstrip("#")
+    if len(hex_value) == 3:
+        hex_value = "".join(c * 2 for c in hex_value)
+    try:
+        r, g, b = (int(hex_value[i : i + 2], 16) / 255 for i in (0, 2, 4))
+        if len(hex_value) == 8:
+            alpha *= int(hex_value[6:8], 16) / 255
+    except (ValueError, IndexError):
+        r = g = b = 1.0
+    return f"Color({_num(round(r, 4))}, {_num(round(g, 4))}, {_num(round(b, 4))}, {_num(round(alpha, 4))})"
+
+
+def _string(value: Any) -> str:
+    """Quote a value as a Godot string literal"""
+    text = str(value)
+    if _NEEDS_ESCAPE.search(text) is None:
+        return f'"{text}"'
+    return _STRING_ENCODER.encode(text)
+
+
+def _variant(value: Any) -> str:
+    """Serialize JSON-compatible data as a Godot Variant literal"""
+    return _VARIANT_ENCODER.encode(value)
+
+
+def _node_name(raw: str) -> str:
+    """Make an entity ID usable as a Godot node name"""
+    return _INVALID_NAME_CHARS.sub("_", raw).strip() or "Node"
+
+
+def _xy(data: Any) -> tuple[Any, Any]:
+    if isinstance(data, dict):
+        return data.get("x", 0), data.get("y", 0)
+    return 0, 0
+
+
+def _entity_position(entity: dict[str, Any]) -> tuple[Any, Any]:
+    """Top-left position of an entity relative to its parent"""
+    for key in ("relative_position", "position", "bounds"):
+        if isinstance(entity.get(key), dict):
+            return _xy(entity[key])
+    return 0, 0
+
+
+def _entity_size(entity: dict[str, Any]) -> tuple[Any, Any] | None:
+    """Width and height of an entity, if it has one"""
+    for key in ("size", "bounds"):
+        data = entity.get(key)
+        if isinstance(data, dict) and "width" in data and "height" in data:
+            return data["width"], data["height"]
+    return None
+
+
+def _entity_id(entity: dict[str, Any]) -> str:
+    """ID of an entity, falling back to its type; names its node and resources"""
+    return str(entity.get("id", entity.get("type", "object")))
+
+
+def _properties(entity: dict[str, Any]) -> dict[str, Any]:
+    props = entity.get("properties")
+    return props if isinstance(props, dict) else {}
+
+
+def _has_collision(entity: dict[str, Any]) -> bool:
+    props = _properties(entity)
+    return props.get("collision", True) is not False and props.get("physics_enabled", True)
+
+
+def _children(entity: dict[str, Any]) -> list[dict[str, Any]]:
+    children = entity.get("children")
+    return [c for c in children if isinstance(c, dict)] if isinstance(children, list) else []
+
+
+def _resource_path(path: str) -> str:
+    """Map a scene asset path to its res:// path in an exported project"""
+    relative = str(path).lstrip("/")
+    if not relative.startswith("assets/"):
+        relative = f"assets/{PurePosixPath(relative).name}"
+    return f"res://{relative}"
+
+
+class _Resources:
+    """ext_resource and sub_resource registry built by the first pass"""
+
+    def __init__(self, scene: dict[str, Any]):
+        self.asset_paths: dict[str, str] = {}
+        for asset in scene.get("assets") or []:
+            if isinstance(asset, dict) and asset.get("id") and asset.get("path"):
+                self.asset_paths[str(asset["id"])] = str(asset["path"])
+        self.ext: dict[str, tuple[str, str]] = {}  # res path -> (id, type)
+        self.shapes: dict[tuple[str, str], str] = {}  # (w, h) -> sub_resource id
+        self._shape_ids: dict[tuple[Any, Any], str] = {}  # raw size -> sub_resource id
+        self.gradients: dict[str, tuple[str, str]] = {}  # entity id -> (gradient, texture)
+        self._gradient_data: list[tuple[str, str, dict[str, Any]]] = []
+
+    def asset_ref(self, ref: Any) -> str | None:
+        """Resolve an asset ID or path to a res:// path"""
+        if not ref:
+            return None
+        path = self.asset_paths.get(str(ref), str(ref))
+        if "/" not in path and "." not in path:
+            return None  # Unknown asset ID
+        return _resource_path(path)
+
+    def add_ext(self, res_path: str) -> None:
+        if res_path not in self.ext:
+            suffix = PurePosixPath(res_path).suffix.lower()
+            res_type = _AUDIO_RESOURCE_TYPES.get(suffix, "Texture2D")
+            self.ext[res_path] = (f"{len(self.ext) + 1}_res", res_type)
+
+    def ext_id(self, res_path: str | None) -> str | None:
+        entry = self.ext.get(res_path) if res_path else None
+        return entry[0] if entry else None
+
+    def add_shape(self, size: tuple[Any, Any]) -> None:
+        if size in self._shape_ids:
+            return
+        key = (_num(size[0]), _num(size[1]))
+        if key not in self.shapes:
+            self.shapes[key] = f"RectangleShape2D_{len(self.shapes) + 1}"
+        self._shape_ids[size] = self.shapes[key]
+
+    def shape_id(self, size: tuple[Any, Any]) -> str:
+        return self._shape_ids[size]
+
+    def add_gradient(self, entity_id: str, props: dict[str, Any]) -> None:
+        n = len(self.gradients) + 1
+        ids = (f"Gradient_{n}", f"GradientTexture2D_{n}")
+        self.gradients[entity_id] = ids
+        self._gradient_data.append((ids[0], ids[1], props))
+
+    @property
+    def count(self) -> int:
+        return len(self.ext) + len(self.shapes) + 2 * len(self.gradients)
+
+    def render(self) -> Iterator[str]:
+        for res_path, (res_id, res_type) in self.ext.items():
+            yield f'[ext_resource type="{res_type}" path={_string(res_path)} id="{res_id}"]\n\n'
+        for (width, height), shape_id in self.shapes.items():
+            yield (
+                f'[sub_resource type="RectangleShape2D" id="{shape_id}"]\n'
+                f"size = Vector2({width}, {height})\n\n"
+            )
+        for gradient_id, texture_id, props in self._gradient_data:
+            stops = [s for s in props.get("colors", []) if isinstance(s, dict)]
+            offsets = ", ".join(_num(s.get("position", 0)) for s in stops)
+            colors = ", ".join(
+                ", ".join(
+                    _color(s.get("color")).removeprefix("Color(").removesuffix(")").split(", ")
+                )
+                for s in stops
+            )
+            yield (
+                f'[sub_resource type="Gradient" id="{gradient_id}"]\n'
+                f"offsets = PackedFloat32Array({offsets})\n"
+                f"colors = PackedColorArray({colors})\n\n"
+            )
+            # Godot's linear gradient runs left to right; 90 degrees means top to bottom
+            vertical = int(_float(props.get("angle", 0))) % 180 == 90
+            fill_to = "Vector2(0, 1)" if vertical else "Vector2(1, 0)"
+            yield (
+                f'[sub_resource type="GradientTexture2D" id="{texture_id}"]\n'
+                f'gradient = SubResource("{gradient_id}")\n'
+                f"fill_to = {fill_to}\n\n"
+            )
+
+
+def _collect(entity: dict[str, Any], resources: _Resources) -> None:
+    """First pass: register the resources an entity (and its children) needs"""
+    entity_type = entity.get("type", "")
+    props = _properties(entity)
+    size = _entity_size(entity)
+
+    texture = resources.asset_ref(entity.get("asset_id") or props.get("sprite"))
+    if texture:
+        resources.add_ext(texture)
+
+    if (entity_type in BODY_TYPES and _has_collision(entity)) or entity_type in AREA_TYPES:
+        resources.add_shape(size or (32, 32))
+    elif entity_type == "gradient_fill":
+        resources.add_gradient(_entity_id(entity), props)
+
+    for audio_ref in _audio_refs(props):
+        audio = resources.asset_ref(audio_ref)
+        if audio:
+            resources.add_ext(audio)
+
+    for child in _children(entity):
+        _collect(child, resources)
+
+
+def _audio_refs(props: dict[str, Any]) -> list[Any]:
+    """Asset references for sounds attached to an entity"""
+    refs: list[Any] = []
+    sounds = props.get("sounds")
+    if isinstance(sounds, dict):
+        refs.extend(sounds.values())
+    if props.get("sound_on_collect"):
+        refs.append(props["sound_on_collect"])
+    return refs
+
+
+class _TscnWriter:
+    """Buffered writer emitting node blocks; drained in batches by the caller"""
+
+    def __init__(self, resources: _Resources, collision_layers: dict[str, Any]):
+        self.resources = resources
+        self.collision_layers = collision_layers
+        self.camera: dict[str, Any] | None = None
+        self._parts: list[str] = []
+        self._names: dict[str, set[str]] = {}
+
+    def drain(self) -> str:
+        chunk = "".join(self._parts)
+        self._parts.clear()
+        return chunk
+
+    def _unique_name(self, parent: str, raw: str) -> str:
+        siblings = self._names.get(parent)
+        if siblings is None:
+            # Fixed-name helper children are written without registration
+            siblings = self._names[parent] = set(_HELPER_NODE_NAMES) if parent != "." else set()
+        name = base = _node_name(raw)
+        n = 2
+        while name in siblings:
+            name = f"{base}{n}"
+            n += 1
+        siblings.add(name)
+        return name
+
+    def node(
+        self,
+        name: str,
+        node_type: str,
+        parent: str | None,
+        props: list[str],
+        groups: list[str] | None = None,
+        unique: bool = True,
+    ) -> str:
+        """Write a node block and return its path relative to the root"""
+        write = self._parts.append
+        if parent is None:
+            write(f'[node name="{name}" type="{node_type}"]\n')
+            path = "."
+        else:
+            if unique:
+                name = self._unique_name(parent, name)
+            header = f'[node name="{name}" type="{node_type}" parent="{parent}"'
+            if groups:
+                header += " groups=[" + ", ".join(f'"{g}"' for g in groups) + "]"
+            write(header + "]\n")
+            path = name if parent == "." else f"{parent}/{name}"
+        if props:
+            write("\n".join(props))
+            write("\n")
+        write("\n")
+        return path
+
+    def entity(self, entity: dict[str, Any], parent: str) -> None:
+        """Second pass: emit the nodes for one entity and its children"""
+        entity_type = str(entity.get("type", "object"))
+        entity_id = _entity_id(entity)
+        props = _properties(entity)
+        x, y = _entity_position(entity)
+        size = _entity_size(entity)
+        position = f"position = Vector2({_num(x)}, {_num(y)})"
+        meta = [
+            f"metadata/entity_id = {_string(entity_id)}",
+            f"metadata/entity_type = {_string(entity_type)}",
+        ]
+        if props:
+            meta.append(f"metadata/properties = {_variant(props)}")
+
+        if entity_type in BODY_TYPES and _has_collision(entity):
+            node_type, group = BODY_TYPES[entity_type]
+            path = self.node(
+                entity_id,
+                node_type,
+                parent,
+                [position, *self._collision_props(group), *meta],
+                [group],
+            )
+            self._shape_and_visual(entity, path, size)
+        elif entity_type in AREA_TYPES:
+            group = AREA_TYPES[entity_type]
+            path = self.node(
+                entity_id,
+                "Area2D",
+                parent,
+                [position, *self._collision_props(group), *meta],
+                [group],
+            )
+            self._shape_and_visual(entity, path, size)
+        elif entity_type == "gradient_fill":
+            _, texture_id = self.resources.gradients[entity_id]
+            path = self.node(
+                entity_id,
+                "TextureRect",
+                parent,
+                [
+                    *_offsets(x, y, size),
+                    f'texture = SubResource("{texture_id}")',
+                    "expand_mode = 1",
+                    *meta,
+                ],
+            )
+        elif entity_type == "particle_system":
+            spread_x, spread_y = _xy(props.get("spread"))
+            path = self.node(
+                entity_id,
+                "CPUParticles2D",
+                parent,
+                [
+                    position,
+                    f"amount = {max(1, int(_float(props.get('emission_rate', 8)) * _float(props.get('lifetime', 1))))}",
+                    f"lifetime = {_num(props.get('lifetime', 1))}",
+                    "emission_shape = 3",
+                    f"emission_rect_extents = Vector2({_num(_float(spread_x) / 2)}, {_num(_float(spread_y) / 2)})",
+                    f"color = {_color(props.get('color'))}",
+                    *meta,
+                ],
+            )
+        elif entity_type == "dynamic_light":
+            path = self.node(
+                entity_id,
+                "PointLight2D",
+                parent,
+                [
+                    position,
+                    f"color = {_color(props.get('color'))}",
+                    f"energy = {_num(props.get('intensity', 1))}",
+                    f"texture_scale = {_num(_float(props.get('radius', 64)) / 64)}",
+                    *meta,
+                ],
+            )
+        elif entity_type == "environmental_effect":
+            path = self.node(
+                entity_id,
+                "ColorRect",
+                parent,
+                [
+                    *_offsets(x, y, size),
+                    f"color = {_color(props.get('color'), _float(props.get('density', 0.5)))}",
+                    "mouse_filter = 2",
+                    *meta,
+                ],
+            )
+        elif entity_type == "ui_container":
+            path = self.node(
+                entity_id,
+                "CanvasLayer",
+                parent,
+                [f"offset = Vector2({_num(x)}, {_num(y)})", *meta],
+                ["ui"],
+            )
+        elif entity_type == "ui_element":
+            path = self._ui_element(entity_id, parent, x, y, size, props, meta)
+        elif entity_type in VISUAL_TYPES or (entity_type in BODY_TYPES and size):
+            # Visual-only entities and bodies with collision disabled
+            path = self._visual(entity, entity_id, parent, x, y, size, props, meta)
+        else:
+            # Groups and unknown entity types become plain containers
+            groups = ["entity_groups"] if entity_type == "entity_group" else None
+            path = self.node(entity_id, "Node2D", parent, [position, *meta], groups)
+            if size:
+                self._visual_child(entity, path, size)
+
+        self._audio_children(props, path)
+        if self.camera is not None and self.camera.get("target") == entity_id:
+            self._camera(path)
+
+        for child in _children(entity):
+            self.entity(child, path)
+
+    def _collision_props(self, group: str) -> list[str]:
+        layer_name = COLLISION_LAYER_GROUPS.get(group)
+        bits = self.collision_layers.get(layer_name) if layer_name else None
+        if isinstance(bits, int) and 0 < bits < 1 << 32:
+            return [f"collision_layer = {bits}"]
+        return []
+
+    def _shape_and_visual(
+        self, entity: dict[str, Any], path: str, size: tuple[Any, Any] | None
+    ) -> None:
+        size = size or (32, 32)
+        width, height = _float(size[0]), _float(size[1])
+        self.node(
+            "CollisionShape2D",
+            "CollisionShape2D",
+            path,
+            [
+                f"position = Vector2({_num(width / 2)}, {_num(height / 2)})",
+                f'shape = SubResource("{self.resources.shape_id(size)}")',
+            ],
+            unique=False,
+        )
+        self._visual_child(entity, path, size)
+
+    def _visual_child(self, entity: dict[str, Any], path: str, size: tuple[Any, Any]) -> None:
+        props = _properties(entity)
+        texture = self.resources.ext_id(
+            self.resources.asset_ref(entity.get("asset_id") or props.get("sprite"))
+        )
+        if texture:
+            self.node(
+                "Sprite2D",
+                "Sprite2D",
+                path,
+                [f'texture = ExtResource("{texture}")', "centered = false"],
+                unique=False,
+            )
+        elif props.get("color") or entity.get("color"):
+            self.node(
+                "ColorRect",
+                "ColorRect",
+                path,
+                [
+                    *_offsets(0, 0, size),
+                    f"color = {_color(props.get('color') or entity.get('color'))}",
+                    "mouse_filter = 2",
+                ],
+                unique=False,
+            )
+
+    def _visual(
+        self,
+        entity: dict[str, Any],
+        entity_id: str,
+        parent: str,
+        x: Any,
+        y: Any,
+        size: tuple[Any, Any] | None,
+        props: dict[str, Any],
+        meta: list[str],
+    ) -> str:
+        texture = self.resources.ext_id(
+            self.resources.asset_ref(entity.get("asset_id") or props.get("sprite"))
+        )
+        extra = []
+        if "layer" in props:
+            extra.append(f"z_index = {int(_float(props['layer']))}")
+        opacity = props.get("opacity")
+        if texture:
+            if opacity is not None:
+                extra.append(f"modulate = Color(1, 1, 1, {_num(opacity)})")
+            if props.get("flipped_horizontal"):
+                extra.append("flip_h = true")
+            return self.node(
+                entity_id,
+                "Sprite2D",
+                parent,
+                [
+                    f"position = Vector2({_num(x)}, {_num(y)})",
+                    f'texture = ExtResource("{texture}")',
+                    "centered = false",
+                    *extra,
+                    *meta,
+                ],
+            )
+        alpha = _float(opacity) if opacity is not None else 1.0
+        if "rotation" in props:
+            extra.append(
+                f"rotation = {_num(round(_float(props['rotation']) * 0.017453292519943295, 6))}"
+            )
+        return self.node(
+            entity_id,
+            "ColorRect",
+            parent,
+            [
+                *_offsets(x, y, size),
+                f"color = {_color(props.get('color') or entity.get('color'), alpha)}",
+                "mouse_filter = 2",
+                *extra,
+                *meta,
+            ],
+        )
+
+    def _ui_element(
+        self,
+        entity_id: str,
+        parent: str,
+        x: Any,
+        y: Any,
+        size: tuple[Any, Any] | None,
+        props: dict[str, Any],
+        meta: list[str],
+    ) -> str:
+        element_type = props.get("element_type")
+        offsets = _offsets(x, y, size)
+        if element_type == "progress_bar":
+            max_value = _num(props.get("max_value", 100))
+            return self.node(
+                entity_id,
+                "ProgressBar",
+                parent,
+                [*offsets, f"max_value = {max_value}", f"value = {max_value}", *meta],
+            )
+        if element_type == "text":
+            alignment = {"left": 0, "center": 1, "right": 2}.get(props.get("alignment"), 0)
+            return self.node(
+                entity_id,
+                "Label",
+                parent,
+                [
+                    *offsets,
+                    f"text = {_string(props.get('text', ''))}",
+                    f"horizontal_alignment = {alignment}",
+                    *meta,
+                ],
+            )
+        return self.node(entity_id, "Control", parent, [*offsets, *meta])
+
+    def _audio_children(self, props: dict[str, Any], path: str) -> None:
+        sounds = props.get("sounds") if isinstance(props.get("sounds"), dict) else {}
+        named = list(sounds.items())
+        if props.get("sound_on_collect"):
+            named.append(("collect", props["sound_on_collect"]))
+        for key, ref in named:
+            stream = self.resources.ext_id(self.resources.asset_ref(ref))
+            if stream:
+                self.node(
+                    f"{key}_sound",
+                    "AudioStreamPlayer2D",
+                    path,
+                    [f'stream = ExtResource("{stream}")'],
+                )
+
+    def _camera(self, path: str) -> None:
+        camera = self.camera or {}
+        props = ["enabled = true"]
+        if camera.get("type") == "follow":
+            props.append("position_smoothing_enabled = true")
+            smooth = camera.get("smooth_factor")
+            if smooth:
+                props.append(f"position_smoothing_speed = {_num(_float(smooth) * 50)}")
+        bounds = camera.get("bounds")
+        if isinstance(bounds, dict):
+            for side, key in (
+                ("left", "min_x"),
+                ("right", "max_x"),
+                ("top", "min_y"),
+                ("bottom", "max_y"),
+            ):
+                if key in bounds:
+                    props.append(f"limit_{side} = {int(_float(bounds[key]))}")
+        self.node("Camera2D", "Camera2D", path, props, unique=False)
+
+
+def _offsets(x: Any, y: Any, size: tuple[Any, Any] | None) -> list[str]:
+    """Control offsets for a rectangle at (x, y) with the given size"""
+    left, top = _float(x), _float(y)
+    width, height = (_float(size[0]), _float(size[1])) if size else (0.0, 0.0)
+    return [
+        f"offset_left = {_num(left)}",
+        f"offset_top = {_num(top)}",
+        f"offset_right = {_num(left + width)}",
+        f"offset_bottom = {_num(top + height)}",
+    ]
+
+
+def _scene_containers(scene: dict[str, Any]) -> list[tuple[dict[str, Any] | None, list[Any]]]:
+    """Top-level (layer or None, entities) pairs of a scene"""
+    containers: list[tuple[dict[str, Any] | None, list[Any]]] = []
+    if isinstance(scene.get("entities"), list):
+        containers.append((None, scene["entities"]))
+    for layer in scene.get("layers") or []:
+        if isinstance(layer, dict):
+            containers.append((layer, layer.get("entities") or []))
+    return containers
+
+
+def iter_tscn(scene: dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Stream a scene as a Godot 4 .tscn document
+
+    Args:
+        scene: Scene data (raw, processed or enhanced)
+        batch_size: Number of top-level entities per yielded chunk
+
+    Yields:
+        Chunks of the .tscn text
+    """
+    containers = _scene_containers(scene)
+
+    resources = _Resources(scene)
+    for _, entities in containers:
+        for entity in entities:
+            if isinstance(entity, dict):
+                _collect(entity, resources)
+
+    yield f"[gd_scene load_steps={resources.count + 1} format=3]\n\n"
+    yield from resources.render()
+
+    collision_layers = scene.get("collision_layers")
+    writer = _TscnWriter(resources, collision_layers if isinstance(collision_layers, dict) else {})
+    camera = scene.get("camera")
+    writer.camera = camera if isinstance(camera, dict) else None
+
+    metadata = scene.get("metadata") if isinstance(scene.get("metadata"), dict) else {}
+    root_props = [
+        f"metadata/scene_id = {_string(scene.get('id', ''))}",
+        f"metadata/scene_name = {_string(scene.get('scene_name') or scene.get('name') or '')}",
+        f"metadata/style = {_string(scene.get('style', ''))}",
+    ]
+    if metadata.get("width") and metadata.get("height"):
+        root_props.append(
+            f"metadata/viewport_size = Vector2({_num(metadata['width'])}, {_num(metadata['height'])})"
+        )
+    writer.node(
+        _node_name(str(scene.get("scene_name") or scene.get("name") or "Root")),
+        "Node2D",
+        None,
+        root_props,
+    )
+    if metadata.get("background_color"):
+        writer.node(
+            "Background",
+            "CanvasLayer",
+            ".",
+            ["layer = -100"],
+        )
+        writer.node(
+            "BackgroundColor",
+            "ColorRect",
+            "Background",
+            [
+                *_offsets(0, 0, (metadata.get("width", 1920), metadata.get("height", 1080))),
+                f"color = {_color(metadata['background_color'])}",
+                "mouse_filter = 2",
+            ],
+        )
+
+    pending = 0
+    for layer, entities in containers:
+        parent = "."
+        if layer is not None:
+            layer_props = [
+                f"z_index = {int(_float(layer.get('z_index', 0)))}",
+                f"metadata/layer_id = {_string(layer.get('id', ''))}",
+            ]
+            if layer.get("visible") is False:
+                layer_props.insert(0, "visible = false")
+            if layer.get("opacity") is not None and _float(layer["opacity"]) != 1.0:
+                layer_props.insert(0, f"modulate = Color(1, 1, 1, {_num(layer['opacity'])})")
+            parent = writer.node(
+                _node_name(str(layer.get("id") or layer.get("name") or "Layer")),
+                "Node2D",
+                ".",
+                layer_props,
+                ["layers"],
+            )
+        for entity in entities:
+            if not isinstance(entity, dict):
+                continue
+            writer.entity(entity, parent)
+            pending += 1
+            if pending >= batch_size:
+                yield writer.drain()
+                pending = 0
+
+    tail = writer.drain()
+    if tail:
+        yield tail
+
+
+def render_tscn(scene: dict[str, Any]) -> str:
+    """Render a scene as a complete Godot 4 .tscn document"""
+    return "".join(iter_tscn(scene))
+
+
+_SECTION = re.compile(r"^\[(\w+)(.*)\]$")
+_ATTR = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|\[[^\]]*\]|\S+)')
+
+
+def parse_tscn(text: str) -> dict[str, Any]:
+    """
+    Parse a .tscn document into its header, resources and nodes
+
+    Property values are returned as raw Godot literals. Intended for
+    round-trip checks and inspecting exported scenes.
+
+    Returns:
+        Dict with "header", "ext_resources", "sub_resources" and "nodes"
+    """
+    parsed: dict[str, Any] = {"header": {}, "ext_resources": [], "sub_resources": [], "nodes": []}
+    current: dict[str, Any] | None = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _SECTION.match(line)
+        if match:
+            kind, attrs_text = match.groups()
+            attrs = {k: _parse_attr(v) for k, v in _ATTR.findall(attrs_text)}
+            current = {**attrs, "properties": {}}
+            if kind == "gd_scene":
+                parsed["header"] = current
+            elif kind == "ext_resource":
+                parsed["ext_resources"].append(current)
+            elif kind == "sub_resource":
+                parsed["sub_resources"].append(current)
+            elif kind == "node":
+                parsed["nodes"].append(current)
+            continue
+        if current is not None and " = " in line:
+            key, value = line.split(" = ", 1)
+            current["properties"][key] = value
+    return parsed
+
+
+def _parse_attr(value: str) -> Any:
+    if value.startswith('"'):
+        return json.loads(value)
+    if value.startswith("["):
+        return [json.loads(v) for v in re.findall(r'"(?:[^"\\]|\\.)*"', value)]
+    return value
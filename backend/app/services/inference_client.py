@@ -10,8 +10,17 @@ Key Features:
 - Intelligent sample selection based on prompt keywords
 - Comprehensive error handling and status tracking
 - Performance monitoring with latency tracking
+- Micro-batching of many prompts into few model requests
+- Adaptive cap on calls in flight to the model server, shedding the excess
+  to the fallback instead of queueing it into the timeout
+- Circuit breaker that skips an unreachable model server and serves the
+  fallback at once, until a trial call finds the server back
+- Load balancing over several model servers (MODEL_ENDPOINTS), hedging
+  calls slower than the recent latency percentile onto a second server
+- Background connectivity probes, so status checks answer from memory
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -21,6 +30,12 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ..config import settings
+from ..utils.circuit_breaker import CIRCUIT_CLOSED, CircuitBreaker
+from ..utils.endpoint_pool import Endpoint, EndpointPool
+from ..utils.frozen import freeze
+from ..utils.limiter import AdaptiveLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +47,17 @@ class InferenceClient:
         self.model_endpoint = os.getenv("MODEL_ENDPOINT", "http://localhost:11434")
         self.model_timeout = int(os.getenv("MODEL_TIMEOUT", "45"))
         self.model_name = os.getenv("MODEL_NAME", "gpt-oss-20b")
+        self.micro_batch_size = settings.model_micro_batch_size
+        urls = (settings.model_endpoints or "").split(",")
+        self.pool = EndpointPool(
+            [self._new_endpoint(url.strip()) for url in urls if url.strip()]
+            or [self._new_endpoint(self.model_endpoint)],
+            hedge_percentile=settings.model_hedge_percentile,
+            hedge_budget=settings.model_hedge_budget,
+        )
+        self.model_endpoint = self.pool.endpoints[0].url
+        self.connectivity: dict[str, dict[str, Any]] = {}
+        self._prober: asyncio.Task | None = None
 
         # Fix path for golden samples
         self.golden_samples_path = Path(__file__).parent.parent / "golden_samples"
@@ -44,6 +70,7 @@ class InferenceClient:
             "model_successes": 0,
             "model_failures": 0,
             "fallback_uses": 0,
+            "micro_batches": 0,
             "last_request_time": None,
         }
 
@@ -107,7 +134,8 @@ class InferenceClient:
             for sample_file in self.golden_samples_path.glob("sample_*.json"):
                 try:
                     with open(sample_file) as f:
-                        sample_data = json.load(f)
+                        # Shared by every fallback generation, so frozen against changes
+                        sample_data = freeze(json.load(f))
 
                         # Add metadata for intelligent selection
                         file_name = sample_file.name
@@ -185,25 +213,9 @@ class InferenceClient:
                 self.stats["fallback_uses"] += 1
                 status = "cached_fallback"
 
-            latency_ms = int((time.time() - start_time) * 1000)
-
-            metadata = {
-                "model_version": (
-                    model_version or self.model_name if self.use_local_model else "fallback"
-                ),
-                "latency_ms": latency_ms,
-                "use_local_model": self.use_local_model,
-                "prompt_hash": context.get("prompt_hash"),
-                "status": status,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-
-            if selected_sample:
-                metadata["fallback_sample"] = selected_sample
-
-            if fallback_reason:
-                metadata["fallback_reason"] = fallback_reason
-
+            metadata = self._result_metadata(
+                context, model_version, start_time, status, selected_sample, fallback_reason
+            )
             return {"scene": result, "metadata": metadata}
 
         except Exception as e:
@@ -224,6 +236,100 @@ class InferenceClient:
                 },
             }
 
+    async def generate_scenes(
+        self, contexts: list[dict[str, Any]], model_version: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Generate scenes for several contexts at once
+
+        Contexts are grouped into micro-batches of ``micro_batch_size``, each
+        sent to the model as a single request; the micro-batches run
+        concurrently. A micro-batch the model fails on falls back to golden
+        samples as a whole.
+
+        Args:
+            contexts: Generation contexts from ContextBuilder
+            model_version: Optional specific model version to use
+
+        Returns:
+            One result per context, in order, shaped like ``generate_scene``'s
+        """
+        size = max(self.micro_batch_size, 1)
+        batches = [contexts[i : i + size] for i in range(0, len(contexts), size)]
+        results = await asyncio.gather(
+            *(self._generate_micro_batch(batch, model_version) for batch in batches)
+        )
+        return [result for batch in results for result in batch]
+
+    async def _generate_micro_batch(
+        self, contexts: list[dict[str, Any]], model_version: str | None
+    ) -> list[dict[str, Any]]:
+        start_time = time.time()
+        self.stats["total_requests"] += len(contexts)
+        self.stats["micro_batches"] += 1
+        self.stats["last_request_time"] = datetime.now(timezone.utc).isoformat()
+
+        scenes = None
+        status = "cached_fallback"
+        fallback_reason = None
+        if self.use_local_model:
+            try:
+                if len(contexts) == 1:
+                    scenes = [await self._call_local_model(contexts[0], model_version)]
+                else:
+                    scenes = await self._call_local_model_batch(contexts, model_version)
+                self.stats["model_successes"] += len(contexts)
+                status = "success"
+            except Exception as model_error:
+                logger.warning(f"Local model failed on micro-batch, using fallback: {model_error}")
+                self.stats["model_failures"] += len(contexts)
+                status = "fail_fallback"
+                fallback_reason = str(model_error)
+
+        results = []
+        for i, context in enumerate(contexts):
+            selected_sample = None
+            if scenes is None:
+                scene, selected_sample = self._use_fallback_sample(context)
+                self.stats["fallback_uses"] += 1
+            else:
+                scene = scenes[i]
+            metadata = self._result_metadata(
+                context, model_version, start_time, status, selected_sample, fallback_reason
+            )
+            metadata["batch_size"] = len(contexts)
+            results.append({"scene": scene, "metadata": metadata})
+        return results
+
+    def _result_metadata(
+        self,
+        context: dict[str, Any],
+        model_version: str | None,
+        start_time: float,
+        status: str,
+        selected_sample: str | None,
+        fallback_reason: str | None,
+    ) -> dict[str, Any]:
+        """Metadata describing how a scene was generated"""
+        metadata = {
+            "model_version": (
+                model_version or self.model_name if self.use_local_model else "fallback"
+            ),
+            "latency_ms": int((time.time() - start_time) * 1000),
+            "use_local_model": self.use_local_model,
+            "prompt_hash": context.get("prompt_hash"),
+            "status": status,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if selected_sample:
+            metadata["fallback_sample"] = selected_sample
+
+        if fallback_reason:
+            metadata["fallback_reason"] = fallback_reason
+
+        return metadata
+
     async def _call_local_model(
         self, context: dict[str, Any], model_version: str | None = None
     ) -> dict[str, Any]:
@@ -234,8 +340,6 @@ class InferenceClient:
         In production, this would make an HTTP request to the model server.
         For now, it simulates the connection attempt and falls back gracefully.
         """
-        import httpx
-
         # Prepare the prompt for the model
         prompt = context.get("engineered_prompt", context.get("user_prompt", ""))
 
@@ -250,22 +354,94 @@ Return only valid JSON without any explanation.""",
             "stream": False,
             "options": {"temperature": 0.7, "top_p": 0.9, "max_tokens": 2048},
         }
+        if context.get("prompt_prefix"):
+            # Identical across requests, so the server can reuse its cached prefix
+            payload["system"] = context["prompt_prefix"]
+
+        scene_json = await self._post_generate(payload, empty="{}")
+        logger.info("Successfully generated scene from local model")
+        return scene_json
+
+    async def _call_local_model_batch(
+        self, contexts: list[dict[str, Any]], model_version: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Ask the local model for several scenes in one request
+
+        The prompts are numbered in a single completion request, and the
+        model is asked for a JSON array holding one scene per prompt.
+        """
+        requests = "\n".join(
+            f"{i}. {context.get('engineered_prompt', context.get('user_prompt', ''))}"
+            for i, context in enumerate(contexts, 1)
+        )
+        payload = {
+            "model": model_version or self.model_name,
+            "prompt": f"""Generate {len(contexts)} game scenes as JSON, one for each numbered request:
+{requests}
+
+Each scene should include entities, positions, sizes, and properties.
+Repeated requests should produce distinct variations.
+Return only a JSON array of {len(contexts)} scene objects, in request order, without any explanation.""",
+            "stream": False,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9,
+                "max_tokens": 2048 * len(contexts),
+            },
+        }
+        prefixes = {context.get("prompt_prefix") for context in contexts}
+        if len(prefixes) == 1 and None not in prefixes:
+            payload["system"] = prefixes.pop()
+
+        scenes = await self._post_generate(payload, empty="[]")
+        if not isinstance(scenes, list) or len(scenes) != len(contexts):
+            raise RuntimeError(f"Model did not return {len(contexts)} scenes")
+        logger.info(f"Successfully generated {len(scenes)} scenes from local model")
+        return scenes
+
+    @staticmethod
+    def _new_endpoint(url: str) -> Endpoint:
+        limiter = AdaptiveLimiter(
+            initial=settings.model_concurrency_initial,
+            maximum=settings.model_concurrency_max,
+            max_queue=settings.model_queue_size,
+            queue_timeout=settings.model_queue_timeout,
+            latency_target=settings.model_latency_target,
+        )
+        breaker = CircuitBreaker(
+            failure_threshold=settings.model_breaker_failure_threshold,
+            recovery_timeout=settings.model_breaker_recovery_timeout,
+        )
+        return Endpoint(url, limiter=limiter, breaker=breaker)
+
+    async def _post_generate(self, payload: dict[str, Any], empty: str) -> Any:
+        """
+        Send a completion request to a model server and parse its JSON reply
+
+        Raises CircuitOpenError at once while every server is known to be
+        unreachable, and LimiterRejected when the chosen server already has
+        as many calls in flight, and queued, as it can take.
+        """
+        return await self.pool.call(
+            lambda endpoint: self._request_model(endpoint.url, payload, empty)
+        )
+
+    async def _request_model(self, endpoint: str, payload: dict[str, Any], empty: str) -> Any:
+        import httpx
 
         try:
             # Attempt to call the local model
             async with httpx.AsyncClient(timeout=self.model_timeout) as client:
-                response = await client.post(f"{self.model_endpoint}/api/generate", json=payload)
+                response = await client.post(f"{endpoint}/api/generate", json=payload)
                 response.raise_for_status()
 
                 # Parse the response
                 result = response.json()
-                scene_json = json.loads(result.get("response", "{}"))
-
-                logger.info("Successfully generated scene from local model")
-                return scene_json
+                return json.loads(result.get("response", empty))
 
         except httpx.ConnectError as e:
-            raise ConnectionError(f"Cannot connect to model at {self.model_endpoint}") from e
+            raise ConnectionError(f"Cannot connect to model at {endpoint}") from e
         except httpx.TimeoutException as e:
             raise TimeoutError(f"Model request timed out after {self.model_timeout}s") from e
         except Exception as e:
@@ -275,6 +451,9 @@ Return only valid JSON without any explanation.""",
         """
         Select and return an appropriate golden sample based on context
 
+        The sample is returned frozen and shared, not copied; the
+        postprocessor works on a copy-on-write overlay of it.
+
         Returns:
             Tuple of (scene_data, sample_name)
         """
@@ -372,24 +551,73 @@ Return only valid JSON without any explanation.""",
             ],
             "status": "ready" if self.golden_samples else "degraded",
             "statistics": self.stats,
+            "routing": self.pool.snapshot(),
         }
+        if self.use_local_model and self.pool.state() != CIRCUIT_CLOSED:
+            status["status"] = "degraded"
 
-        # Check model connectivity if local model is enabled
         if self.use_local_model:
+            status.update(self.connectivity_status())
+
+        return status
+
+    def start_prober(self) -> None:
+        """
+        Probe the model servers' connectivity every ``model_probe_interval``
+        seconds in the background
+
+        Must be called from the event loop. Does nothing in fallback mode.
+        """
+        if self.use_local_model and self._prober is None:
+            self._prober = asyncio.create_task(self._probe_forever())
+
+    async def close(self) -> None:
+        """Stop probing"""
+        if self._prober is not None:
+            self._prober.cancel()
+            await asyncio.gather(self._prober, return_exceptions=True)
+            self._prober = None
+
+    async def probe_connectivity(self) -> None:
+        """Check every model server once and cache the results"""
+        import httpx
+
+        async def probe(client: httpx.AsyncClient, url: str) -> str:
             try:
-                import httpx
-
-                # Quick connectivity check (synchronous for status endpoint)
-                with httpx.Client(timeout=2.0) as client:
-                    response = client.get(f"{self.model_endpoint}/api/tags")
-                    if response.status_code == 200:
-                        status["model_connectivity"] = "connected"
-                    else:
-                        status["model_connectivity"] = "unreachable"
+                response = await client.get(f"{url}/api/tags")
+                return "connected" if response.status_code == 200 else "unreachable"
             except Exception:
-                status["model_connectivity"] = "disconnected"
+                return "disconnected"
 
-        return status
+        async with httpx.AsyncClient(timeout=settings.model_probe_timeout) as client:
+            urls = [endpoint.url for endpoint in self.pool.endpoints]
+            results = await asyncio.gather(*(probe(client, url) for url in urls))
+        checked_at = datetime.now(timezone.utc).isoformat()
+        for url, result in zip(urls, results, strict=True):
+            self.connectivity[url] = {"status": result, "checked_at": checked_at}
+
+    async def _probe_forever(self) -> None:
+        while True:
+            try:
+                await self.probe_connectivity()
+            except Exception as e:
+                logger.warning(f"Model connectivity probe failed: {e}")
+            await asyncio.sleep(settings.model_probe_interval)
+
+    def connectivity_status(self) -> dict[str, Any]:
+        """Last probe results; ``unknown`` until the first probe finishes"""
+        probes = [self.connectivity.get(endpoint.url) for endpoint in self.pool.endpoints]
+        if any(probe is None for probe in probes):
+            return {"model_connectivity": "unknown", "connectivity_checked_at": None}
+        results = {probe["status"] for probe in probes}
+        if "connected" in results:
+            connectivity = "connected"
+        else:
+            connectivity = "unreachable" if "unreachable" in results else "disconnected"
+        return {
+            "model_connectivity": connectivity,
+            "connectivity_checked_at": min(probe["checked_at"] for probe in probes),
+        }
 
     def load_golden_sample(self, sample_name: str) -> dict[str, Any] | None:
         """
@@ -399,7 +627,7 @@ Return only valid JSON without any explanation.""",
             sample_name: Name of the sample to load
 
         Returns:
-            The sample data or None if not found
+            The (frozen) sample data or None if not found
         """
         for sample in self.golden_samples:
             if sample["name"] == sample_name:
@@ -0,0 +1,111 @@
+"""
+Job Registry Service
+
+Tracks long-running background jobs (bulk uploads, exports, generations)
+in process memory so clients can poll for progress by job ID.
+
+Jobs are plain dictionaries guarded by a lock; the registry keeps a bounded
+number of entries and evicts the oldest finished jobs first.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+
+# Job lifecycle states
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED)
+
+
+class JobRegistry:
+    """In-memory registry of background jobs and their progress"""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, total: int = 0, **fields: Any) -> dict[str, Any]:
+        """
+        Register a new job
+
+        Args:
+            kind: Job type (e.g. "bulk_upload")
+            total: Number of work items, if known up front
+            **fields: Additional job-specific fields
+
+        Returns:
+            A snapshot of the created job
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": JOB_PENDING,
+            "total": total,
+            "processed": 0,
+            "failed": 0,
+            "errors": [],
+            "result": None,
+            "created_at": now,
+            "updated_at": now,
+            **fields,
+        }
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+            self._evict()
+            return dict(job)
+
+    def update(self, job_id: str, **fields: Any) -> dict[str, Any] | None:
+        """Update fields on a job, returning the new snapshot"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job["updated_at"] = datetime.now(timezone.utc).isoformat()
+            return dict(job)
+
+    def increment(self, job_id: str, field: str = "processed", amount: int = 1) -> None:
+        """Atomically increment a numeric progress counter"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job[field] = job.get(field, 0) + amount
+                job["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    def add_error(self, job_id: str, error: str, max_errors: int = 100) -> None:
+        """Record a per-item error without failing the whole job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and len(job["errors"]) < max_errors:
+                job["errors"].append(error)
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Get a snapshot of a job or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["errors"] = list(job["errors"])
+            return snapshot
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs once the registry is over capacity"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [k for k, v in self._jobs.items() if v["status"] in FINISHED_STATES]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            del self._jobs[job_id]
+
+
+# Module-level singleton instance
+job_registry = JobRegistry()
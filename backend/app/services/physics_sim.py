@@ -0,0 +1,272 @@
+"""
+Physics Simulation Service
+
+Headless, deterministic check of how a scene behaves once physics starts.
+Every entity the postprocessor gave a ``physics`` block with gravity and
+mass is dropped under gravity for ``physics_sim_steps`` fixed timesteps,
+colliding with the static geometry (platforms, obstacles) and bouncing
+according to its restitution.
+
+Entities are then flagged when they:
+
+- spawn inside static geometry (``embedded``)
+- have nothing below them and fall out of the level (``falls_forever``)
+- are still moving when the simulation ends (``unstable``)
+- come to rest far from where they were placed (``displaced``)
+
+Bodies only move vertically, so the broad phase (which dynamic bodies can
+touch which static boxes) is computed once, vectorized over the sorted
+static boxes, and each step only tests those candidate pairs. Dynamic
+bodies do not collide with each other, and entities without collision
+(triggers) or that are purely decorative are not simulated.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from ..config import settings
+
+STATIC_ENTITY_TYPES = frozenset({"platform", "moving_platform", "obstacle"})
+DECORATIVE_ENTITY_TYPES = frozenset({"background"})
+
+# Fastest fall, in pixels per second
+_TERMINAL_VELOCITY = 3000.0
+# Bounces slower than this (pixels per second) come to rest
+_REST_VELOCITY = 30.0
+# Contact tolerance, in pixels
+_EPSILON = 0.5
+# Static boxes wider than this are tested against every body rather than swept
+_WIDE_STATIC = 512.0
+
+
+@dataclass
+class EntityIssue:
+    """A problem found with one entity"""
+
+    id: str
+    type: str
+    issue: str
+    detail: str
+    final_position: dict[str, float] | None = None
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of simulating a scene"""
+
+    stable: bool
+    steps: int
+    timestep: float
+    bodies: int  # Simulated (dynamic) entities
+    colliders: int  # Static entities they collide with
+    issues: list[EntityIssue] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class PhysicsSimulator:
+    """Service for sanity-checking scene physics by simulating it"""
+
+    def simulate(
+        self,
+        scene: dict[str, Any],
+        steps: int | None = None,
+        timestep: float | None = None,
+    ) -> SimulationReport:
+        """
+        Drop a scene's dynamic entities under gravity and report problems
+
+        Args:
+            scene: Enhanced scene (entities carrying ``properties.physics``)
+            steps: Frames to simulate (default ``physics_sim_steps``)
+            timestep: Seconds per frame (default ``physics_sim_timestep``)
+
+        Returns:
+            The simulation report
+        """
+        start = time.perf_counter()
+        steps = settings.physics_sim_steps if steps is None else steps
+        dt = settings.physics_sim_timestep if timestep is None else timestep
+
+        bodies, colliders = self._split_entities(scene.get("entities", []))
+        report = SimulationReport(
+            stable=True, steps=steps, timestep=dt, bodies=len(bodies), colliders=len(colliders)
+        )
+        if bodies:
+            report.issues = self._run(bodies, colliders, steps, dt)
+        report.stable = not report.issues
+        report.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        return report
+
+    @staticmethod
+    def _split_entities(
+        entities: list[dict[str, Any]],
+    ) -> tuple[list[tuple[dict[str, Any], tuple]], list[tuple]]:
+        """Dynamic bodies with their (x, y, w, h, restitution), and static boxes"""
+        bodies, colliders = [], []
+        for entity in entities:
+            if not isinstance(entity, dict) or entity.get("type") in DECORATIVE_ENTITY_TYPES:
+                continue
+            try:
+                position, size = entity["position"], entity["size"]
+                box = (
+                    float(position["x"]),
+                    float(position["y"]),
+                    float(size["width"]),
+                    float(size["height"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not np.isfinite(box).all() or box[2] <= 0 or box[3] <= 0:
+                continue
+
+            properties = entity.get("properties") or {}
+            physics = properties.get("physics") or {}
+            if physics.get("collision", properties.get("collision", True)) is False:
+                continue  # Triggers pass through everything
+
+            static = (
+                entity.get("type") in STATIC_ENTITY_TYPES
+                or properties.get("static") is True
+                or not physics.get("gravity", True)
+                or _float(physics.get("mass"), 1.0) <= 0
+            )
+            if static:
+                colliders.append(box)
+            else:
+                restitution = min(max(_float(physics.get("restitution"), 0.0), 0.0), 1.0)
+                bodies.append((entity, (*box, restitution)))
+        return bodies, colliders
+
+    def _run(
+        self,
+        bodies: list[tuple[dict[str, Any], tuple]],
+        colliders: list[tuple],
+        steps: int,
+        dt: float,
+    ) -> list[EntityIssue]:
+        state = np.array([values for _, values in bodies], dtype=np.float64)
+        x, y, width, height, restitution = state.T
+        static = np.array(colliders, dtype=np.float64).reshape(-1, 4)
+        top, bottom = static[:, 1], static[:, 1] + static[:, 3]
+
+        body, other = self._broad_phase(x, width, static)
+        embedded = np.zeros(len(bodies), dtype=bool)
+        overlapping = (y[body] < bottom[other]) & (y[body] + height[body] > top[other])
+        embedded[body[overlapping]] = True
+
+        # Bodies only fall or bounce, so one with nothing below it never lands
+        has_floor = np.zeros(len(bodies), dtype=bool)
+        has_floor[body[top[other] >= y[body] + height[body] - _EPSILON]] = True
+
+        spawn_y = y
+        velocity = np.zeros(len(bodies))
+        gravity = settings.physics_sim_gravity
+        for _ in range(steps):
+            resting = ~has_floor | ((velocity == 0) & self._supported(y + height, body, other, top))
+            if resting.all():
+                break
+            velocity = np.where(resting, 0.0, velocity + gravity * dt)
+            velocity = np.clip(velocity, -_TERMINAL_VELOCITY, _TERMINAL_VELOCITY)
+            new_y = y + velocity * dt
+
+            # Swept test: falling bodies land on the highest top their bottom crossed
+            old_foot, new_foot = y[body] + height[body], new_y[body] + height[body]
+            lands = (top[other] >= old_foot - _EPSILON) & (top[other] <= new_foot)
+            floor = np.full(len(bodies), np.inf)
+            np.minimum.at(floor, body[lands], top[other][lands])
+            # ... and rising (bouncing) bodies stop at the lowest bottom their top crossed
+            bumps = (bottom[other] <= y[body] + _EPSILON) & (bottom[other] >= new_y[body])
+            ceiling = np.full(len(bodies), -np.inf)
+            np.maximum.at(ceiling, body[bumps], bottom[other][bumps])
+
+            landed = (velocity > 0) & np.isfinite(floor)
+            bumped = (velocity < 0) & np.isfinite(ceiling)
+            y = np.where(landed, floor - height, np.where(bumped, ceiling, new_y))
+            velocity = np.where(landed, -velocity * restitution, velocity)
+            velocity[bumped | (landed & (-velocity < _REST_VELOCITY))] = 0.0
+
+        settled = (velocity == 0) & self._supported(y + height, body, other, top)
+        drift = y - spawn_y
+
+        issues = []
+        for i, (entity, _) in enumerate(bodies):
+            final = {"x": round(float(x[i]), 2), "y": round(float(y[i]), 2)}
+            found = []
+            if embedded[i]:
+                found.append(("embedded", "Spawns inside static geometry"))
+            if not has_floor[i]:
+                found.append(("falls_forever", "Nothing below it to land on"))
+            elif not settled[i]:
+                found.append(("unstable", f"Still moving after {steps} steps"))
+            elif abs(drift[i]) > settings.physics_sim_max_drift:
+                found.append(("displaced", f"Comes to rest {drift[i]:.0f}px below its spawn"))
+            for issue, detail in found:
+                issues.append(
+                    EntityIssue(
+                        id=str(entity.get("id")),
+                        type=str(entity.get("type")),
+                        issue=issue,
+                        detail=detail,
+                        final_position=final if has_floor[i] else None,
+                    )
+                )
+        return issues
+
+    @staticmethod
+    def _broad_phase(
+        x: np.ndarray, width: np.ndarray, static: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs of (body, static box) overlapping horizontally
+
+        Bodies only move vertically, so these are all the pairs that can ever
+        collide. Narrow static boxes are found through their sorted left
+        edges; the few wide ones (floors) are paired with every body.
+        """
+        count = len(x)
+        static_width = static[:, 2]
+        wide = np.flatnonzero(static_width > _WIDE_STATIC)
+        narrow = np.flatnonzero(static_width <= _WIDE_STATIC)
+        narrow = narrow[np.argsort(static[narrow, 0], kind="stable")]
+
+        lefts = static[narrow, 0]
+        widest = static_width[narrow].max() if len(narrow) else 0.0
+        lo = np.searchsorted(lefts, x - widest, side="left")
+        hi = np.searchsorted(lefts, x + width, side="left")
+        counts = hi - lo
+        body = np.repeat(np.arange(count), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        other = narrow[np.repeat(lo, counts) + offsets]
+
+        body = np.concatenate([body, np.repeat(np.arange(count), len(wide))])
+        other = np.concatenate([other, np.tile(wide, count)])
+        overlaps = (static[other, 0] < x[body] + width[body]) & (
+            static[other, 0] + static_width[other] > x[body]
+        )
+        return body[overlaps], other[overlaps]
+
+    @staticmethod
+    def _supported(
+        foot: np.ndarray, body: np.ndarray, other: np.ndarray, top: np.ndarray
+    ) -> np.ndarray:
+        """Bodies whose bottom rests on top of a static box"""
+        supported = np.zeros(len(foot), dtype=bool)
+        supported[body[np.abs(top[other] - foot[body]) <= _EPSILON]] = True
+        return supported
+
+
+# Module-level singleton instance
+physics_simulator = PhysicsSimulator()
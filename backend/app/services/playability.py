@@ -0,0 +1,481 @@
+"""
+Playability Validator Service
+
+Checks that a processed scene can actually be played: that the player can
+get from its spawn to every goal by walking, jumping and falling.
+
+Solid entities (platforms, obstacles) are rasterized with NumPy into an
+occupancy grid of ``playability_cell_size`` pixels. Every run of cells the
+player can stand on becomes a surface, and surfaces are linked when one can
+be reached from another with a jump of at most ``playability_jump_height``
+up and ``playability_jump_distance`` across (falls may be of any height).
+A* then searches this graph from the player's spawn surface to the
+surfaces from which each goal can be touched.
+
+The grid and graph are cached per scene version, so re-validating a scene
+only reruns the (cheap) searches. The model is deliberately optimistic: it
+ignores ceilings in the way of jumps, enemies and moving platforms' motion.
+"""
+
+import heapq
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from ..config import settings
+
+# Entity types the player cannot pass through
+SOLID_ENTITY_TYPES = frozenset({"platform", "moving_platform", "obstacle"})
+
+# Surfaces longer than this many cells are linked by brute force rather than a sweep
+_LONG_SURFACE = 64
+
+
+@dataclass
+class GoalResult:
+    """Outcome of the search for one goal"""
+
+    id: str
+    reachable: bool
+    cost: float | None = None  # Length of the path in pixels
+    path: list[dict[str, float]] = field(default_factory=list)  # Surfaces crossed
+
+
+@dataclass
+class PlayabilityReport:
+    """Outcome of validating a scene"""
+
+    playable: bool
+    reason: str | None = None
+    spawn: str | None = None
+    goals: list[GoalResult] = field(default_factory=list)
+    surfaces: int = 0
+    links: int = 0
+    cell_size: float = 0.0
+    cached: bool = False
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class NavigationGraph:
+    """Walkable surfaces of a scene and the jumps and falls linking them"""
+
+    origin: tuple[float, float]
+    cell_size: float
+    # Surfaces: grid row the player stands in and [x0, x1) column span
+    rows: np.ndarray
+    x0: np.ndarray
+    x1: np.ndarray
+    # Links in compressed sparse row form, as lists for fast A* expansion
+    indptr: list[int]
+    indices: list[int]
+    weights: list[float]
+    spawn_id: str | None = None
+    spawn: int | None = None  # Surface the player starts on
+    goal_surfaces: dict[str, list[int]] = field(default_factory=dict)
+
+    @property
+    def surface_count(self) -> int:
+        return len(self.rows)
+
+    def center(self, surface: int) -> tuple[float, float]:
+        """Middle of a surface in grid cells"""
+        return (self.x0[surface] + self.x1[surface]) / 2.0, float(self.rows[surface])
+
+    def waypoint(self, surface: int) -> dict[str, float]:
+        """Middle of a surface in scene coordinates, at floor level"""
+        x, row = self.center(surface)
+        return {
+            "x": round(self.origin[0] + x * self.cell_size, 2),
+            "y": round(self.origin[1] + (row + 1) * self.cell_size, 2),
+        }
+
+
+def _entity_rect(entity: dict[str, Any]) -> tuple[float, float, float, float] | None:
+    """An entity's (x, y, width, height), or None if it has no usable geometry"""
+    try:
+        position, size = entity["position"], entity["size"]
+        return (
+            float(position["x"]),
+            float(position["y"]),
+            float(size["width"]),
+            float(size["height"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _finite_rect(entity: dict[str, Any]) -> tuple[float, float, float, float] | None:
+    rect = _entity_rect(entity)
+    return rect if rect is not None and all(map(math.isfinite, rect)) else None
+
+
+def _is_solid(entity: dict[str, Any]) -> bool:
+    properties = entity.get("properties")
+    if properties:
+        if properties.get("collision") is False:
+            return False
+        if properties.get("solid") is True:
+            return True
+    return entity.get("type") in SOLID_ENTITY_TYPES
+
+
+class PlayabilityValidator:
+    """Service for checking that goals are reachable from the player spawn"""
+
+    def __init__(self, cache_size: int):
+        self.cache_size = cache_size
+        self._graphs: OrderedDict[Hashable, NavigationGraph] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validate(
+        self, scene: dict[str, Any], cache_key: Hashable | None = None
+    ) -> PlayabilityReport:
+        """
+        Check that every goal of a scene is reachable from the player spawn
+
+        Args:
+            scene: Processed scene data
+            cache_key: Identifies this version of the scene (e.g. the stored
+                scene ID and version number); the navigation graph is cached
+                under it. Without a key the graph is always rebuilt.
+
+        Returns:
+            The playability report
+        """
+        start = time.perf_counter()
+        graph = self._cached_graph(cache_key)
+        cached = graph is not None
+        if graph is None:
+            graph = self.build_graph(scene)
+            self._store_graph(cache_key, graph)
+
+        report = self._search(graph)
+        report.cached = cached
+        report.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        return report
+
+    def build_graph(self, scene: dict[str, Any]) -> NavigationGraph:
+        """Rasterize a scene and link its walkable surfaces"""
+        entities = [entity for entity in scene.get("entities", []) if isinstance(entity, dict)]
+        player = next((entity for entity in entities if entity.get("type") == "player"), None)
+        player_rect = _finite_rect(player) if player else None
+        goals = [
+            (str(entity.get("id")), rect)
+            for entity in entities
+            if entity.get("type") == "goal" and (rect := _finite_rect(entity)) is not None
+        ]
+        solids = np.array(
+            [rect for entity in entities if _is_solid(entity) and (rect := _entity_rect(entity))],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        solids = solids[np.isfinite(solids).all(axis=1) & (solids[:, 2] > 0) & (solids[:, 3] > 0)]
+
+        player_height = player_rect[3] if player_rect and player_rect[3] > 0 else 48.0
+        rects = [solids] + [np.array([rect]) for _, rect in goals]
+        if player_rect:
+            rects.append(np.array([player_rect]))
+        bounds = np.concatenate(rects)
+        if not len(bounds):
+            return self._empty_graph(player, goals)
+
+        # Leave room above the level for the player's body and jumps
+        margin = player_height + settings.playability_jump_height
+        left, top = bounds[:, 0].min(), bounds[:, 1].min() - margin
+        right = (bounds[:, 0] + np.maximum(bounds[:, 2], 0)).max()
+        bottom = (bounds[:, 1] + np.maximum(bounds[:, 3], 0)).max()
+
+        cell = float(settings.playability_cell_size)
+        cells = (math.ceil((right - left) / cell) + 1) * (math.ceil((bottom - top) / cell) + 1)
+        if cells > settings.playability_max_cells:
+            cell *= math.sqrt(cells / settings.playability_max_cells)
+        # Align the grid to the cell size, so floors on cell boundaries stay exact
+        left, top = math.floor(left / cell) * cell, math.floor(top / cell) * cell
+        width = math.ceil((right - left) / cell) + 1
+        height = math.ceil((bottom - top) / cell) + 1
+
+        solid = self._rasterize(solids, (left, top), cell, (height, width))
+        body = max(1, math.ceil(player_height / cell))
+        standable = self._standable(solid, body)
+        rows, x0, x1 = self._surfaces(standable)
+        indptr, indices, weights = self._link_surfaces(
+            rows,
+            x0,
+            x1,
+            max_rise=int(settings.playability_jump_height // cell),
+            max_gap=int(settings.playability_jump_distance // cell),
+        )
+
+        graph = NavigationGraph(
+            origin=(float(left), float(top)),
+            cell_size=cell,
+            rows=rows,
+            x0=x0,
+            x1=x1,
+            indptr=indptr,
+            indices=indices,
+            weights=weights,
+            spawn_id=str(player.get("id")) if player else None,
+        )
+        locate = _SurfaceLocator(graph, standable, body)
+        if player_rect:
+            landing = locate.below(player_rect)
+            graph.spawn = min(landing, key=lambda s: graph.rows[s]) if landing else None
+        reach = int(settings.playability_jump_height // cell) + body - 1
+        for goal_id, rect in goals:
+            graph.goal_surfaces[goal_id] = locate.below(rect, max_drop=reach)
+        return graph
+
+    def _empty_graph(
+        self, player: dict[str, Any] | None, goals: list[tuple[str, tuple]]
+    ) -> NavigationGraph:
+        empty = np.zeros(0, dtype=np.int64)
+        return NavigationGraph(
+            origin=(0.0, 0.0),
+            cell_size=float(settings.playability_cell_size),
+            rows=empty,
+            x0=empty,
+            x1=empty,
+            indptr=[0],
+            indices=[],
+            weights=[],
+            spawn_id=str(player.get("id")) if player else None,
+            goal_surfaces={goal_id: [] for goal_id, _ in goals},
+        )
+
+    @staticmethod
+    def _rasterize(
+        rects: np.ndarray, origin: tuple[float, float], cell: float, shape: tuple[int, int]
+    ) -> np.ndarray:
+        """Occupancy grid of rectangles, filled through a 2D difference array"""
+        height, width = shape
+        c0 = np.clip(np.floor((rects[:, 0] - origin[0]) / cell), 0, width).astype(np.int64)
+        c1 = np.clip(np.ceil((rects[:, 0] + rects[:, 2] - origin[0]) / cell), 0, width)
+        r0 = np.clip(np.floor((rects[:, 1] - origin[1]) / cell), 0, height).astype(np.int64)
+        r1 = np.clip(np.ceil((rects[:, 1] + rects[:, 3] - origin[1]) / cell), 0, height)
+        c1 = np.maximum(c1.astype(np.int64), c0 + 1)
+        r1 = np.maximum(r1.astype(np.int64), r0 + 1)
+
+        diff = np.zeros((height + 2, width + 2), dtype=np.int32)
+        np.add.at(diff, (r0, c0), 1)
+        np.add.at(diff, (r0, c1), -1)
+        np.add.at(diff, (r1, c0), -1)
+        np.add.at(diff, (r1, c1), 1)
+        return diff.cumsum(axis=0).cumsum(axis=1)[:height, :width] > 0
+
+    @staticmethod
+    def _standable(solid: np.ndarray, body: int) -> np.ndarray:
+        """Cells the player's feet can rest in: free for its height, solid below"""
+        height, width = solid.shape
+        counts = np.zeros((height + 1, width), dtype=np.int32)
+        np.cumsum(solid, axis=0, out=counts[1:])
+        ends = np.arange(1, height + 1)
+        solid_in_body = counts[ends] - counts[np.maximum(ends - body, 0)]
+
+        standable = np.zeros_like(solid)
+        standable[:-1] = solid[1:] & (solid_in_body[:-1] == 0)
+        return standable
+
+    @staticmethod
+    def _surfaces(standable: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Horizontal runs of standable cells, ordered by row then column"""
+        edges = np.diff(np.pad(standable, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        starts = np.argwhere(edges == 1)
+        ends = np.argwhere(edges == -1)
+        return starts[:, 0], starts[:, 1], ends[:, 1]
+
+    @staticmethod
+    def _link_surfaces(
+        rows: np.ndarray, x0: np.ndarray, x1: np.ndarray, max_rise: int, max_gap: int
+    ) -> tuple[list[int], list[int], list[float]]:
+        """
+        Link surfaces reachable by a jump or a fall, weighted by distance
+
+        Short surfaces are found through a sweep over their sorted starts, so
+        only surfaces within jumping distance are compared; the few long ones
+        (floors) are compared against every surface.
+        """
+        count = len(rows)
+        long = np.flatnonzero(x1 - x0 > _LONG_SURFACE)
+        short = np.flatnonzero(x1 - x0 <= _LONG_SURFACE)
+        short = short[np.argsort(x0[short], kind="stable")]
+
+        # Short targets starting in [x0 - max_gap - longest short surface, x1 + max_gap]
+        starts = x0[short]
+        reach = max_gap + (int((x1 - x0)[short].max()) if len(short) else 0)
+        lo = np.searchsorted(starts, x0 - reach, side="left")
+        hi = np.searchsorted(starts, x1 + max_gap, side="right")
+        counts = hi - lo
+        source = np.repeat(np.arange(count), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        target = short[np.repeat(lo, counts) + offsets]
+
+        source = np.concatenate([source, np.repeat(np.arange(count), len(long))])
+        target = np.concatenate([target, np.tile(long, count)])
+
+        gap = np.maximum(x0[target] - x1[source], x0[source] - x1[target])
+        rise = rows[source] - rows[target]
+        linked = (gap <= max_gap) & (rise <= max_rise) & (source != target)
+        source, target = source[linked], target[linked]
+        if len(long):
+            order = np.argsort(source, kind="stable")
+            source, target = source[order], target[order]
+
+        centers = (x0 + x1) / 2.0
+        weights = np.hypot(centers[target] - centers[source], rows[target] - rows[source])
+        indptr = np.searchsorted(source, np.arange(count + 1))
+        return indptr.tolist(), target.tolist(), weights.tolist()
+
+    def _search(self, graph: NavigationGraph) -> PlayabilityReport:
+        report = PlayabilityReport(
+            playable=False,
+            spawn=graph.spawn_id,
+            surfaces=graph.surface_count,
+            links=len(graph.indices),
+            cell_size=graph.cell_size,
+        )
+        if graph.spawn_id is None:
+            report.reason = "Scene has no player"
+            return report
+        if graph.spawn is None:
+            report.reason = "Player has no ground to stand on"
+            report.goals = [
+                GoalResult(id=goal_id, reachable=False) for goal_id in graph.goal_surfaces
+            ]
+            return report
+        if not graph.goal_surfaces:
+            report.playable = True
+            report.reason = "Scene has no goals"
+            return report
+
+        for goal_id, surfaces in graph.goal_surfaces.items():
+            found = self._astar(graph, graph.spawn, surfaces) if surfaces else None
+            if found is None:
+                report.goals.append(GoalResult(id=goal_id, reachable=False))
+                continue
+            path, cost = found
+            report.goals.append(
+                GoalResult(
+                    id=goal_id,
+                    reachable=True,
+                    cost=round(cost * graph.cell_size, 2),
+                    path=[graph.waypoint(surface) for surface in path],
+                )
+            )
+
+        unreachable = [goal.id for goal in report.goals if not goal.reachable]
+        report.playable = not unreachable
+        if unreachable:
+            report.reason = f"Unreachable goals: {', '.join(unreachable)}"
+        return report
+
+    @staticmethod
+    def _astar(
+        graph: NavigationGraph, start: int, targets: list[int]
+    ) -> tuple[list[int], float] | None:
+        """Shortest path between surfaces; straight-line distance is the heuristic"""
+        goal_set = set(targets)
+        goal_centers = [graph.center(target) for target in targets]
+
+        def heuristic(surface: int) -> float:
+            x, y = graph.center(surface)
+            return min(math.hypot(x - gx, y - gy) for gx, gy in goal_centers)
+
+        indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+        best = {start: 0.0}
+        came_from: dict[int, int] = {}
+        frontier = [(heuristic(start), 0.0, start)]
+        while frontier:
+            _, cost, surface = heapq.heappop(frontier)
+            if surface in goal_set:
+                path = [surface]
+                while path[-1] != start:
+                    path.append(came_from[path[-1]])
+                return path[::-1], cost
+            if cost > best[surface]:
+                continue
+            for i in range(indptr[surface], indptr[surface + 1]):
+                neighbour = indices[i]
+                new_cost = cost + weights[i]
+                if new_cost < best.get(neighbour, math.inf):
+                    best[neighbour] = new_cost
+                    came_from[neighbour] = surface
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbour), new_cost, neighbour))
+        return None
+
+    def _cached_graph(self, cache_key: Hashable | None) -> NavigationGraph | None:
+        if cache_key is None:
+            return None
+        with self._lock:
+            graph = self._graphs.get(cache_key)
+            if graph is not None:
+                self._graphs.move_to_end(cache_key)
+            return graph
+
+    def _store_graph(self, cache_key: Hashable | None, graph: NavigationGraph) -> None:
+        if cache_key is None or self.cache_size <= 0:
+            return
+        with self._lock:
+            self._graphs[cache_key] = graph
+            self._graphs.move_to_end(cache_key)
+            while len(self._graphs) > self.cache_size:
+                self._graphs.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached navigation graphs"""
+        with self._lock:
+            self._graphs.clear()
+
+
+class _SurfaceLocator:
+    """Finds the surfaces below an entity in a navigation graph"""
+
+    def __init__(self, graph: NavigationGraph, standable: np.ndarray, body: int):
+        self.graph = graph
+        self.standable = standable
+        self.body = body
+        self.width = standable.shape[1]
+        self.keys = graph.rows * self.width + graph.x0
+
+    def below(
+        self, rect: tuple[float, float, float, float], max_drop: int | None = None
+    ) -> list[int]:
+        """
+        Surfaces first met falling straight down from a rectangle
+
+        Args:
+            rect: Entity rectangle in scene coordinates
+            max_drop: Furthest (in cells) a surface may lie below the
+                rectangle's bottom; None for any depth
+        """
+        graph, cell = self.graph, self.graph.cell_size
+        height = self.standable.shape[0]
+        c0 = max(int((rect[0] - graph.origin[0]) // cell), 0)
+        c1 = min(max(math.ceil((rect[0] + rect[2] - graph.origin[0]) / cell), c0 + 1), self.width)
+        top = min(max(int((rect[1] - graph.origin[1]) // cell), 0), height)
+        bottom = max(math.ceil((rect[1] + rect[3] - graph.origin[1]) / cell) - 1, top)
+
+        column_hits = self.standable[top:, c0:c1]
+        hit = column_hits.any(axis=0)
+        if not hit.any():
+            return []
+        rows = column_hits.argmax(axis=0)[hit] + top
+        columns = np.arange(c0, c1)[hit]
+        if max_drop is not None:
+            keep = rows - bottom <= max_drop
+            rows, columns = rows[keep], columns[keep]
+        surfaces = np.searchsorted(self.keys, rows * self.width + columns, side="right") - 1
+        return sorted(set(surfaces.tolist()))
+
+
+# Module-level singleton instance
+playability_validator = PlayabilityValidator(cache_size=settings.playability_cache_size)
@@ -3,11 +3,79 @@ Postprocessor Service
 
 This service processes AI output into valid scene JSON.
 It handles validation, normalization, and enhancement of generated scenes.
+
+The work is split into registered stages. Stages that only need one entity
+at a time are fused into a single pass over the scene, and the time spent
+in each stage is recorded per run and in aggregate.
+
+Stages work copy-on-write: the scene and its entities are overlays of the
+input (which may be a frozen, shared golden sample), and nested values such
+as positions and properties are replaced rather than modified in place.
 """
 
+import copy
+import threading
+import time
 import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Literal
+
+from ..utils.frozen import overlay
+from .physics_sim import physics_simulator
+
+# Times an edited entity is pushed past an overlapping neighbour before giving up
+_MAX_PLACEMENT_ATTEMPTS = 16
+
+
+class SceneEditError(ValueError):
+    """Raised when entity edits cannot be applied to a scene"""
+
+
+class _InvalidScene(Exception):
+    """Raised by validation stages to replace the scene with a minimal one"""
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """
+    A postprocessing step
+
+    Entity stages are called as ``func(entity)`` and may only read and
+    modify that entity; consecutive ones are fused into a single pass over
+    the scene. Scene stages are called as ``func(scene, context)`` and
+    return the scene.
+
+    ``requires`` and ``provides`` name the data a stage reads and writes
+    (e.g. ``"entity.position"``). They decide where an entity stage can be
+    fused, and every requirement must be provided by an earlier stage.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    scope: Literal["entity", "scene"]
+    phase: Literal["process", "enhance"]
+    requires: frozenset[str] = frozenset()
+    provides: frozenset[str] = frozenset()
+    option: str | None = None  # Only run when this enhancement is requested
+
+    def conflicts_with(self, other: "PipelineStage") -> bool:
+        """Whether this stage must stay after ``other``"""
+        return bool(
+            self.requires & other.provides or self.provides & (other.requires | other.provides)
+        )
+
+
+@dataclass
+class PipelineContext:
+    """State shared by the stages of one pipeline run"""
+
+    project_id: str
+    assets: list[dict[str, Any]] | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)  # Seconds per stage
+    entity_passes: int = 0
 
 
 class Postprocessor:
@@ -16,6 +84,252 @@ class Postprocessor:
     def __init__(self):
         self.validation_rules = self._initialize_validation_rules()
         self.default_properties = self._initialize_default_properties()
+        self.stages: list[PipelineStage] = []
+        self.stage_stats: dict[str, dict[str, float]] = {}
+        # Pipelines of a batch run in parallel threads
+        self._stats_lock = threading.Lock()
+        self._register_default_stages()
+
+    def register_stage(self, stage: PipelineStage, before: str | None = None) -> None:
+        """
+        Add a stage to the pipeline
+
+        Args:
+            stage: The stage to add
+            before: Name of the stage to insert it before (default: append)
+
+        Raises:
+            ValueError: If the name is taken, ``before`` is unknown or a
+                requirement is not provided by an earlier stage
+        """
+        names = [existing.name for existing in self.stages]
+        if stage.name in names:
+            raise ValueError(f"Stage {stage.name!r} is already registered")
+        if before is not None and before not in names:
+            raise ValueError(f"Unknown stage {before!r}")
+        position = names.index(before) if before is not None else len(self.stages)
+
+        provided = set().union(*(earlier.provides for earlier in self.stages[:position]))
+        missing = stage.requires - provided
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} requires {', '.join(sorted(missing))}")
+        self.stages.insert(position, stage)
+
+    def plan(
+        self,
+        phases: tuple[str, ...] = ("process", "enhance"),
+        options: dict[str, Any] | None = None,
+    ) -> list[list[PipelineStage]]:
+        """
+        Group the enabled stages into passes
+
+        Each pass is a single scene stage or a list of entity stages run
+        together in one walk over the entities. An entity stage joins the
+        latest entity pass it can move back to without crossing a stage it
+        conflicts with.
+        """
+        options = options or {}
+        passes: list[list[PipelineStage]] = []
+        for stage in self.stages:
+            if stage.phase not in phases or (stage.option and not options.get(stage.option)):
+                continue
+            target = None
+            if stage.scope == "entity":
+                for i in range(len(passes) - 1, -1, -1):
+                    if passes[i][0].scope == "entity":
+                        target = i
+                    if any(stage.conflicts_with(other) for other in passes[i]):
+                        break
+            if target is None:
+                passes.append([stage])
+            else:
+                passes[target].append(stage)
+        return passes
+
+    def run_pipeline(
+        self,
+        raw_scene: dict[str, Any],
+        project_id: str,
+        assets: list[dict[str, Any]] | None = None,
+        enhancements: dict[str, Any] | None = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Process and enhance raw AI output in one run of the stage pipeline
+
+        Args:
+            raw_scene: The raw scene data from AI (may be frozen)
+            project_id: The project identifier
+            assets: Available assets to incorporate
+            enhancements: Optional enhancement parameters
+
+        Returns:
+            The enhanced scene and a report of the time spent per stage
+        """
+        context = PipelineContext(project_id=project_id, assets=assets, options=enhancements or {})
+        start = time.perf_counter()
+        scene = self._run_phases(raw_scene, ("process", "enhance"), context)
+        total = time.perf_counter() - start
+        return scene, {
+            "stages": {name: round(seconds * 1000, 3) for name, seconds in context.timings.items()},
+            "entity_passes": context.entity_passes,
+            "total_ms": round(total * 1000, 3),
+        }
+
+    def get_stage_stats(self) -> dict[str, dict[str, float]]:
+        """Latency statistics of each stage over all pipeline runs"""
+        with self._stats_lock:
+            stage_stats = {name: dict(stats) for name, stats in self.stage_stats.items()}
+        return {
+            name: {
+                "calls": stats["calls"],
+                "avg_ms": round(stats["total_ms"] / stats["calls"], 3),
+                "max_ms": round(stats["max_ms"], 3),
+            }
+            for name, stats in stage_stats.items()
+        }
+
+    def _run_phases(
+        self, scene: dict[str, Any], phases: tuple[str, ...], context: PipelineContext
+    ) -> dict[str, Any]:
+        try:
+            scene = self._run_passes(scene, self.plan(phases, context.options), context)
+        except _InvalidScene:
+            if "process" not in phases:
+                raise
+            # Replace an invalid scene with a minimal valid one, then enhance that
+            scene = self._create_minimal_scene(context.project_id)
+            if "enhance" in phases:
+                scene = self._run_passes(scene, self.plan(("enhance",), context.options), context)
+        finally:
+            self._record_timings(context.timings)
+        return scene
+
+    def _run_passes(
+        self, scene: dict[str, Any], passes: list[list[PipelineStage]], context: PipelineContext
+    ) -> dict[str, Any]:
+        timings = context.timings
+        for stages in passes:
+            if stages[0].scope == "scene":
+                stage = stages[0]
+                start = time.perf_counter()
+                scene = stage.func(scene, context)
+                timings[stage.name] = timings.get(stage.name, 0.0) + time.perf_counter() - start
+                continue
+
+            context.entity_passes += 1
+            elapsed = [0.0] * len(stages)
+            funcs = [stage.func for stage in stages]
+            clock = time.perf_counter
+            try:
+                for entity in scene.get("entities", []):
+                    for i, func in enumerate(funcs):
+                        start = clock()
+                        func(entity)
+                        elapsed[i] += clock() - start
+            finally:
+                for stage, seconds in zip(stages, elapsed, strict=True):
+                    timings[stage.name] = timings.get(stage.name, 0.0) + seconds
+        return scene
+
+    def _record_timings(self, timings: dict[str, float]) -> None:
+        with self._stats_lock:
+            for name, seconds in timings.items():
+                stats = self.stage_stats.setdefault(
+                    name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+                )
+                stats["calls"] += 1
+                stats["total_ms"] += seconds * 1000
+                stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+
+    def _register_default_stages(self) -> None:
+        def scene_stage(name, func, phase, requires=(), provides=(), option=None):
+            self.register_stage(
+                PipelineStage(
+                    name, func, "scene", phase, frozenset(requires), frozenset(provides), option
+                )
+            )
+
+        def entity_stage(name, func, phase, requires=(), provides=()):
+            self.register_stage(
+                PipelineStage(name, func, "entity", phase, frozenset(requires), frozenset(provides))
+            )
+
+        scene_stage(
+            "ensure_fields",
+            self._ensure_fields_stage,
+            "process",
+            provides={"scene.fields", "scene.entities"},
+        )
+        entity_stage(
+            "normalize_entity",
+            self._normalize_entity,
+            "process",
+            requires={"scene.entities"},
+            provides={"entity.fields"},
+        )
+        entity_stage(
+            "validate_entity",
+            self._check_entity,
+            "process",
+            requires={"entity.fields"},
+        )
+        scene_stage(
+            "incorporate_assets",
+            self._assets_stage,
+            "process",
+            requires={"entity.fields"},
+            provides={"scene.assets", "entity.sprite"},
+        )
+        scene_stage(
+            "metadata",
+            lambda scene, _: self._metadata_stage(scene),
+            "process",
+            requires={"scene.fields", "scene.assets"},
+            provides={"scene.metadata"},
+        )
+        entity_stage(
+            "add_physics",
+            self._add_entity_physics,
+            "enhance",
+            requires={"entity.fields"},
+            provides={"entity.physics"},
+        )
+        entity_stage(
+            "add_collision_box",
+            self._add_entity_collision_box,
+            "enhance",
+            requires={"entity.fields"},
+            provides={"entity.collision_box"},
+        )
+        scene_stage(
+            "optimize_placement",
+            lambda scene, _: self._optimize_entity_placement(scene),
+            "enhance",
+            requires={"entity.fields"},
+            provides={"entity.position"},
+        )
+        scene_stage(
+            "add_lighting",
+            lambda scene, _: self._add_lighting_system(scene),
+            "enhance",
+            provides={"scene.lighting"},
+            option="add_lighting",
+        )
+        scene_stage(
+            "add_audio",
+            lambda scene, _: self._add_audio_cues(scene),
+            "enhance",
+            provides={"scene.audio"},
+            option="add_audio",
+        )
+        scene_stage(
+            "simulate_physics",
+            lambda scene, _: self._simulate_physics(scene),
+            "enhance",
+            requires={"entity.physics", "entity.position", "scene.metadata"},
+            provides={"scene.metadata"},
+            option="simulate_physics",
+        )
 
     def process_scene(
         self, raw_scene: dict[str, Any], project_id: str, assets: list[dict[str, Any]] | None = None
@@ -31,25 +345,8 @@ class Postprocessor:
         Returns:
             A processed and validated scene
         """
-        # Ensure scene has required fields
-        processed_scene = self._ensure_required_fields(raw_scene, project_id)
-
-        # Validate and normalize entities
-        processed_scene["entities"] = self._process_entities(processed_scene.get("entities", []))
-
-        # Incorporate assets if provided
-        if assets:
-            processed_scene = self._incorporate_assets(processed_scene, assets)
-
-        # Add metadata
-        processed_scene["metadata"] = self._generate_metadata(processed_scene)
-
-        # Validate final scene
-        if not self.validate_scene(processed_scene):
-            # If validation fails, return a minimal valid scene
-            return self._create_minimal_scene(project_id)
-
-        return processed_scene
+        context = PipelineContext(project_id=project_id, assets=assets)
+        return self._run_phases(raw_scene, ("process",), context)
 
     def validate_scene(self, scene: dict[str, Any]) -> bool:
         """
@@ -85,21 +382,158 @@ class Postprocessor:
         Returns:
             Enhanced scene
         """
-        enhanced = scene.copy()
+        context = PipelineContext(
+            project_id=scene.get("project_id", ""), options=enhancements or {}
+        )
+        return self._run_phases(overlay(scene), ("enhance",), context)
+
+    def apply_entity_edits(
+        self, scene: dict[str, Any], operations: list[dict[str, Any]]
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Apply entity-level edits to a processed scene
+
+        Only the touched entities are normalized, enhanced and validated, and
+        overlaps are resolved only between them and their spatial neighbours.
+        Untouched entities are neither copied nor re-processed, so an edit
+        costs a single cheap pass over the scene instead of rerunning
+        ``process_scene`` and the pairwise overlap checks of ``enhance_scene``.
+
+        Operations are ``{"op": "add", "entity": {...}}``,
+        ``{"op": "update", "id": ..., "changes": {...}}`` (nested
+        ``position``, ``size`` and ``properties`` are merged) and
+        ``{"op": "remove", "id": ...}``.
+
+        Args:
+            scene: The current scene (not modified)
+            operations: Edits to apply, in order
 
-        # Apply default enhancements
-        enhanced = self._add_physics_properties(enhanced)
-        enhanced = self._add_collision_boundaries(enhanced)
-        enhanced = self._optimize_entity_placement(enhanced)
+        Returns:
+            The edited scene (sharing untouched entities with ``scene``) and
+            the IDs of the touched entities
 
-        # Apply custom enhancements if provided
-        if enhancements:
-            if enhancements.get("add_lighting"):
-                enhanced = self._add_lighting_system(enhanced)
-            if enhancements.get("add_audio"):
-                enhanced = self._add_audio_cues(enhanced)
+        Raises:
+            SceneEditError: If an operation is malformed, refers to an
+                unknown entity or leaves an entity invalid
+        """
+        entities = list(scene.get("entities") or [])
+        index = {entity.get("id"): i for i, entity in enumerate(entities)}
+        touched: dict[str, dict[str, Any]] = {}
+        removed = False
+
+        for operation in operations:
+            kind = operation.get("op")
+            if kind == "add":
+                entity = copy.deepcopy(operation.get("entity") or {})
+                entity = self._process_entities([entity])[0]
+                if entity["id"] in index:
+                    raise SceneEditError(f"Entity {entity['id']!r} already exists")
+                index[entity["id"]] = len(entities)
+                entities.append(entity)
+            elif kind in ("update", "remove"):
+                entity_id = operation.get("id")
+                if entity_id not in index:
+                    raise SceneEditError(f"Entity {entity_id!r} not found")
+                if kind == "remove":
+                    entities[index.pop(entity_id)] = None
+                    touched.pop(entity_id, None)
+                    removed = True
+                    continue
+                entity = self._updated_entity(
+                    entities[index[entity_id]], operation.get("changes") or {}
+                )
+                entities[index[entity_id]] = entity
+            else:
+                raise SceneEditError(f"Unknown edit operation: {kind!r}")
+            touched[entity["id"]] = entity
+
+        for entity in touched.values():
+            if not self._validate_entity(entity):
+                raise SceneEditError(f"Entity {entity['id']!r} is invalid")
+            self._add_entity_physics(entity)
+            self._add_entity_collision_box(entity)
+
+        if removed:
+            entities = [entity for entity in entities if entity is not None]
+        self._resolve_local_overlaps(entities, list(touched.values()))
+
+        edited = {**scene, "entities": entities}
+        if isinstance(scene.get("metadata"), dict) and "entity_count" in scene["metadata"]:
+            edited["metadata"] = {**scene["metadata"], "entity_count": len(entities)}
+        return edited, list(touched)
+
+    def _updated_entity(self, entity: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+        """Copy of an entity with changes merged in and re-normalized"""
+        if "id" in changes and changes["id"] != entity.get("id"):
+            raise SceneEditError("Entity IDs cannot be changed")
+        updated = copy.deepcopy(entity)
+        for key, value in changes.items():
+            if key in ("position", "size", "properties") and isinstance(value, dict):
+                updated[key] = {**(updated.get(key) or {}), **copy.deepcopy(value)}
+            else:
+                updated[key] = copy.deepcopy(value)
+
+        updated["position"] = self._normalize_position(updated.get("position"))
+        updated["size"] = self._normalize_size(updated.get("size"))
+        if "type" in changes:
+            updated["properties"] = self._apply_default_properties(
+                updated["type"], updated.get("properties") or {}
+            )
+        # Keep a derived collision box in step with the size it was derived from
+        box = updated.get("collision_box")
+        if isinstance(box, dict) and box.get("size") == entity.get("size"):
+            updated["collision_box"] = {**box, "size": updated["size"].copy()}
+        return updated
+
+    def _resolve_local_overlaps(
+        self, entities: list[dict[str, Any]], touched: list[dict[str, Any]]
+    ) -> None:
+        """
+        Push touched entities clear of the entities they overlap
 
-        return enhanced
+        Mirrors ``_optimize_entity_placement``, except that only touched
+        entities move. Entities are only ever pushed right, so a single pass
+        over the scene collects the neighbours in their path, and placements
+        are then checked against those neighbours alone.
+        """
+        if not touched:
+            return
+        touched_ids = {id(entity) for entity in touched}
+        # Everything a touched entity can hit lies right of the leftmost one,
+        # within the vertical band they span
+        left = min(entity["position"]["x"] for entity in touched)
+        top = min(entity["position"]["y"] for entity in touched)
+        bottom = max(entity["position"]["y"] + entity["size"]["height"] for entity in touched)
+        neighbours = []
+        for other in entities:
+            position, size = other.get("position"), other.get("size")
+            if not isinstance(position, dict) or not isinstance(size, dict):
+                continue
+            try:
+                if (
+                    position["x"] + size["width"] > left
+                    and position["y"] < bottom
+                    and position["y"] + size["height"] > top
+                    and id(other) not in touched_ids
+                ):
+                    neighbours.append(other)
+            except (KeyError, TypeError):
+                continue
+        placed: list[dict[str, Any]] = []
+        for entity in touched:
+            for _ in range(_MAX_PLACEMENT_ATTEMPTS):
+                blocker = next(
+                    (
+                        other
+                        for other in (*neighbours, *placed)
+                        if self._entities_overlap(entity, other)
+                    ),
+                    None,
+                )
+                if blocker is None:
+                    break
+                entity["position"]["x"] = blocker["position"]["x"] + blocker["size"]["width"] + 10
+            placed.append(entity)
 
     def _ensure_required_fields(self, scene: dict[str, Any], project_id: str) -> dict[str, Any]:
         """Ensure scene has all required fields"""
@@ -122,38 +556,57 @@ class Postprocessor:
 
     def _process_entities(self, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Process and validate entities"""
-        processed = []
-
         for entity in entities:
-            # Ensure entity has required fields
-            if "id" not in entity:
-                entity["id"] = f"entity_{uuid.uuid4().hex[:8]}"
-
-            if "type" not in entity:
-                entity["type"] = "object"
-
-            # Ensure position
-            if "position" not in entity:
-                entity["position"] = {"x": 0, "y": 0}
-            else:
-                entity["position"] = self._normalize_position(entity["position"])
-
-            # Ensure size
-            if "size" not in entity:
-                entity["size"] = self._get_default_size(entity["type"])
-            else:
-                entity["size"] = self._normalize_size(entity["size"])
-
-            # Apply default properties based on type
-            if "properties" not in entity:
-                entity["properties"] = {}
-            entity["properties"] = self._apply_default_properties(
-                entity["type"], entity["properties"]
-            )
+            self._normalize_entity(entity)
+        return list(entities)
+
+    def _normalize_entity(self, entity: dict[str, Any]) -> None:
+        """Fill in and normalize a single entity's fields"""
+        # Ensure entity has required fields
+        if "id" not in entity:
+            entity["id"] = f"entity_{uuid.uuid4().hex[:8]}"
+
+        if "type" not in entity:
+            entity["type"] = "object"
+
+        # Ensure position
+        if "position" not in entity:
+            entity["position"] = {"x": 0, "y": 0}
+        else:
+            entity["position"] = self._normalize_position(entity["position"])
+
+        # Ensure size
+        if "size" not in entity:
+            entity["size"] = self._get_default_size(entity["type"])
+        else:
+            entity["size"] = self._normalize_size(entity["size"])
+
+        # Apply default properties based on type
+        if "properties" not in entity:
+            entity["properties"] = {}
+        entity["properties"] = self._apply_default_properties(entity["type"], entity["properties"])
+
+    def _check_entity(self, entity: dict[str, Any]) -> None:
+        if not self._validate_entity(entity):
+            raise _InvalidScene(f"Entity {entity.get('id')!r} is invalid")
+
+    def _ensure_fields_stage(
+        self, scene: dict[str, Any], context: PipelineContext
+    ) -> dict[str, Any]:
+        scene = self._ensure_required_fields(overlay(scene), context.project_id)
+        if not isinstance(scene["entities"], list):
+            raise _InvalidScene("Scene entities must be a list")
+        return scene
 
-            processed.append(entity)
+    def _assets_stage(self, scene: dict[str, Any], context: PipelineContext) -> dict[str, Any]:
+        # Incorporate assets if provided
+        if context.assets:
+            scene = self._incorporate_assets(scene, context.assets)
+        return scene
 
-        return processed
+    def _metadata_stage(self, scene: dict[str, Any]) -> dict[str, Any]:
+        scene["metadata"] = self._generate_metadata(scene)
+        return scene
 
     def _validate_entity(self, entity: dict[str, Any]) -> bool:
         """Validate a single entity"""
@@ -206,12 +659,8 @@ class Postprocessor:
         self, entity_type: str, properties: dict[str, Any]
     ) -> dict[str, Any]:
         """Apply default properties based on entity type"""
-        if entity_type not in self.default_properties:
-            return properties
-
-        defaults = self.default_properties[entity_type].copy()
-        defaults.update(properties)
-        return defaults
+        # Always a new dict, which later stages may modify
+        return {**self.default_properties.get(entity_type, {}), **properties}
 
     def _incorporate_assets(
         self, scene: dict[str, Any], assets: list[dict[str, Any]]
@@ -231,7 +680,7 @@ class Postprocessor:
             # Try to assign assets to entities
             for entity in scene["entities"]:
                 if entity["type"] == "player" and asset.get("type") == "image":
-                    entity["properties"]["sprite"] = asset.get("path")
+                    entity["properties"] = {**entity["properties"], "sprite": asset.get("path")}
                     break
 
         return scene
@@ -270,37 +719,31 @@ class Postprocessor:
             },
         }
 
-    def _add_physics_properties(self, scene: dict[str, Any]) -> dict[str, Any]:
-        """Add physics properties to entities"""
-        for entity in scene.get("entities", []):
-            # Ensure properties field exists
-            if "properties" not in entity:
-                entity["properties"] = {}
-
-            if "physics" not in entity["properties"]:
-                # Add comprehensive physics properties
-                entity["properties"]["physics"] = {
-                    "gravity": entity["type"] != "platform",
-                    "collision": True,
-                    "mass": (
-                        1.0
-                        if entity["type"] == "player"
-                        else 0.0 if entity["type"] == "platform" else 0.5
-                    ),
-                    "friction": 0.8,
-                    "restitution": 0.2,
-                }
-        return scene
-
-    def _add_collision_boundaries(self, scene: dict[str, Any]) -> dict[str, Any]:
-        """Add collision boundaries to entities"""
-        for entity in scene.get("entities", []):
-            if "collision_box" not in entity:
-                entity["collision_box"] = {
-                    "offset": {"x": 0, "y": 0},
-                    "size": entity["size"].copy(),
-                }
-        return scene
+    def _add_entity_physics(self, entity: dict[str, Any]) -> None:
+        """Add physics properties to a single entity"""
+        properties = entity.get("properties", {})
+        if "physics" not in properties:
+            # Add comprehensive physics properties
+            physics = {
+                "gravity": entity["type"] != "platform",
+                "collision": True,
+                "mass": (
+                    1.0
+                    if entity["type"] == "player"
+                    else 0.0 if entity["type"] == "platform" else 0.5
+                ),
+                "friction": 0.8,
+                "restitution": 0.2,
+            }
+            entity["properties"] = {**properties, "physics": physics}
+
+    def _add_entity_collision_box(self, entity: dict[str, Any]) -> None:
+        """Add a collision boundary matching its size to a single entity"""
+        if "collision_box" not in entity:
+            entity["collision_box"] = {
+                "offset": {"x": 0, "y": 0},
+                "size": entity["size"].copy(),
+            }
 
     def _optimize_entity_placement(self, scene: dict[str, Any]) -> dict[str, Any]:
         """Optimize entity placement to prevent overlaps"""
@@ -310,7 +753,8 @@ class Postprocessor:
             for _j, other in enumerate(entities[i + 1 :], i + 1):
                 if self._entities_overlap(entity, other):
                     # Move the second entity
-                    other["position"]["x"] += entity["size"]["width"] + 10
+                    x = other["position"]["x"] + entity["size"]["width"] + 10
+                    other["position"] = {**other["position"], "x": x}
         return scene
 
     def _entities_overlap(self, e1: dict[str, Any], e2: dict[str, Any]) -> bool:
@@ -339,6 +783,12 @@ class Postprocessor:
         }
         return scene
 
+    def _simulate_physics(self, scene: dict[str, Any]) -> dict[str, Any]:
+        """Record how the scene's entities behave under simulated physics"""
+        report = physics_simulator.simulate(scene)
+        scene["metadata"] = {**scene.get("metadata", {}), "simulation": report.to_dict()}
+        return scene
+
     def _initialize_validation_rules(self) -> dict[str, Any]:
         """Initialize validation rules"""
         return {
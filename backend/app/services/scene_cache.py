@@ -0,0 +1,153 @@
+"""
+Scene Cache Service
+
+Keeps serialized forms of recently used scenes in process memory, so a hot
+scene is encoded once rather than on every response or export. Saved scenes
+are also precompressed (gzip, brotli, zstd) once, on their first read, and
+served with the matching Content-Encoding instead of being compressed per
+request.
+
+Entries are keyed by scene ID and tagged with a version (for stored
+scenes, their ``updated_at``), so edits never serve stale bytes. The cache
+is bounded by total size and evicts the least recently used entries first.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..config import settings
+from ..utils.compression import compress_all, negotiate_encoding
+from ..utils.serialization import dumps
+
+
+@dataclass(frozen=True)
+class SerializedScene:
+    """Pre-serialized (and optionally precompressed) representations of a scene"""
+
+    json: bytes
+    etag: str
+    encodings: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.json) + sum(len(data) for data in self.encodings.values())
+
+    def body_for(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """
+        Pick the best precompressed body for an Accept-Encoding header
+
+        Returns:
+            The body and its content coding (None for uncompressed JSON)
+        """
+        encoding = negotiate_encoding(accept_encoding, available=self.encodings)
+        if encoding is None:
+            return self.json, None
+        return self.encodings[encoding], encoding
+
+
+def serialize_scene(scene_data: dict[str, Any], precompress: bool = False) -> SerializedScene:
+    """
+    Serialize a scene without caching it
+
+    For scenes with no stable identity, such as fresh generations: golden
+    samples and model output reuse scene IDs across requests, so caching
+    them by ID would serve one request's scene to another.
+    """
+    return _entry(dumps(scene_data), precompress)
+
+
+def _entry(data: bytes, precompress: bool) -> SerializedScene:
+    return SerializedScene(
+        json=data,
+        etag=hashlib.sha256(data).hexdigest()[:32],
+        encodings=compress_all(data) if precompress else {},
+    )
+
+
+class SceneCache:
+    """Bounded LRU cache of serialized scenes, one version per scene"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, SerializedScene]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(version: Any) -> str:
+        return "" if version is None else str(version)
+
+    def get(self, scene_id: Any, version: Any = None) -> SerializedScene | None:
+        """Get a cached scene or None if missing or cached at another version"""
+        key = str(scene_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != self._version(version):
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def serialize(
+        self,
+        scene_id: Any,
+        scene_data: dict[str, Any],
+        version: Any = None,
+        precompress: bool = False,
+    ) -> SerializedScene:
+        """
+        Get the serialized scene, encoding and caching it on a miss
+
+        Args:
+            scene_id: Scene identifier
+            scene_data: Scene data to serialize on a miss
+            version: Revision of the scene (e.g. its updated_at)
+            precompress: Also compress the JSON with every supported content
+                coding, so responses can be served without compressing per request
+
+        Returns:
+            The serialized scene
+        """
+        cached = self.get(scene_id, version)
+        if cached is not None and (cached.encodings or not precompress):
+            return cached
+
+        data = cached.json if cached is not None else dumps(scene_data)
+        entry = _entry(data, precompress)
+        self.put(scene_id, entry, version)
+        return entry
+
+    def put(self, scene_id: Any, entry: SerializedScene, version: Any = None) -> None:
+        """Store a serialized scene, replacing any other version of it"""
+        key = str(scene_id)
+        with self._lock:
+            self._pop(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = (self._version(version), entry)
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def invalidate(self, scene_id: Any) -> None:
+        """Drop the cached scene"""
+        with self._lock:
+            self._pop(str(scene_id))
+
+    def clear(self) -> None:
+        """Drop all cached scenes"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._size -= cached[1].size
+
+
+# Module-level singleton instance
+scene_cache = SceneCache(max_bytes=settings.scene_cache_max_bytes)
@@ -0,0 +1,397 @@
+"""
+Scene Service for OSSGameForge
+
+Stores scenes and their version history. The ``scenes`` row always holds
+the latest scene data; every change is recorded in ``scene_versions`` as a
+JSON Patch against the previous version, with a full snapshot every
+``settings.scene_snapshot_interval`` versions. Storage therefore grows with
+the size of the edits, and any version is rebuilt from its nearest snapshot
+plus at most ``interval - 1`` patches.
+
+Rebuilt versions are immutable and are kept in the scene cache, serialized
+(and precompressed) like the latest version.
+"""
+
+import logging
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
+
+from ..config import settings
+from ..models.core_models import Scene
+from ..models.scene_version import SceneVersion
+from ..utils.json_patch import apply_patch, make_patch
+from ..utils.serialization import dumps, loads
+from .postprocessor import postprocessor
+from .scene_cache import SerializedScene, scene_cache
+
+logger = logging.getLogger(__name__)
+
+
+def get_scene(db: Session, scene_id: str) -> Scene | None:
+    """
+    Retrieve a stored scene by ID
+
+    Args:
+        db: Database session
+        scene_id: Scene UUID
+
+    Returns:
+        Scene instance or None
+    """
+    return db.query(Scene).filter(Scene.id == scene_id).first()
+
+
+def list_scenes(
+    db: Session, project_id: str | None = None, limit: int = 50, offset: int = 0
+) -> list[Scene]:
+    """List stored scenes, most recently updated first"""
+    query = db.query(Scene)
+    if project_id:
+        query = query.filter(Scene.project_id == project_id)
+    return query.order_by(Scene.updated_at.desc()).offset(offset).limit(limit).all()
+
+
+def head_versions(db: Session, scene_ids: list[Any]) -> dict[str, int]:
+    """
+    Get the latest version number of several scenes in one query
+
+    Scenes stored before version history existed have no version rows and
+    are reported as version 1.
+    """
+    if not scene_ids:
+        return {}
+    rows = (
+        db.query(SceneVersion.scene_id, func.max(SceneVersion.version))
+        .filter(SceneVersion.scene_id.in_(scene_ids))
+        .group_by(SceneVersion.scene_id)
+        .all()
+    )
+    versions = {str(scene_id): version for scene_id, version in rows}
+    return {str(scene_id): versions.get(str(scene_id), 1) for scene_id in scene_ids}
+
+
+def head_version(db: Session, scene_id: Any) -> int:
+    """Get the latest version number of a scene"""
+    return head_versions(db, [scene_id])[str(scene_id)]
+
+
+def _is_snapshot_version(version: int) -> bool:
+    return (version - 1) % max(settings.scene_snapshot_interval, 1) == 0
+
+
+def _version_row(scene_id: Any, version: int, previous: Any, scene_data: Any) -> SceneVersion:
+    """Build the history row recording a scene's data at a version"""
+    patch = None if previous is None else make_patch(previous, scene_data)
+    snapshot = scene_data if patch is None or _is_snapshot_version(version) else None
+    return SceneVersion(
+        scene_id=scene_id,
+        version=version,
+        snapshot=snapshot,
+        patch=patch,
+        patch_size=len(dumps(patch)) if patch is not None else 0,
+    )
+
+
+def _cache_latest(scene: Scene, version: int, precompress: bool = False) -> SerializedScene:
+    """
+    Serialize the latest version of a saved scene
+
+    Saves only serialize, which is cheap; compressing is left to the first
+    read, off the event loop, so edits stay fast.
+    """
+    return scene_cache.serialize(
+        scene.id, scene.scene_data, version=version, precompress=precompress
+    )
+
+
+def _new_scene(
+    project_id: str,
+    scene_data: dict[str, Any],
+    name: str | None = None,
+    style: str | None = None,
+    generation_log_id: str | None = None,
+) -> Scene:
+    return Scene(
+        project_id=project_id,
+        name=name or scene_data.get("scene_name") or scene_data.get("name") or "Untitled Scene",
+        style=style or scene_data.get("style", "platformer"),
+        scene_data=scene_data,
+        generation_log_id=generation_log_id,
+    )
+
+
+def create_scene(
+    db: Session,
+    project_id: str,
+    scene_data: dict[str, Any],
+    name: str | None = None,
+    style: str | None = None,
+    generation_log_id: str | None = None,
+) -> Scene:
+    """
+    Store a new scene as version 1
+
+    Args:
+        db: Database session
+        project_id: Project identifier
+        scene_data: Complete scene data
+        name: Scene name (defaults to the scene's ``scene_name``)
+        style: Game style (defaults to the scene's ``style``)
+        generation_log_id: Associated generation log ID
+
+    Returns:
+        The stored scene
+    """
+    scene = _new_scene(project_id, scene_data, name, style, generation_log_id)
+    db.add(scene)
+    db.flush()
+    db.add(_version_row(scene.id, 1, None, scene_data))
+    db.commit()
+    logger.info(f"Scene saved: {scene.id}")
+
+    _cache_latest(scene, 1)
+    return scene
+
+
+def create_scenes(
+    db: Session,
+    project_id: str,
+    scenes_data: list[dict[str, Any]],
+    generation_log_ids: list[str | None] | None = None,
+) -> list[Scene]:
+    """
+    Store several new scenes as version 1, in one transaction
+
+    Anything else already added to the session (such as the scenes'
+    generation logs) is committed with them.
+
+    Args:
+        db: Database session
+        project_id: Project identifier
+        scenes_data: Complete data of each scene
+        generation_log_ids: Associated generation log ID of each scene
+
+    Returns:
+        The stored scenes, in order
+    """
+    log_ids = generation_log_ids or [None] * len(scenes_data)
+    scenes = [
+        _new_scene(project_id, scene_data, generation_log_id=log_id)
+        for scene_data, log_id in zip(scenes_data, log_ids, strict=True)
+    ]
+    db.add_all(scenes)
+    db.flush()
+    db.add_all(_version_row(scene.id, 1, None, scene.scene_data) for scene in scenes)
+    db.commit()
+    logger.info(f"Saved {len(scenes)} scenes")
+
+    for scene in scenes:
+        _cache_latest(scene, 1)
+    return scenes
+
+
+def update_scene(
+    db: Session, scene: Scene, scene_data: dict[str, Any], name: str | None = None
+) -> int:
+    """
+    Replace a scene's data, recording the change as a new version
+
+    Only the JSON Patch from the current data is stored (plus a snapshot on
+    every ``scene_snapshot_interval``-th version). Unchanged data does not
+    create a version. ``scene_data`` must be a new object, not the scene's
+    current data modified in place.
+
+    Args:
+        db: Database session
+        scene: Stored scene
+        scene_data: New scene data
+        name: Optional new name
+
+    Returns:
+        The scene's latest version number
+    """
+    current = (
+        db.query(func.max(SceneVersion.version)).filter(SceneVersion.scene_id == scene.id).scalar()
+    )
+    if name:
+        scene.name = name
+
+    previous = scene.scene_data
+    if previous == scene_data:
+        db.commit()
+        return current or 1
+
+    if current is None:
+        # Scene predates version history: record its current data as version 1
+        db.add(_version_row(scene.id, 1, None, previous))
+        current = 1
+
+    version = current + 1
+    db.add(_version_row(scene.id, version, previous, scene_data))
+    scene.scene_data = scene_data
+    db.commit()
+    scene_cache.invalidate(scene.id)
+    _cache_latest(scene, version)
+    logger.info(f"Scene {scene.id} updated to version {version}")
+    return version
+
+
+def edit_scene(
+    db: Session, scene: Scene, operations: list[dict[str, Any]], name: str | None = None
+) -> tuple[int, list[str]]:
+    """
+    Apply entity-level edits to a scene and store the result as a new version
+
+    Only the touched entities (and their spatial neighbours, for overlaps)
+    are re-processed; see ``Postprocessor.apply_entity_edits``.
+
+    Args:
+        db: Database session
+        scene: Stored scene
+        operations: Entity edit operations
+        name: Optional new name
+
+    Returns:
+        The scene's latest version number and the IDs of the touched entities
+
+    Raises:
+        SceneEditError: If the edits cannot be applied
+    """
+    scene_data, touched = postprocessor.apply_entity_edits(scene.scene_data or {}, operations)
+    return update_scene(db, scene, scene_data, name=name), touched
+
+
+def delete_scene(db: Session, scene: Scene) -> None:
+    """Delete a scene and its version history"""
+    scene_id = scene.id
+    db.query(SceneVersion).filter(SceneVersion.scene_id == scene_id).delete(
+        synchronize_session=False
+    )
+    db.delete(scene)
+    db.commit()
+    scene_cache.invalidate(scene_id)
+    logger.info(f"Scene deleted: {scene_id}")
+
+
+def list_versions(db: Session, scene_id: Any) -> list[Any]:
+    """
+    List a scene's versions, oldest first, without loading their data
+
+    Returns:
+        Rows with ``version``, ``snapshot`` (whether the version stores a full
+        snapshot), ``patch_size`` and ``created_at``
+    """
+    return (
+        db.query(
+            SceneVersion.version,
+            SceneVersion.snapshot.isnot(None).label("snapshot"),
+            SceneVersion.patch_size,
+            SceneVersion.created_at,
+        )
+        .filter(SceneVersion.scene_id == scene_id)
+        .order_by(SceneVersion.version)
+        .all()
+    )
+
+
+def rebuild_scene(snapshot: dict[str, Any], patches: list[list[dict[str, Any]]]) -> dict[str, Any]:
+    """
+    Rebuild a scene version from a snapshot and the patches following it
+
+    Args:
+        snapshot: Scene data at the snapshot version (not modified)
+        patches: Patches of each later version, in order
+
+    Returns:
+        The scene data after applying every patch
+    """
+    # A JSON round trip is a much cheaper deep copy than copy.deepcopy
+    scene_data = loads(dumps(snapshot))
+    for patch in patches:
+        scene_data = apply_patch(scene_data, patch, in_place=True)
+    return scene_data
+
+
+def get_scene_version(db: Session, scene: Scene, version: int) -> dict[str, Any] | None:
+    """
+    Get a scene's data as of a version
+
+    Args:
+        db: Database session
+        scene: Stored scene
+        version: Version number (1-based)
+
+    Returns:
+        Scene data, or None if the version does not exist
+    """
+    head = head_version(db, scene.id)
+    if version < 1 or version > head:
+        return None
+    if version == head:
+        return scene.scene_data
+    return _load_version(db, scene, version)
+
+
+def _load_version(db: Session, scene: Scene, version: int) -> dict[str, Any] | None:
+    """Rebuild a past version from its nearest snapshot and the patches after it"""
+    base = (
+        db.query(SceneVersion)
+        .options(load_only(SceneVersion.version, SceneVersion.snapshot))
+        .filter(
+            SceneVersion.scene_id == scene.id,
+            SceneVersion.version <= version,
+            SceneVersion.snapshot.isnot(None),
+        )
+        .order_by(SceneVersion.version.desc())
+        .first()
+    )
+    if base is None:
+        return None
+    patches = (
+        db.query(SceneVersion.patch)
+        .filter(
+            SceneVersion.scene_id == scene.id,
+            SceneVersion.version > base.version,
+            SceneVersion.version <= version,
+        )
+        .order_by(SceneVersion.version)
+        .all()
+    )
+    return rebuild_scene(base.snapshot, [patch for (patch,) in patches])
+
+
+def serialize_scene_version(
+    db: Session, scene: Scene, version: int | None = None
+) -> tuple[int, SerializedScene] | None:
+    """
+    Get the serialized (and precompressed) form of a scene version
+
+    Past versions never change, so once rebuilt they are served from the
+    scene cache; the latest version is cached against its version number.
+    The first read of a version compresses it, so call this off the event
+    loop.
+
+    Args:
+        db: Database session
+        scene: Stored scene
+        version: Version number, or None for the latest version
+
+    Returns:
+        (version, serialized scene), or None if the version does not exist
+    """
+    head = head_version(db, scene.id)
+    if version is None or version == head:
+        return head, _cache_latest(scene, head, precompress=settings.precompress_scenes)
+    if version < 1 or version > head:
+        return None
+
+    key = f"{scene.id}@{version}"
+    serialized = scene_cache.get(key)
+    if serialized is None:
+        scene_data = _load_version(db, scene, version)
+        if scene_data is None:
+            return None
+        serialized = scene_cache.serialize(key, scene_data, precompress=settings.precompress_scenes)
+    return version, serialized
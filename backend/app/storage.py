@@ -8,7 +8,9 @@ object storage with proper error handling and logging.
 import io
 import logging
 import os
+from collections.abc import Iterator
 from datetime import timedelta
+from typing import Any
 
 from minio import Minio
 from minio.error import S3Error
@@ -53,6 +55,7 @@ def upload_file_to_storage(
     data: io.BytesIO,
     length: int,
     content_type: str = "application/octet-stream",
+    ensure_bucket: bool = True,
 ) -> bool:
     """
     Upload file to MinIO storage
@@ -63,6 +66,8 @@ def upload_file_to_storage(
         data: File data as BytesIO stream
         length: Size of the data in bytes
         content_type: MIME type of the file
+        ensure_bucket: Check (and create) the bucket before uploading. Batch
+            callers that already ensured the bucket can skip the round trip.
 
     Returns:
         True if successful, False otherwise
@@ -71,7 +76,7 @@ def upload_file_to_storage(
         client = get_minio_client()
 
         # Ensure bucket exists
-        if not client.bucket_exists(bucket_name):
+        if ensure_bucket and not client.bucket_exists(bucket_name):
             client.make_bucket(bucket_name)
             logger.info(f"Created bucket: {bucket_name}")
 
@@ -126,6 +131,99 @@ def download_file_from_storage(bucket_name: str, object_name: str) -> bytes | No
         return None
 
 
+def download_file_to_path(bucket_name: str, object_name: str, file_path: str) -> bool:
+    """
+    Download file from MinIO storage straight to a local path
+
+    Args:
+        bucket_name: Name of the bucket
+        object_name: Name/path of the object in the bucket
+        file_path: Local destination path
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        client = get_minio_client()
+        client.fget_object(bucket_name, object_name, file_path)
+
+        logger.info(f"Downloaded {object_name} from {bucket_name} to {file_path}")
+        return True
+
+    except S3Error as e:
+        logger.error(f"Failed to download {object_name}: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error downloading file: {e}")
+        return False
+
+
+def stat_file_in_storage(bucket_name: str, object_name: str) -> Any | None:
+    """
+    Get object information (size, ETag, content type) without downloading it
+
+    Args:
+        bucket_name: Name of the bucket
+        object_name: Name/path of the object in the bucket
+
+    Returns:
+        MinIO object stat or None if the object does not exist or failed
+    """
+    try:
+        client = get_minio_client()
+        return client.stat_object(bucket_name, object_name)
+
+    except S3Error as e:
+        logger.error(f"Failed to stat {object_name}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error getting object info: {e}")
+        return None
+
+
+def stream_file_from_storage(
+    bucket_name: str,
+    object_name: str,
+    offset: int = 0,
+    length: int = 0,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Stream an object (or a byte range of it) from MinIO storage
+
+    The request is issued immediately, so storage errors are raised to the
+    caller before any data is sent. Chunks are then yielded as they arrive
+    from the storage response and the object is never held in memory as a
+    whole. The connection is released when the iterator is exhausted or
+    closed.
+
+    Args:
+        bucket_name: Name of the bucket
+        object_name: Name/path of the object in the bucket
+        offset: Start byte of the range to read
+        length: Number of bytes to read (0 reads to the end of the object)
+        chunk_size: Size of the chunks to yield
+
+    Returns:
+        Iterator over raw object data chunks
+
+    Raises:
+        S3Error: If the object cannot be read
+    """
+    client = get_minio_client()
+    response = client.get_object(bucket_name, object_name, offset=offset, length=length)
+    return _iter_response_chunks(response, chunk_size)
+
+
+def _iter_response_chunks(response: Any, chunk_size: int) -> Iterator[bytes]:
+    """Yield chunks from a storage response and release its connection"""
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.close()
+        response.release_conn()
+
+
 def delete_file_from_storage(bucket_name: str, object_name: str) -> bool:
     """
     Delete file from MinIO storage
@@ -0,0 +1,139 @@
+"""
+Circuit breaking for calls to an unreliable backend
+
+``CircuitBreaker`` stops calling a backend that keeps failing. It is
+``closed`` (calls pass) until ``failure_threshold`` consecutive calls fail
+with one of the ``counted`` errors, then ``open``: calls are refused at once
+with ``CircuitOpenError``, without waiting for a connection error or a
+timeout. After ``recovery_timeout`` seconds it is ``half_open`` and lets
+``half_open_max_calls`` trial calls through; a success closes it again, a
+failure re-opens it for another ``recovery_timeout``.
+
+Errors that are not ``counted`` (a malformed reply, say) show the backend
+is up, and neither trip nor reset the breaker.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        counted: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError),
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(half_open_max_calls, 1)
+        self.counted = counted
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "short_circuited": 0}
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Wrap one call to the backend
+
+        Raises:
+            CircuitOpenError: The circuit is open, so the call was not made
+        """
+        trial = self._admit()
+        try:
+            yield
+        except self.counted:
+            self._record(trial, failed=True)
+            raise
+        except BaseException:
+            self._record(trial, failed=None)
+            raise
+        else:
+            self._record(trial, failed=False)
+
+    def available(self) -> bool:
+        """Whether a call would be let through right now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CIRCUIT_HALF_OPEN:
+                return self._trials < self.half_open_max_calls
+            return state == CIRCUIT_CLOSED
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current state, for status reporting"""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == CIRCUIT_OPEN:
+                retry_in = round(self._opened_at + self.recovery_timeout - time.monotonic(), 3)
+            opened_at = None
+            if self.stats["opened"]:
+                opened_at = datetime.fromtimestamp(
+                    time.time() - (time.monotonic() - self._opened_at), timezone.utc
+                ).isoformat()
+            return {
+                "state": state,
+                "consecutive_failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "last_opened_at": opened_at,
+                "retry_in": retry_in,
+                **self.stats,
+            }
+
+    def _current_state(self) -> str:
+        if (
+            self.state == CIRCUIT_OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self.state = CIRCUIT_HALF_OPEN
+            self._trials = 0
+        return self.state
+
+    def _admit(self) -> bool:
+        """Let a call through or refuse it; returns whether it is a trial call"""
+        with self._lock:
+            state = self._current_state()
+            if state == CIRCUIT_CLOSED:
+                return False
+            if state == CIRCUIT_HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return True
+            self.stats["short_circuited"] += 1
+            retry_in = max(self._opened_at + self.recovery_timeout - time.monotonic(), 0.0)
+            raise CircuitOpenError(f"Circuit open, next attempt in {retry_in:.1f}s")
+
+    def _record(self, trial: bool, failed: bool | None) -> None:
+        with self._lock:
+            if trial:
+                self._trials -= 1
+            if failed is None:
+                return
+            if not failed:
+                self.failures = 0
+                if trial:
+                    self.state = CIRCUIT_CLOSED
+                return
+            self.failures += 1
+            if trial or (self.state == CIRCUIT_CLOSED and self.failures >= self.failure_threshold):
+                self.state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self.stats["opened"] += 1
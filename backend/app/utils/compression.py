@@ -0,0 +1,186 @@
+"""
+HTTP response compression
+
+Content-Encoding negotiation and codecs for gzip, brotli and zstd, plus an
+ASGI middleware compressing API responses on the fly. Brotli and zstd are
+optional: when their packages are not installed those encodings are simply
+not offered.
+
+Responses that already carry a Content-Encoding (such as precompressed
+scenes) are passed through untouched, as are streamed and ranged responses
+(exports, asset content), whose payloads are mostly compressed formats.
+"""
+
+import gzip
+from collections.abc import Iterable
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Supported encodings in server preference order (used to break q-value ties)
+SUPPORTED_ENCODINGS = tuple(
+    name
+    for name, available in (("zstd", zstandard), ("br", brotli), ("gzip", gzip))
+    if available is not None
+)
+
+# Compression levels for on-the-fly responses and for precompression. The
+# strongest brotli and zstd levels shave off another fifth but take seconds
+# per megabyte, too slow even for payloads compressed once.
+_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+_PRECOMPRESS_LEVELS = {"gzip": 6, "br": 5, "zstd": 9}
+
+# Bodies at least this large are compressed off the event loop
+_THREADPOOL_THRESHOLD = 64 * 1024
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.ossgameforge.scene",
+)
+
+
+def negotiate_encoding(
+    accept_encoding: str | None, available: Iterable[str] = SUPPORTED_ENCODINGS
+) -> str | None:
+    """
+    Pick a content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        available: Encodings the server can produce, in preference order
+
+    Returns:
+        The chosen encoding, or None to send the identity representation
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, *, precompress: bool = False) -> bytes:
+    """
+    Compress data with a content coding
+
+    Args:
+        data: Payload to compress
+        encoding: One of SUPPORTED_ENCODINGS
+        precompress: Use the stronger level for payloads compressed once
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    level = (_PRECOMPRESS_LEVELS if precompress else _LEVELS)[encoding]
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def compress_all(data: bytes) -> dict[str, bytes]:
+    """Compress a payload with every supported encoding at the precompression level"""
+    return {
+        encoding: compress(data, encoding, precompress=True) for encoding in SUPPORTED_ENCODINGS
+    }
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Check whether a media type benefits from compression"""
+    return bool(content_type) and content_type.lower().startswith(_COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Negotiate gzip/brotli/zstd for single-message API responses"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or "content-range" in headers
+                or len(body) < self.minimum_size
+                or not is_compressible(headers.get("content-type"))
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= _THREADPOOL_THRESHOLD:
+                body = await run_in_threadpool(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
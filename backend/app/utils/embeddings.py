@@ -0,0 +1,82 @@
+"""
+Text embeddings for similarity search
+
+``load_embedder`` returns a sentence-transformers model running on the CPU
+when one is configured and the package is installed. Otherwise it returns
+``HashingEmbedder``, which needs nothing but numpy: words and their
+character trigrams are hashed into a fixed number of signed buckets. It
+catches shared words and spellings ("lava" and "lavafall"), but not
+synonyms.
+
+Every embedder returns float32 rows of unit length, so a dot product is
+the cosine similarity.
+"""
+
+import logging
+import re
+import zlib
+from typing import Protocol
+
+import numpy as np
+
+try:
+    import sentence_transformers
+except ImportError:  # pragma: no cover - optional dependency
+    sentence_transformers = None
+
+logger = logging.getLogger(__name__)
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+class Embedder(Protocol):
+    dim: int
+
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Dependency-free embedding of words and character trigrams"""
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORDS.findall(text.lower()):
+                self._add(vectors[row], word, 1.0)
+                padded = f"#{word}#"
+                for i in range(len(padded) - 2):
+                    self._add(vectors[row], padded[i : i + 3], self.trigram_weight)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _add(self, vector: np.ndarray, feature: str, weight: float) -> None:
+        digest = zlib.crc32(feature.encode())
+        vector[digest % self.dim] += weight if digest & 0x80000000 else -weight
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model on the CPU"""
+
+    def __init__(self, model_name: str):
+        self.model = sentence_transformers.SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32).reshape(len(texts), self.dim)
+
+
+def load_embedder(model_name: str | None = None) -> Embedder:
+    """The configured embedding model, or the hashing embedder without one"""
+    if model_name and sentence_transformers is not None:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:  # pragma: no cover - model files unavailable
+            logger.warning(f"Cannot load embedding model {model_name}, hashing instead: {e}")
+    elif model_name:
+        logger.warning("sentence-transformers is not installed, hashing embeddings instead")
+    return HashingEmbedder()
@@ -0,0 +1,183 @@
+"""
+Load balancing and request hedging over a pool of backend endpoints
+
+``EndpointPool`` spreads calls over several equivalent servers. Each
+``Endpoint`` has its own circuit breaker and concurrency limiter, so one
+failing or overloaded server does not take the others down with it.
+
+Each call goes to the better of two endpoints picked at random (power of
+two choices), scoring each by its calls in flight divided by its health,
+a moving average of its recent success rate. Endpoints whose circuit is
+open are skipped.
+
+When a call is still running after the ``hedge_percentile`` latency of
+recent calls, the same call is started on a second endpoint with a free
+slot, and whichever finishes first wins; the other is cancelled. Hedges
+are capped at ``hedge_budget`` of all calls, so a slow spell cannot double
+the load on the servers.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .limiter import AdaptiveLimiter
+
+T = TypeVar("T")
+
+# Weight of the latest call in an endpoint's health
+HEALTH_DECAY = 0.2
+
+# Healthy endpoints always win over one this unhealthy
+MIN_HEALTH = 0.05
+
+
+class Endpoint:
+    """One server of a pool, with its own breaker and limiter"""
+
+    def __init__(self, url: str, limiter: AdaptiveLimiter, breaker: CircuitBreaker):
+        self.url = url
+        self.limiter = limiter
+        self.breaker = breaker
+        self.health = 1.0
+
+    @property
+    def in_flight(self) -> int:
+        return self.limiter.in_flight
+
+    def load(self) -> float:
+        """Lower is better"""
+        return (self.in_flight + 1) / max(self.health, MIN_HEALTH)
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < int(self.limiter.limit) and self.breaker.available()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "health": round(self.health, 3),
+            "concurrency": self.limiter.snapshot(),
+            "circuit_breaker": self.breaker.snapshot(),
+        }
+
+
+class EndpointPool:
+    """Endpoints called with power-of-two-choices balancing and hedging"""
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        hedge_percentile: float = 95.0,
+        hedge_budget: float = 0.1,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+    ):
+        if not endpoints:
+            raise ValueError("An endpoint pool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+    def choose(self) -> Endpoint:
+        """
+        Pick the endpoint for a call
+
+        Raises:
+            CircuitOpenError: Every endpoint's circuit is open
+        """
+        candidates = [e for e in self.endpoints if e.breaker.available()]
+        if not candidates:
+            raise CircuitOpenError("Circuit open on every model endpoint")
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.load() <= second.load() else second
+
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a call is hedged, or None to not hedge it"""
+        if len(self.endpoints) < 2 or len(self._latencies) < self.hedge_min_samples:
+            return None
+        if self.stats["hedged"] >= self.hedge_budget * self.stats["requests"]:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self.hedge_percentile / 100), len(latencies) - 1)
+        return latencies[index]
+
+    async def call(self, request: Callable[[Endpoint], Awaitable[T]]) -> T:
+        """
+        Run ``request`` against the pool, hedging it when it is slow
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            The error of the first attempt when every attempt failed
+        """
+        self.stats["requests"] += 1
+        primary = self.choose()
+        attempts = {asyncio.ensure_future(self._attempt(primary, request)): primary}
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                await asyncio.wait(set(attempts), timeout=delay)
+                backup = self._hedge_target(primary)
+                if backup is not None and not any(task.done() for task in attempts):
+                    self.stats["hedged"] += 1
+                    attempts[asyncio.ensure_future(self._attempt(backup, request))] = backup
+
+            errors = []
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if attempts[task] is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            # The loser's connection is dropped, so the server stops working on it
+            for task in attempts:
+                task.cancel()
+
+    def state(self) -> str:
+        """Circuit state shared by every endpoint, or ``partial`` if they differ"""
+        states = {endpoint.breaker.snapshot()["state"] for endpoint in self.endpoints}
+        return states.pop() if len(states) == 1 else "partial"
+
+    def snapshot(self) -> dict[str, Any]:
+        """Endpoint states and hedging counters"""
+        delay = self.hedge_delay()
+        return {
+            "endpoints": [endpoint.snapshot() for endpoint in self.endpoints],
+            "hedge_delay_ms": None if delay is None else int(delay * 1000),
+            **self.stats,
+        }
+
+    def _hedge_target(self, primary: Endpoint) -> Endpoint | None:
+        """An endpoint that can take the hedge without queueing"""
+        candidates = [e for e in self.endpoints if e is not primary and e.has_capacity()]
+        if not candidates:
+            return None
+        return min(candidates, key=Endpoint.load)
+
+    async def _attempt(self, endpoint: Endpoint, request: Callable[[Endpoint], Awaitable[T]]) -> T:
+        with endpoint.breaker.guard():
+            async with endpoint.limiter.acquire():
+                start = time.monotonic()
+                try:
+                    result = await request(endpoint)
+                except endpoint.breaker.counted:
+                    endpoint.health *= 1 - HEALTH_DECAY
+                    raise
+                self._latencies.append(time.monotonic() - start)
+                endpoint.health += (1 - endpoint.health) * HEALTH_DECAY
+                return result
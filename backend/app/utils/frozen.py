@@ -0,0 +1,98 @@
+"""
+Immutable JSON documents with copy-on-write overlays
+
+Golden samples are loaded once and handed to every fallback generation.
+``freeze`` turns such a document into ``FrozenDict`` / ``FrozenList``
+containers that refuse in-place changes, so one request can no longer
+corrupt the sample for the next. They subclass ``dict`` and ``list``, so
+reading, ``isinstance`` checks and JSON serialization work unchanged.
+
+Rather than deep-copying a frozen document before changing it,
+``overlay`` gives a writable copy of just its top level and of the objects
+in its top-level lists (a scene and its entities). Everything below that
+stays shared with the frozen original: writers replace nested containers
+(``entity["position"] = {...}``) instead of modifying them, and only what
+they replace is allocated.
+"""
+
+from typing import Any, NoReturn
+
+
+def _immutable(self, *_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is immutable; overlay or thaw it first")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified in place"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        # Deep copies are made to be modified
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """A list that cannot be modified in place"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert a JSON document into frozen containers"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively copy a (possibly frozen) JSON document into plain containers"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def is_frozen(value: Any) -> bool:
+    """Whether a container refuses in-place changes"""
+    return isinstance(value, FrozenDict | FrozenList)
+
+
+def overlay(document: dict[str, Any]) -> dict[str, Any]:
+    """
+    Writable copy-on-write view of a document
+
+    Copies the top-level dict, and replaces each frozen top-level list with
+    a plain list of its items, copying the frozen objects among them.
+    Nested values are shared with ``document`` and must be replaced rather
+    than modified.
+
+    Args:
+        document: A frozen or plain JSON object
+
+    Returns:
+        A new dict; ``document`` itself is never modified
+    """
+    view = dict(document)
+    for key, value in view.items():
+        if isinstance(value, FrozenList):
+            view[key] = [dict(item) if isinstance(item, FrozenDict) else item for item in value]
+    return view
@@ -0,0 +1,87 @@
+"""
+HTTP helpers for conditional and partial (Range) responses
+"""
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a Range header cannot be satisfied for a resource"""
+
+
+def quote_etag(etag: str) -> str:
+    """Return an ETag in its quoted header form"""
+    etag = etag.strip()
+    if etag.startswith(("W/", '"')):
+        return etag
+    return f'"{etag}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against a resource ETag
+
+    Uses weak comparison as required for If-None-Match (RFC 9110 13.1.2).
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current ETag of the resource (quoted or unquoted)
+
+    Returns:
+        True if the client's cached representation is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = quote_etag(etag).removeprefix("W/")
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return current in candidates
+
+
+def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range ``bytes`` Range header
+
+    Multi-range and non-byte range requests are ignored (None), in which
+    case the full representation should be served.
+
+    Args:
+        range_header: Raw Range header value
+        size: Total size of the resource in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions or None to serve the full body
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the resource
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if end is None:
+            return None
+        if end <= 0 or size == 0:
+            raise RangeNotSatisfiable(range_header)
+        return max(size - end, 0), size - 1
+
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(range_header)
+    return start, size - 1 if end is None else min(end, size - 1)
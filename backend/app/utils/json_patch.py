@@ -0,0 +1,203 @@
+"""
+Structural diffs between JSON documents (RFC 6902 JSON Patch)
+
+``make_patch`` produces add/remove/replace operations whose size follows the
+size of the edit rather than the size of the document: objects are diffed
+key by key, and lists are diffed after trimming their common prefix and
+suffix, so inserting, removing or editing one entity of a large scene yields
+a single small operation. ``apply_patch`` applies those operations (and the
+``move``, ``copy`` and ``test`` operations of the RFC).
+"""
+
+import copy
+from typing import Any
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed or does not apply to a document"""
+
+
+def escape_token(token: Any) -> str:
+    """Escape a key or index for use in a JSON Pointer"""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _tokens(pointer: str) -> list[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [_unescape_token(token) for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, *, append: bool = False) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc: Any, tokens: list[str]) -> Any:
+    target = doc
+    for token in tokens:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path not found: {token!r}")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_index(target, token)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into {type(target).__name__}")
+    return target
+
+
+def _diff(src: Any, dst: Any, path: str, ops: list[dict[str, Any]]) -> None:
+    if src is dst:
+        return
+    if isinstance(src, dict) and isinstance(dst, dict):
+        for key, value in src.items():
+            if key not in dst:
+                ops.append({"op": "remove", "path": f"{path}/{escape_token(key)}"})
+            elif value != dst[key]:
+                _diff(value, dst[key], f"{path}/{escape_token(key)}", ops)
+        for key, value in dst.items():
+            if key not in src:
+                ops.append({"op": "add", "path": f"{path}/{escape_token(key)}", "value": value})
+        return
+    if isinstance(src, list) and isinstance(dst, list):
+        _diff_list(src, dst, path, ops)
+        return
+    if type(src) is not type(dst) or src != dst:
+        ops.append({"op": "replace", "path": path, "value": dst})
+
+
+def _diff_list(src: list, dst: list, path: str, ops: list[dict[str, Any]]) -> None:
+    # Trim the common prefix and suffix; only the differing window is emitted
+    limit = min(len(src), len(dst))
+    start = 0
+    while start < limit and src[start] == dst[start]:
+        start += 1
+    end = 0
+    while end < limit - start and src[-1 - end] == dst[-1 - end]:
+        end += 1
+    src_window = src[start : len(src) - end]
+    dst_window = dst[start : len(dst) - end]
+
+    common = min(len(src_window), len(dst_window))
+    for offset in range(common):
+        _diff(src_window[offset], dst_window[offset], f"{path}/{start + offset}", ops)
+    for _ in range(len(src_window) - common):
+        ops.append({"op": "remove", "path": f"{path}/{start + common}"})
+    for offset in range(common, len(dst_window)):
+        ops.append({"op": "add", "path": f"{path}/{start + offset}", "value": dst_window[offset]})
+
+
+def make_patch(src: Any, dst: Any) -> list[dict[str, Any]]:
+    """
+    Compute the JSON Patch turning one document into another
+
+    Args:
+        src: Original document
+        dst: Target document
+
+    Returns:
+        List of RFC 6902 operations (empty when the documents are equal).
+        Values in the operations are shared with ``dst``, not copied.
+    """
+    ops: list[dict[str, Any]] = []
+    _diff(src, dst, "", ops)
+    return ops
+
+
+def apply_patch(doc: Any, patch: list[dict[str, Any]], *, in_place: bool = False) -> Any:
+    """
+    Apply a JSON Patch to a document
+
+    Args:
+        doc: Document to patch
+        patch: RFC 6902 operations
+        in_place: Mutate ``doc`` instead of patching a deep copy of it (use
+            when the document was freshly loaded and is not shared)
+
+    Returns:
+        The patched document
+
+    Raises:
+        JsonPatchError: If an operation is malformed or a path does not apply
+    """
+    if not in_place:
+        doc = copy.deepcopy(doc)
+    for op in patch:
+        try:
+            kind = op["op"]
+            tokens = _tokens(op["path"])
+        except (KeyError, TypeError) as e:
+            raise JsonPatchError(f"Malformed operation: {op!r}") from e
+
+        if kind in ("add", "replace", "test") and "value" not in op:
+            raise JsonPatchError(f"Operation {kind!r} requires a value")
+        if kind == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise JsonPatchError(f"Test failed at {op['path']!r}")
+            continue
+        if kind in ("move", "copy"):
+            try:
+                from_tokens = _tokens(op["from"])
+            except KeyError as e:
+                raise JsonPatchError(f"Operation {kind!r} requires 'from'") from e
+            value = _resolve(doc, from_tokens)
+            if kind == "move":
+                if tokens[: len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError("Cannot move a value into one of its children")
+                doc = _remove(doc, from_tokens)
+            else:
+                value = copy.deepcopy(value)
+            doc = _add(doc, tokens, value)
+        elif kind == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            doc = _remove(doc, tokens)
+        elif kind == "replace":
+            doc = _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        else:
+            raise JsonPatchError(f"Unknown operation: {kind!r}")
+    return doc
+
+
+def _add(doc: Any, tokens: list[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, append=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to {type(parent).__name__}")
+    return doc
+
+
+def _remove(doc: Any, tokens: list[str]) -> Any:
+    if not tokens:
+        return None
+    parent = _resolve(doc, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        del parent[token]
+    elif isinstance(parent, list):
+        del parent[_index(parent, token)]
+    else:
+        raise JsonPatchError(f"Cannot remove from {type(parent).__name__}")
+    return doc
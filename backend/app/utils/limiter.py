@@ -0,0 +1,134 @@
+"""
+Adaptive concurrency limiting (AIMD)
+
+``AdaptiveLimiter`` caps the calls in flight to a backend whose capacity is
+unknown and changes over time, such as a GPU model server. The limit grows
+by one for every ``limit`` calls that complete within the latency target
+(additive increase) and is cut by ``backoff`` when a call times out or is
+slower than the target (multiplicative decrease). Only calls admitted under
+the current limit can cut it, so a burst of timeouts caused by one overload
+halves the limit once rather than collapsing it to the minimum.
+
+Callers over the limit wait in a bounded queue for at most
+``queue_timeout`` seconds. When the queue is full, or the wait runs out,
+``LimiterRejected`` is raised at once, so the caller can fall back instead
+of piling onto an overloaded backend.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+class LimiterRejected(RuntimeError):
+    """Raised when a call is shed instead of being queued"""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded wait queue"""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        max_queue: int = 16,
+        queue_timeout: float = 5.0,
+        latency_target: float = 30.0,
+        backoff: float = 0.5,
+    ):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._decreased_at = 0.0
+        self.stats = {"admitted": 0, "rejected": 0, "increases": 0, "decreases": 0}
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """
+        Hold one slot for the duration of a call
+
+        Raises:
+            LimiterRejected: The wait queue is full or the wait timed out
+        """
+        await self._admit()
+        start = time.monotonic()
+        try:
+            yield
+        except (TimeoutError, asyncio.TimeoutError):
+            self._release(start, congested=True)
+            raise
+        except BaseException:
+            # Other failures say nothing about the backend's capacity
+            self._release(start, congested=None)
+            raise
+        else:
+            self._release(start, congested=time.monotonic() - start > self.latency_target)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current limit, load and counters"""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            **self.stats,
+        }
+
+    async def _admit(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise LimiterRejected(f"{self.in_flight} calls in flight and the queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise LimiterRejected(f"No slot freed up within {self.queue_timeout}s") from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait was cancelled
+                self._release(time.monotonic(), congested=None)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.stats["admitted"] += 1
+
+    def _release(self, start: float, congested: bool | None) -> None:
+        self.in_flight -= 1
+        if congested:
+            if start >= self._decreased_at:
+                self.limit = max(self.limit * self.backoff, self.minimum)
+                self._decreased_at = time.monotonic()
+                self.stats["decreases"] += 1
+        elif congested is False and self.limit < self.maximum:
+            previous = int(self.limit)
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+            if int(self.limit) > previous:
+                self.stats["increases"] += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting callers, oldest first"""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
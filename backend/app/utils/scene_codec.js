@@ -0,0 +1,132 @@
+/*
+ * Binary scene decoder for the OSSGameForge HTML5 runner.
+ *
+ * Mirrors decode_scene() in scene_codec.py. Usage:
+ *     fetch('scene.bin').then(r => r.arrayBuffer()).then(decodeScene)
+ */
+(function (global) {
+    'use strict';
+
+    var FORMAT_VERSION = 1;
+    var NONE = 0xFFFFFFFF;
+    var HEADER_SIZE = 28;
+    // Row flags; integer-ness only matters to the Python decoder
+    var HAS_POS = 1, POS_RELATIVE = 4, HAS_SIZE = 8;
+
+    function pad4(n) {
+        return (n + 3) & ~3;
+    }
+
+    function decodeScene(buffer) {
+        var view = new DataView(buffer);
+        var bytes = new Uint8Array(buffer);
+        if (String.fromCharCode(bytes[0], bytes[1], bytes[2], bytes[3]) !== 'OGFS') {
+            throw new Error('Not a binary scene');
+        }
+        var version = view.getUint16(4, true);
+        if (version !== FORMAT_VERSION) {
+            throw new Error('Unsupported scene format version ' + version);
+        }
+        var count = view.getUint32(8, true);
+        var stringCount = view.getUint32(12, true);
+        var stringBytes = view.getUint32(16, true);
+
+        var pos = HEADER_SIZE;
+        var offsets = new Uint32Array(buffer, pos, stringCount + 1);
+        pos += (stringCount + 1) * 4;
+        var decoder = new TextDecoder('utf-8');
+        var strings = new Array(stringCount);
+        var pool = decoder.decode(bytes.subarray(pos, pos + stringBytes));
+        var s;
+        if (pool.length === stringBytes) {
+            // ASCII-only pool: byte offsets are character offsets, so slice one decoded string
+            for (s = 0; s < stringCount; s++) strings[s] = pool.slice(offsets[s], offsets[s + 1]);
+        } else {
+            for (s = 0; s < stringCount; s++) {
+                strings[s] = decoder.decode(bytes.subarray(pos + offsets[s], pos + offsets[s + 1]));
+            }
+        }
+        pos += pad4(stringBytes);
+
+        var xs = new Float32Array(buffer, pos, count); pos += count * 4;
+        var ys = new Float32Array(buffer, pos, count); pos += count * 4;
+        var ws = new Float32Array(buffer, pos, count); pos += count * 4;
+        var hs = new Float32Array(buffer, pos, count); pos += count * 4;
+        var ids = new Uint32Array(buffer, pos, count); pos += count * 4;
+        var types = new Uint32Array(buffer, pos, count); pos += count * 4;
+        var names = new Uint32Array(buffer, pos, count); pos += count * 4;
+        var owners = new Uint32Array(buffer, pos, count); pos += count * 4;
+        var flags = bytes.subarray(pos, pos + count); pos += pad4(count);
+
+        var lists = {};
+        function list(id) {
+            return lists[id] || (lists[id] = []);
+        }
+
+        function varint() {
+            var result = 0, scale = 1, b;
+            do {
+                b = bytes[pos++];
+                result += (b & 0x7F) * scale;
+                scale *= 128;
+            } while (b & 0x80);
+            return result;
+        }
+
+        function value() {
+            var tag = bytes[pos++], n, i, out;
+            switch (tag) {
+                case 0: return null;
+                case 1: return false;
+                case 2: return true;
+                case 3:
+                    n = varint();
+                    return n % 2 === 0 ? n / 2 : -(n + 1) / 2;
+                case 4:
+                    n = view.getFloat64(pos, true);
+                    pos += 8;
+                    return n;
+                case 5: return strings[varint()];
+                case 6:
+                    n = varint();
+                    out = new Array(n);
+                    for (i = 0; i < n; i++) out[i] = value();
+                    return out;
+                case 7:
+                    n = varint();
+                    out = {};
+                    for (i = 0; i < n; i++) {
+                        var key = strings[varint()];
+                        out[key] = value();
+                    }
+                    return out;
+                case 8: return list(varint());
+                default: throw new Error('Unknown value tag ' + tag);
+            }
+        }
+
+        for (var r = 0; r < count; r++) {
+            var entity = {};
+            if (ids[r] !== NONE) entity.id = strings[ids[r]];
+            if (types[r] !== NONE) entity.type = strings[types[r]];
+            if (names[r] !== NONE) entity.name = strings[names[r]];
+            var f = flags[r];
+            if (f & HAS_POS) {
+                entity[f & POS_RELATIVE ? 'relative_position' : 'position'] = {x: xs[r], y: ys[r]};
+            }
+            if (f & HAS_SIZE) {
+                entity.size = {width: ws[r], height: hs[r]};
+            }
+            var extra = value();
+            for (var k in extra) entity[k] = extra[k];
+            list(owners[r]).push(entity);
+        }
+        // The scene document follows the entity extras
+        return value();
+    }
+
+    global.decodeScene = decodeScene;
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = {decodeScene: decodeScene};
+    }
+})(typeof window !== 'undefined' ? window : this);
@@ -0,0 +1,386 @@
+"""
+Binary scene codec
+
+A compact, versioned binary encoding for scene data, used for storage and
+transfer of large levels. Entities are stored as a columnar table: IDs,
+types and names are indexes into an interned string pool and coordinates
+are float32 arrays, so the per-entity key strings that dominate scene JSON
+are written once. Everything that does not fit a column is kept in a
+tagged value stream, so decoding returns data equal to the encoded scene.
+
+Layout (little-endian, sections aligned to 4 bytes)::
+
+    header      magic "OGFS", u16 version, u16 reserved, u32 entity count,
+                u32 string count, u32 string bytes, u32 extra bytes,
+                u32 document bytes
+    strings     u32 offsets[count + 1], UTF-8 data
+    columns     f32 x, y, width, height; u32 id, type, name, owner; u8 flags
+    extra       tagged dict per entity with the keys not held in columns
+    document    tagged scene with entity lists replaced by list references
+
+Entity lists (``entities`` of the scene and its layers, ``children`` of
+entities) are flattened into the table; ``owner`` links each row back to
+the list it came from. ``scene_codec.js`` implements the same decoder for
+the HTML5 runner.
+"""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+SCENE_BINARY_MEDIA_TYPE = "application/vnd.ossgameforge.scene"
+SCENE_FORMAT_VERSION = 1
+
+# Browser-side decoder shipped with HTML5 exports
+SCENE_DECODER_JS = Path(__file__).with_suffix(".js")
+
+_MAGIC = b"OGFS"
+_HEADER = struct.Struct("<4sHHIIIII")
+_NONE = 0xFFFFFFFF
+_F32 = struct.Struct("<f")
+_F64 = struct.Struct("<d")
+_F32_INT_LIMIT = 1 << 24
+
+# Value tags
+_T_NULL, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT, _T_ENTITIES = range(9)
+
+# Row flags
+_HAS_POS, _POS_INT, _POS_RELATIVE, _HAS_SIZE, _SIZE_INT = 1, 2, 4, 8, 16
+
+# Keys holding entity lists that are stored in the columnar table
+_ENTITY_LIST_KEYS = ("entities", "children")
+
+
+class SceneDecodeError(ValueError):
+    """Raised when binary scene data is malformed or of an unknown version"""
+
+
+def wants_binary_scene(accept: str | None) -> bool:
+    """Check whether an Accept header asks for the binary scene encoding"""
+    if not accept:
+        return False
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        if media_type.strip().lower() != SCENE_BINARY_MEDIA_TYPE:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        return q > 0
+    return False
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: dict[str, int] = {}
+        self.columns: dict[str, list] = {
+            key: [] for key in ("x", "y", "w", "h", "id", "type", "name", "owner", "flags")
+        }
+        self.extras: list[bytes] = []
+        self.list_count = 0
+
+    def intern(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def varint(self, out: bytearray, value: int) -> None:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def value(self, out: bytearray, value: Any, entity_list_key: bool = False) -> None:
+        if value is None:
+            out.append(_T_NULL)
+        elif value is True:
+            out.append(_T_TRUE)
+        elif value is False:
+            out.append(_T_FALSE)
+        elif isinstance(value, int):
+            out.append(_T_INT)
+            self.varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out.append(_T_FLOAT)
+            out += _F64.pack(value)
+        elif isinstance(value, str):
+            out.append(_T_STR)
+            self.varint(out, self.intern(value))
+        elif isinstance(value, dict):
+            out.append(_T_DICT)
+            self.varint(out, len(value))
+            for key, item in value.items():
+                key = str(key)
+                self.varint(out, self.intern(key))
+                self.value(out, item, key in _ENTITY_LIST_KEYS)
+        elif isinstance(value, list | tuple):
+            if entity_list_key and value and all(isinstance(item, dict) for item in value):
+                out.append(_T_ENTITIES)
+                self.varint(out, self.entity_list(value))
+            else:
+                out.append(_T_LIST)
+                self.varint(out, len(value))
+                for item in value:
+                    self.value(out, item)
+        else:
+            self.value(out, str(value))
+
+    def entity_list(self, entities: list[dict[str, Any]]) -> int:
+        list_id = self.list_count
+        self.list_count += 1
+        for entity in entities:
+            self.row(entity, list_id)
+        return list_id
+
+    def row(self, entity: dict[str, Any], owner: int) -> None:
+        columns = self.columns
+        rest = dict(entity)
+        flags = 0
+
+        for column in ("id", "type", "name"):
+            value = rest.get(column)
+            if isinstance(value, str):
+                columns[column].append(self.intern(value))
+                del rest[column]
+            else:
+                columns[column].append(_NONE)
+
+        pos_key = "position" if "position" in rest else "relative_position"
+        pair = _float32_pair(rest.get(pos_key), "x", "y")
+        if pair:
+            flags |= _HAS_POS | (_POS_INT if pair[2] else 0)
+            if pos_key == "relative_position":
+                flags |= _POS_RELATIVE
+            del rest[pos_key]
+        columns["x"].append(pair[0] if pair else 0.0)
+        columns["y"].append(pair[1] if pair else 0.0)
+
+        pair = _float32_pair(rest.get("size"), "width", "height")
+        if pair:
+            flags |= _HAS_SIZE | (_SIZE_INT if pair[2] else 0)
+            del rest["size"]
+        columns["w"].append(pair[0] if pair else 0.0)
+        columns["h"].append(pair[1] if pair else 0.0)
+
+        columns["owner"].append(owner)
+        columns["flags"].append(flags)
+        # Child rows are added while this row's extras are encoded, so fill its slot afterwards
+        row = len(self.extras)
+        self.extras.append(b"")
+        extra = bytearray()
+        self.value(extra, rest)
+        self.extras[row] = bytes(extra)
+
+
+def _float32_pair(data: Any, first: str, second: str) -> tuple[float, float, bool] | None:
+    """Return the pair if it is exactly representable in float32 columns"""
+    if not isinstance(data, dict) or len(data) != 2:
+        return None
+    a, b = data.get(first), data.get(second)
+    if type(a) is int and type(b) is int:
+        if -_F32_INT_LIMIT <= a <= _F32_INT_LIMIT and -_F32_INT_LIMIT <= b <= _F32_INT_LIMIT:
+            return a, b, True
+        return None
+    if type(a) is float and type(b) is float:
+        try:
+            if _F32.unpack(_F32.pack(a))[0] == a and _F32.unpack(_F32.pack(b))[0] == b:
+                return a, b, False
+        except OverflowError:
+            return None
+    return None
+
+
+def _pad(out: bytearray) -> None:
+    out += b"\0" * (-len(out) % 4)
+
+
+def _column_bytes(typecode: str, values: list) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_scene(scene: dict[str, Any]) -> bytes:
+    """
+    Encode scene data in the binary scene format
+
+    Args:
+        scene: Scene data as stored in ``Scene.scene_data``
+
+    Returns:
+        Encoded scene bytes
+    """
+    encoder = _Encoder()
+    document = bytearray()
+    encoder.value(document, scene)
+
+    encoded_strings = [s.encode("utf-8") for s in encoder.strings]
+    offsets = [0]
+    for data in encoded_strings:
+        offsets.append(offsets[-1] + len(data))
+
+    columns = encoder.columns
+    count = len(columns["owner"])
+    extra = b"".join(encoder.extras)
+    out = bytearray(
+        _HEADER.pack(
+            _MAGIC,
+            SCENE_FORMAT_VERSION,
+            0,
+            count,
+            len(encoded_strings),
+            offsets[-1],
+            len(extra),
+            len(document),
+        )
+    )
+    out += _column_bytes("I", offsets)
+    out += b"".join(encoded_strings)
+    _pad(out)
+    for key in ("x", "y", "w", "h"):
+        out += _column_bytes("f", columns[key])
+    for key in ("id", "type", "name", "owner"):
+        out += _column_bytes("I", columns[key])
+    out += bytes(columns["flags"])
+    _pad(out)
+    out += extra
+    out += document
+    return bytes(out)
+
+
+class _Reader:
+    def __init__(self, data: memoryview, strings: list[str]):
+        self.data = data
+        self.pos = 0
+        self.strings = strings
+        self.lists: dict[int, list] = {}
+
+    def varint(self) -> int:
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _T_STR:
+            return self.strings[self.varint()]
+        if tag == _T_DICT:
+            strings = self.strings
+            return {strings[self.varint()]: self.value() for _ in range(self.varint())}
+        if tag == _T_INT:
+            n = self.varint()
+            return n >> 1 if not n & 1 else -((n + 1) >> 1)
+        if tag == _T_FLOAT:
+            (value,) = _F64.unpack_from(self.data, self.pos)
+            self.pos += 8
+            return value
+        if tag == _T_LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _T_ENTITIES:
+            return self.lists.setdefault(self.varint(), [])
+        if tag == _T_TRUE:
+            return True
+        if tag == _T_FALSE:
+            return False
+        if tag == _T_NULL:
+            return None
+        raise SceneDecodeError(f"Unknown value tag {tag}")
+
+
+def _read_column(data: memoryview, offset: int, typecode: str, count: int) -> tuple[list, int]:
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    column.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tolist(), end
+
+
+def decode_scene(data: bytes) -> dict[str, Any]:
+    """
+    Decode a binary scene back into scene data
+
+    Args:
+        data: Bytes produced by ``encode_scene``
+
+    Returns:
+        Scene data
+
+    Raises:
+        SceneDecodeError: If the data is not a supported binary scene
+    """
+    if len(data) < _HEADER.size:
+        raise SceneDecodeError("Truncated scene header")
+    magic, version, _, count, string_count, string_bytes, extra_bytes, doc_bytes = (
+        _HEADER.unpack_from(data)
+    )
+    if magic != _MAGIC:
+        raise SceneDecodeError("Not a binary scene")
+    if version != SCENE_FORMAT_VERSION:
+        raise SceneDecodeError(f"Unsupported scene format version {version}")
+
+    view = memoryview(data)
+    try:
+        offsets, pos = _read_column(view, _HEADER.size, "I", string_count + 1)
+        blob = bytes(view[pos : pos + string_bytes])
+        strings = [blob[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(string_count)]
+        pos += string_bytes + (-string_bytes % 4)
+
+        xs, pos = _read_column(view, pos, "f", count)
+        ys, pos = _read_column(view, pos, "f", count)
+        ws, pos = _read_column(view, pos, "f", count)
+        hs, pos = _read_column(view, pos, "f", count)
+        ids, pos = _read_column(view, pos, "I", count)
+        types, pos = _read_column(view, pos, "I", count)
+        names, pos = _read_column(view, pos, "I", count)
+        owners, pos = _read_column(view, pos, "I", count)
+        flags = bytes(view[pos : pos + count])
+        pos += count + (-count % 4)
+
+        if pos + extra_bytes + doc_bytes > len(data):
+            raise SceneDecodeError("Truncated scene data")
+        reader = _Reader(view[pos : pos + extra_bytes + doc_bytes], strings)
+        lists = reader.lists
+
+        for i in range(count):
+            entity: dict[str, Any] = {}
+            if ids[i] != _NONE:
+                entity["id"] = strings[ids[i]]
+            if types[i] != _NONE:
+                entity["type"] = strings[types[i]]
+            if names[i] != _NONE:
+                entity["name"] = strings[names[i]]
+            row_flags = flags[i]
+            if row_flags & _HAS_POS:
+                x, y = (int(xs[i]), int(ys[i])) if row_flags & _POS_INT else (xs[i], ys[i])
+                key = "relative_position" if row_flags & _POS_RELATIVE else "position"
+                entity[key] = {"x": x, "y": y}
+            if row_flags & _HAS_SIZE:
+                w, h = (int(ws[i]), int(hs[i])) if row_flags & _SIZE_INT else (ws[i], hs[i])
+                entity["size"] = {"width": w, "height": h}
+            entity.update(reader.value())
+            lists.setdefault(owners[i], []).append(entity)
+
+        scene = reader.value()
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise SceneDecodeError(f"Malformed scene data: {e}") from e
+
+    if not isinstance(scene, dict):
+        raise SceneDecodeError("Scene document is not an object")
+    return scene
@@ -0,0 +1,71 @@
+"""
+Fast JSON serialization
+
+orjson-backed helpers used for scene-heavy responses and storage. Scenes
+are large nested dicts; serializing them with orjson is several times
+faster than the stdlib encoder FastAPI uses by default, and pre-serialized
+scene bytes can be embedded into larger responses with ``json_fragment``
+without being parsed or re-encoded.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, set | frozenset | tuple):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes
+
+    Args:
+        obj: JSON-compatible data; datetimes, UUIDs, enums, dataclasses and
+            pydantic models are converted automatically
+        indent: Pretty-print with two-space indentation
+        sort_keys: Sort object keys, for canonical output
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    options = _OPTIONS
+    if indent:
+        options |= orjson.OPT_INDENT_2
+    if sort_keys:
+        options |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=_default, option=options)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize an object to a JSON string (for APIs that expect text)"""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON bytes or text"""
+    return orjson.loads(data)
+
+
+def json_fragment(data: bytes) -> orjson.Fragment:
+    """Wrap already-serialized JSON so it is embedded verbatim by ``dumps``"""
+    return orjson.Fragment(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,40 @@
+"""
+Token counting for prompt budgets
+
+Counts with the model's BPE vocabulary when ``tiktoken`` is installed and
+its encoding is available, and otherwise estimates: one token per
+punctuation mark and per four characters of each word, which slightly
+overcounts English text, so budgets hold either way.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Vocabulary of the gpt-oss models
+ENCODING_NAME = "o200k_base"
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:  # pragma: no cover - encoding files not downloadable
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens ``text`` takes in a prompt"""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
@@ -0,0 +1,140 @@
+"""
+Approximate nearest-neighbour search over unit vectors
+
+``VectorIndex`` answers top-k cosine similarity queries. Below
+``exact_below`` vectors it compares the query with every vector, which
+takes well under a millisecond. Above, it clusters the vectors with
+k-means into about sqrt(n) inverted lists (IVF) and compares the query
+only with the vectors of the ``nprobe`` lists whose centroids are closest,
+a few percent of the index.
+
+Vectors added after clustering join the list of their closest centroid;
+once the index has doubled in size it is clustered afresh.
+"""
+
+from collections.abc import Hashable
+
+import numpy as np
+
+# K-means rounds when clustering
+KMEANS_ITERATIONS = 8
+
+# Vectors sampled per list to train the centroids
+TRAINING_SAMPLES_PER_LIST = 64
+
+
+class VectorIndex:
+    """Top-k cosine similarity search, exact when small and IVF when large"""
+
+    def __init__(self, dim: int, exact_below: int = 2048, nprobe: int = 8, seed: int = 0):
+        self.dim = dim
+        self.exact_below = exact_below
+        self.nprobe = nprobe
+        self._rng = np.random.default_rng(seed)
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._keys: list[Hashable] = []
+        self._rows: dict[Hashable, int] = {}
+        self._centroids: np.ndarray | None = None
+        self._lists: list[list[int]] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, keys: list[Hashable], vectors: np.ndarray) -> None:
+        """Add vectors, replacing those already stored under the same keys"""
+        if not keys:
+            return
+        for key in keys:
+            self.remove(key)
+        start = len(self._keys)
+        self._vectors = np.vstack([self._vectors, np.asarray(vectors, dtype=np.float32)])
+        self._alive = np.concatenate([self._alive, np.ones(len(keys), dtype=bool)])
+        for offset, key in enumerate(keys):
+            self._keys.append(key)
+            self._rows[key] = start + offset
+        if self._centroids is not None:
+            for row, cluster in zip(
+                range(start, len(self._keys)), self._assign(self._vectors[start:]), strict=True
+            ):
+                self._lists[cluster].append(row)
+
+    def remove(self, key: Hashable) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._alive[row] = False
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[Hashable, float]]:
+        """
+        The ``k`` vectors most similar to a unit-length query
+
+        Returns:
+            (key, cosine similarity) pairs, most similar first
+        """
+        if not self._rows or k <= 0:
+            return []
+        if len(self) >= self.exact_below and (
+            self._centroids is None or len(self._keys) > 2 * self._trained_size
+        ):
+            self._train()
+
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        if self._centroids is None:
+            candidates = np.flatnonzero(self._alive)
+        else:
+            closest = self._top(self._centroids @ query, self.nprobe)
+            candidates = np.fromiter(
+                (row for cluster in closest for row in self._lists[cluster]), dtype=np.int64
+            )
+            candidates = candidates[self._alive[candidates]]
+
+        scores = self._vectors[candidates] @ query
+        best = self._top(scores, k)
+        return [(self._keys[candidates[i]], float(scores[i])) for i in best]
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the ``k`` highest scores, highest first"""
+        if k < len(scores):
+            part = np.argpartition(-scores, k)[:k]
+            return part[np.argsort(-scores[part])]
+        return np.argsort(-scores)
+
+    def _train(self) -> None:
+        """Cluster the live vectors into inverted lists"""
+        # Drop removed vectors while at it
+        live = np.flatnonzero(self._alive)
+        self._vectors = self._vectors[live]
+        self._keys = [self._keys[row] for row in live]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._alive = np.ones(len(self._keys), dtype=bool)
+
+        size = len(self._keys)
+        nlist = max(int(np.sqrt(size)), 1)
+        sample_size = min(size, nlist * TRAINING_SAMPLES_PER_LIST)
+        sample = self._vectors[self._rng.choice(size, sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignment == cluster]
+                if len(members):
+                    mean = members.sum(axis=0)
+                    centroids[cluster] = mean / max(np.linalg.norm(mean), 1e-12)
+
+        self._centroids = centroids
+        self._lists = [[] for _ in range(nlist)]
+        for row, cluster in enumerate(self._assign(self._vectors)):
+            self._lists[cluster].append(row)
+        self._trained_size = size
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Closest centroid of each vector"""
+        return np.concatenate(
+            [
+                np.argmax(vectors[i : i + chunk] @ self._centroids.T, axis=1)
+                for i in range(0, len(vectors), chunk)
+            ]
+            or [np.empty(0, dtype=np.int64)]
+        )
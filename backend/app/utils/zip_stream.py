@@ -0,0 +1,91 @@
+"""
+Streaming zip writer
+
+Builds zip archives incrementally and yields the encoded bytes as they are
+produced, so archives of any size can be sent to a client with constant
+memory. Relies on the stdlib ``zipfile`` support for unseekable outputs
+(data descriptors after each entry).
+"""
+
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+
+# Formats that are already compressed and gain nothing from deflate
+PRECOMPRESSED_SUFFIXES = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".ogg",
+    ".mp4",
+    ".webm",
+    ".zip",
+    ".gz",
+    ".br",
+    ".zst",
+)
+
+# A zip entry: archive name plus either the full content or an iterable of chunks
+ZipEntry = tuple[str, bytes | str | Iterable[bytes]]
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object collecting zip output chunks"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        """Yield and forget everything written so far"""
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """
+    Encode entries as a zip archive, yielding output bytes incrementally
+
+    Entries are consumed lazily: chunk iterables are only started when their
+    entry is written, so callers can pass generators that open storage
+    streams on demand. Already-compressed formats are stored, not deflated.
+
+    Args:
+        entries: Iterable of (archive name, content) pairs, where content is
+            bytes, text, or an iterable of byte chunks of unknown size
+
+    Yields:
+        Encoded zip archive chunks
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = (
+                zipfile.ZIP_STORED
+                if name.lower().endswith(PRECOMPRESSED_SUFFIXES)
+                else zipfile.ZIP_DEFLATED
+            )
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+
+            if isinstance(content, bytes | bytearray | memoryview):
+                archive.writestr(info, bytes(content))
+            else:
+                # Size unknown up front: reserve zip64 fields so large entries stay valid
+                with archive.open(info, "w", force_zip64=True) as dest:
+                    for chunk in content:
+                        dest.write(chunk)
+                        yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
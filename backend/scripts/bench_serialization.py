@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark response serialization on the golden samples
+
+Compares the default FastAPI path for GenerationResponse (pydantic
+validation, jsonable_encoder and the stdlib encoder) with the orjson path
+used by the routers, cold and with the scene bytes already cached.
+
+Run from the backend directory: python scripts/bench_serialization.py
+"""
+
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.generation import GenerationResponse  # noqa: E402
+from app.utils.serialization import dumps, json_fragment  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "app" / "golden_samples"
+
+
+def _payload(scene: dict) -> dict:
+    return {
+        "scene_id": scene.get("id", "scene"),
+        "scene": scene,
+        "generation_time": 0.42,
+        "metadata": {"status": "fallback", "model_version": "bench"},
+    }
+
+
+def stdlib_path(scene: dict) -> bytes:
+    """What FastAPI does for a response_model endpoint with JSONResponse"""
+    model = GenerationResponse(**_payload(scene))
+    content = jsonable_encoder(model)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def orjson_path(scene: dict) -> bytes:
+    """Serialize the full payload with orjson"""
+    return dumps(_payload(scene))
+
+
+def cached_path(scene_bytes: bytes, scene_id: str) -> bytes:
+    """Embed already-serialized scene bytes"""
+    payload = _payload({"id": scene_id})
+    payload["scene"] = json_fragment(scene_bytes)
+    return dumps(payload)
+
+
+def _measure(fn, *args) -> tuple[float, int]:
+    number = 200
+    seconds = min(timeit.repeat(lambda: fn(*args), number=number, repeat=5)) / number
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds * 1e6, peak
+
+
+def main() -> None:
+    print(f"{'sample':<30}{'path':<10}{'time (us)':>12}{'peak alloc (KiB)':>18}")
+    for path in sorted(SAMPLES_DIR.glob("*.json")):
+        with open(path) as f:
+            scene = json.load(f)
+        scene_bytes = dumps(scene)
+        results = {
+            "stdlib": _measure(stdlib_path, scene),
+            "orjson": _measure(orjson_path, scene),
+            "cached": _measure(cached_path, scene_bytes, scene.get("id", "scene")),
+        }
+        for name, (micros, peak) in results.items():
+            print(f"{path.stem:<30}{name:<10}{micros:>12.1f}{peak / 1024:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,5 +23,7 @@ setup(
         "python-jose>=3.3.0",
         "passlib>=1.7.4",
         "tinytag>=1.10.1",
+        "orjson>=3.9.15",
+        "numpy>=1.26.4",
     ],
 )
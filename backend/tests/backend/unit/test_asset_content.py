@@ -0,0 +1,113 @@
+"""
+Unit tests for streaming asset content with Range and conditional requests
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.database import get_db
+from app.main import app
+from app.routers import assets as assets_router
+from app.utils.http import RangeNotSatisfiable, etag_matches, parse_range_header
+from fastapi.testclient import TestClient
+
+CONTENT = bytes(range(256)) * 4
+
+
+class TestRangeParsing:
+    """Test Range header parsing"""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 1023)),
+            ("bytes=-24", (1000, 1023)),
+            ("bytes=1000-5000", (1000, 1023)),
+            ("bytes=0-1,5-9", None),
+            ("items=0-5", None),
+            ("bytes=abc", None),
+            (None, None),
+        ],
+    )
+    def test_parse(self, header, expected):
+        """Valid ranges are clamped, unsupported ones ignored"""
+        assert parse_range_header(header, len(CONTENT)) == expected
+
+    def test_unsatisfiable(self):
+        """Ranges starting past the end are rejected"""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=2000-", len(CONTENT))
+
+    def test_etag_matching(self):
+        """If-None-Match uses weak comparison and supports lists"""
+        assert etag_matches('"abc"', "abc")
+        assert etag_matches('W/"abc", "def"', '"abc"')
+        assert etag_matches("*", "abc")
+        assert not etag_matches('"def"', "abc")
+        assert not etag_matches(None, "abc")
+
+
+@pytest.fixture
+def content_client():
+    """Test client serving a fake stored asset"""
+    asset = SimpleNamespace(
+        id="asset_001", path="projects/p/assets/asset_001.wav", asset_metadata={}
+    )
+    info = SimpleNamespace(etag="abc123", size=len(CONTENT), content_type="audio/wav")
+
+    def fake_stream(_asset, offset=0, length=0):
+        data = CONTENT[offset : offset + length] if length else CONTENT[offset:]
+        return iter([data[i : i + 100] for i in range(0, len(data), 100)])
+
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    with (
+        patch.object(assets_router.settings, "mock_mode", False),
+        patch.object(assets_router.asset_service, "get_asset_by_id", return_value=asset),
+        patch.object(assets_router.asset_service, "get_asset_content_info", return_value=info),
+        patch.object(
+            assets_router.asset_service, "stream_asset_content", side_effect=fake_stream
+        ) as stream,
+    ):
+        yield TestClient(app), stream
+    app.dependency_overrides.clear()
+
+
+class TestAssetContentEndpoint:
+    """Test GET /api/assets/{id}/content"""
+
+    def test_full_content(self, content_client):
+        """Full body is streamed with caching headers"""
+        client, _ = content_client
+        response = client.get("/api/assets/asset_001/content")
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert "max-age" in response.headers["cache-control"]
+
+    def test_range_request(self, content_client):
+        """Byte ranges are fetched from storage with an offset"""
+        client, stream = content_client
+        response = client.get("/api/assets/asset_001/content", headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == CONTENT[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+        assert stream.call_args.kwargs == {"offset": 10, "length": 10}
+
+    def test_not_modified(self, content_client):
+        """Matching ETags short-circuit without touching storage"""
+        client, stream = content_client
+        response = client.get(
+            "/api/assets/asset_001/content", headers={"If-None-Match": '"abc123"'}
+        )
+        assert response.status_code == 304
+        stream.assert_not_called()
+
+    def test_unsatisfiable_range(self, content_client):
+        """Out-of-bounds ranges return 416 with the resource size"""
+        client, _ = content_client
+        response = client.get("/api/assets/asset_001/content", headers={"Range": "bytes=5000-6000"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
@@ -0,0 +1,140 @@
+"""
+Unit tests for similarity search over project assets
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from app.models.core_models import Asset
+from app.services.asset_index import AssetIndex
+from app.services.context_builder import ContextBuilder
+from app.utils.embeddings import HashingEmbedder
+from app.utils.vector_index import VectorIndex
+
+
+def _asset(asset_id: str, filename: str, project_id: str = "proj_001", **metadata) -> Asset:
+    return Asset(
+        id=asset_id,
+        project_id=project_id,
+        path=f"assets/{filename}",
+        type="image",
+        consent_hash="consent",
+        asset_metadata={"original_filename": filename, **metadata},
+        updated_at=datetime(2026, 1, 1),
+    )
+
+
+class TestVectorIndex:
+    """Test exact and IVF top-k search"""
+
+    def test_exact_search(self):
+        index = VectorIndex(dim=2)
+        index.add(["x", "y", "xy"], np.array([[1, 0], [0, 1], [0.6, 0.8]]))
+        assert [key for key, _ in index.search(np.array([0.0, 1.0]), 2)] == ["y", "xy"]
+
+        index.add(["y"], np.array([[-1.0, 0.0]]))
+        index.remove("xy")
+        assert [key for key, _ in index.search(np.array([0.0, 1.0]), 3)] == ["x", "y"]
+        assert len(index) == 2
+
+    def test_ivf_search_finds_neighbours_fast(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(20_000, 64)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index = VectorIndex(dim=64, nprobe=16)
+        index.add(list(range(len(vectors))), vectors)
+
+        queries = vectors[:50] + rng.normal(scale=0.05, size=(50, 64)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        index.search(queries[0], 10)  # Clusters the index
+        start = time.perf_counter()
+        found = [index.search(query, 10)[0][0] for query in queries]
+        per_query = (time.perf_counter() - start) / len(queries)
+
+        assert index._centroids is not None
+        assert sum(key == i for i, key in enumerate(found)) >= 45
+        assert per_query < 0.01
+
+        index.add(["new"], queries[:1])
+        assert index.search(queries[0], 1)[0][0] == "new"
+
+
+class TestAssetIndex:
+    """Test retrieving project assets for prompts"""
+
+    def test_retrieves_relevant_assets_and_tracks_changes(self, test_db_session):
+        test_db_session.add_all(
+            [
+                _asset("lava", "lava_floor.png"),
+                _asset("knight", "hero_sprite.png", tags=["knight", "armor"]),
+                _asset("tree", "oak_tree.png"),
+                _asset("other", "lava_rock.png", project_id="other"),
+            ]
+        )
+        test_db_session.commit()
+        index = AssetIndex(embedder=HashingEmbedder())
+
+        found = index.search(test_db_session, "proj_001", "a knight crossing lava", k=2)
+        assert {asset["id"] for asset in found} == {"lava", "knight"}
+        assert index.search(test_db_session, "proj_001", "xyzzy", k=2, min_score=0.2) == []
+
+        tree = test_db_session.get(Asset, "tree")
+        tree.asset_metadata = {"original_filename": "lava_tree.png"}
+        tree.updated_at = datetime(2026, 1, 1) + timedelta(days=1)
+        test_db_session.delete(test_db_session.get(Asset, "knight"))
+        test_db_session.commit()
+
+        found = index.search(test_db_session, "proj_001", "lava", k=5, min_score=0.2)
+        assert {asset["id"] for asset in found} == {"lava", "tree"}
+
+    def test_deletions_do_not_embed_again(self, test_db_session):
+        test_db_session.add_all([_asset(f"a{i}", f"asset_{i}.png") for i in range(20)])
+        test_db_session.commit()
+        embedder = HashingEmbedder()
+        index = AssetIndex(embedder=embedder)
+        index.search(test_db_session, "proj_001", "asset", k=3)
+
+        test_db_session.delete(test_db_session.get(Asset, "a7"))
+        test_db_session.commit()
+        embedded = []
+        embed = embedder.embed
+        embedder.embed = lambda texts: embedded.extend(texts) or embed(texts)
+
+        found = index.search(test_db_session, "proj_001", "asset_7", k=20)
+        assert "a7" not in {asset["id"] for asset in found}
+        assert len(found) == 19
+        # Only the query
+        assert len(embedded) == 1
+
+    def test_prompts_are_embedded_together(self, test_db_session):
+        test_db_session.add_all([_asset("lava", "lava_floor.png"), _asset("tree", "oak_tree.png")])
+        test_db_session.commit()
+        embedder = HashingEmbedder()
+        calls = []
+        embed = embedder.embed
+        embedder.embed = lambda texts: calls.append(texts) or embed(texts)
+        index = AssetIndex(embedder=embedder)
+
+        changes = index.changes(test_db_session, "proj_001")
+        found = index.search_many("proj_001", changes, ["lava", "oak tree", ""], k=1)
+
+        assert [asset["id"] for asset in found["lava"]] == ["lava"]
+        assert [asset["id"] for asset in found["oak tree"]] == ["tree"]
+        assert found[""] == []
+        # The assets, then every prompt at once
+        assert calls[1] == ["lava", "oak tree"]
+        assert index.changes(test_db_session, "proj_001") is None
+
+    def test_related_assets_follow_requested_ones(self):
+        requested = {"id": "door", "type": "image", "metadata": {"original_filename": "door.png"}}
+        related = [
+            {"id": "lava", "type": "image", "metadata": {"original_filename": "lava.png"}},
+            requested,
+        ]
+        context = ContextBuilder().build_generation_prompt(
+            "a lava cave", "proj_001", assets=[requested], related_assets=related
+        )
+        assert [asset["id"] for asset in context["assets"]] == ["door", "lava"]
+        assert context["asset_count"] == 1
+        assert "incorporate 2 available assets" in context["engineered_prompt"]
@@ -0,0 +1,89 @@
+"""
+Unit tests for the asset summary cache
+"""
+
+from datetime import datetime
+
+import pytest
+from app.models.core_models import Asset
+from app.services.asset_summaries import AssetSummaryCache, asset_summaries
+from app.services.context_builder import ContextBuilder
+from app.services.generation_jobs import fetch_assets
+from sqlalchemy import event
+
+
+def _asset(asset_id: str, project_id: str = "proj_001", **metadata) -> Asset:
+    return Asset(
+        id=asset_id,
+        project_id=project_id,
+        path=f"assets/{asset_id}.png",
+        type="image",
+        consent_hash="consent",
+        asset_metadata={"original_filename": f"{asset_id}.png", "width": 32, **metadata},
+        updated_at=datetime(2026, 1, 1),
+    )
+
+
+@pytest.fixture
+def statements(test_db_engine):
+    """SQL statements run against the test database"""
+    seen = []
+
+    def record(_conn, _cursor, statement, *_):
+        seen.append(statement)
+
+    event.listen(test_db_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(test_db_engine, "before_cursor_execute", record)
+
+
+class TestAssetSummaryCache:
+    """Test summarizing and fetching assets by version"""
+
+    def test_summary_is_compact_and_cached(self):
+        cache = AssetSummaryCache()
+        asset = _asset("door", tags=["wood"], exif={"camera": "x"}).to_dict()
+        summary = cache.summarize(asset)
+
+        assert summary.asset["metadata"] == {"width": 32}
+        assert summary.asset["tags"] == ["wood"]
+        assert summary.line == "- door.png (image, id door): width=32"
+        assert {"door", "png", "image", "wood"} <= summary.words
+        assert cache.summarize(dict(asset)) is summary
+        # A summary's own dict maps back to the same summary
+        assert cache.summarize(summary.asset) is summary
+        assert cache.stats == {"hits": 2, "misses": 1}
+
+    def test_new_version_gets_new_summary(self):
+        cache = AssetSummaryCache()
+        asset = _asset("door").to_dict()
+        first = cache.summarize(asset)
+        changed = {**asset, "updated_at": "2026-02-01T00:00:00", "metadata": {"width": 64}}
+        assert cache.summarize(changed).asset["metadata"] == {"width": 64}
+        assert cache.summarize(asset) is first
+
+    def test_fetch_loads_only_misses(self, test_db_session, statements):
+        test_db_session.add_all([_asset("a"), _asset("b"), _asset("c", project_id="other")])
+        test_db_session.commit()
+        asset_summaries.clear()
+        asset_summaries.refresh(test_db_session.get(Asset, "a"))
+
+        statements.clear()
+        assets = fetch_assets(test_db_session, "proj_001", ["b", "a", "c", "missing"])
+        assert [asset["id"] for asset in assets] == ["b", "a"]
+        assert len(statements) == 2
+
+        statements.clear()
+        again = fetch_assets(test_db_session, "proj_001", ["b", "a"])
+        assert again == assets and again[0] is assets[0]
+        assert len(statements) == 1
+
+    def test_context_reuses_summaries(self):
+        asset_summaries.clear()
+        asset = asset_summaries.summarize(_asset("lava_tile").to_dict()).asset
+        context = ContextBuilder().build_generation_prompt(
+            "a lava cave", "proj_001", assets=[asset]
+        )
+        assert context["assets"] == [asset]
+        assert context["assets"][0] is asset
+        assert "- lava_tile.png (image, id lava_tile): width=32" in context["engineered_prompt"]
@@ -0,0 +1,116 @@
+"""
+Unit tests for batch generation and inference micro-batching
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.config import settings
+from app.models.core_models import GenerationLog, Scene
+from app.models.scene_version import SceneVersion
+from app.services.inference_client import InferenceClient
+
+
+def _contexts(count: int) -> list[dict]:
+    return [{"user_prompt": f"simple level {i}", "prompt_hash": f"hash_{i}"} for i in range(count)]
+
+
+@pytest.fixture
+def client():
+    client = InferenceClient()
+    client.use_local_model = True
+    client.micro_batch_size = 8
+    return client
+
+
+class TestMicroBatching:
+    """Test grouping of prompts into model requests"""
+
+    def test_prompts_are_grouped(self, client):
+        async def model_batch(contexts, _model_version=None):
+            return [{"id": context["prompt_hash"]} for context in contexts]
+
+        with (
+            patch.object(client, "_call_local_model_batch", side_effect=model_batch) as batch,
+            patch.object(client, "_call_local_model", AsyncMock(return_value={"id": "hash_16"})),
+        ):
+            results = asyncio.run(client.generate_scenes(_contexts(17)))
+
+        # Two batched requests of 8, and the last prompt on its own
+        assert [len(call.args[0]) for call in batch.call_args_list] == [8, 8]
+        assert [result["scene"]["id"] for result in results] == [f"hash_{i}" for i in range(17)]
+        assert {result["metadata"]["status"] for result in results} == {"success"}
+        assert client.stats["micro_batches"] == 3
+        assert client.stats["total_requests"] == 17
+
+    def test_batch_size_comes_from_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "model_micro_batch_size", 3)
+        assert InferenceClient().micro_batch_size == 3
+
+    def test_failed_micro_batch_falls_back(self, client):
+        with patch.object(
+            client, "_call_local_model_batch", AsyncMock(side_effect=RuntimeError("bad reply"))
+        ):
+            results = asyncio.run(client.generate_scenes(_contexts(3)))
+
+        assert all(result["metadata"]["status"] == "fail_fallback" for result in results)
+        assert all(result["metadata"]["fallback_sample"] for result in results)
+        assert results[0]["metadata"]["fallback_reason"] == "bad reply"
+        assert client.stats["fallback_uses"] == 3
+
+
+class TestBatchEndpoint:
+    """Test POST /api/generation/batch"""
+
+    def test_variations_are_saved_together(self, test_client, test_db_session):
+        response = test_client.post(
+            "/api/generation/batch",
+            json={"prompts": ["simple platform", "forest"], "variations": 3, "project_id": "p1"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 6
+        assert [item["prompt"] for item in data["items"]] == ["simple platform"] * 3 + [
+            "forest"
+        ] * 3
+        assert len({item["scene_id"] for item in data["items"]}) == 6
+        assert all(item["scene"]["project_id"] == "p1" for item in data["items"])
+        assert all("postprocessing" in item["metadata"] for item in data["items"])
+
+        logs = test_db_session.query(GenerationLog).all()
+        scenes = test_db_session.query(Scene).all()
+        assert len(logs) == 6 and len(scenes) == 6
+        assert {scene.generation_log_id for scene in scenes} == {log.id for log in logs}
+        assert {log.request_payload["batch_id"] for log in logs} == {data["batch_id"]}
+        assert test_db_session.query(SceneVersion).count() == 6
+
+    def test_batches_do_not_share_scenes(self, test_client, test_db_session):
+        """Scene IDs repeated across batches never bring back an earlier batch's scene"""
+        for project_id in ("p1", "p2"):
+            response = test_client.post(
+                "/api/generation/batch",
+                json={"prompts": ["simple platform"], "variations": 2, "project_id": project_id},
+            )
+            assert response.status_code == 200
+            items = response.json()["items"]
+            assert all(item["scene"]["project_id"] == project_id for item in items)
+
+        scenes = test_db_session.query(Scene).filter(Scene.project_id == "p2").all()
+        for scene in scenes:
+            stored = test_client.get(f"/api/scenes/{scene.id}").json()
+            assert stored["project_id"] == "p2"
+
+    def test_batch_size_is_capped(self, test_client, monkeypatch):
+        monkeypatch.setattr(settings, "generation_batch_max_size", 4)
+        response = test_client.post(
+            "/api/generation/batch",
+            json={"prompts": ["a", "b"], "variations": 3, "project_id": "p1"},
+        )
+        assert response.status_code == 422
+
+    def test_empty_batch_is_rejected(self, test_client):
+        response = test_client.post(
+            "/api/generation/batch", json={"prompts": [], "project_id": "p1"}
+        )
+        assert response.status_code == 422
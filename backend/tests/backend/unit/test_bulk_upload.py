@@ -0,0 +1,168 @@
+"""
+Unit tests for bulk asset upload processing
+"""
+
+import io
+import tarfile
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services import asset_service
+from app.services.job_registry import JOB_COMPLETED, JOB_FAILED, JobRegistry
+from PIL import Image
+
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), color="red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def zip_archive(tmp_path):
+    """Zip archive with two assets, a hidden file and a traversal attempt"""
+    path = tmp_path / "art.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("sprites/hero.png", _png_bytes())
+        archive.writestr("audio/jump.wav", b"RIFF0000WAVE")
+        archive.writestr("sprites/.DS_Store", b"junk")
+        archive.writestr("../escape.png", _png_bytes())
+    return str(path)
+
+
+@pytest.fixture
+def tar_archive(tmp_path):
+    """Gzipped tar archive with one asset"""
+    path = tmp_path / "art.tar.gz"
+    data = _png_bytes()
+    with tarfile.open(path, "w:gz") as archive:
+        info = tarfile.TarInfo("tiles/grass.png")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+class TestEntrySanitizing:
+    """Test archive entry name sanitizing"""
+
+    @pytest.mark.parametrize(
+        "name",
+        ["/etc/passwd", "../secret.png", "a/../../b.png", ".hidden.png", "__MACOSX/x.png"],
+    )
+    def test_rejects_unsafe_names(self, name):
+        """Unsafe or metadata entries are skipped"""
+        assert asset_service._sanitize_entry_name(name) is None
+
+    def test_normalizes_windows_separators(self):
+        """Backslash paths are converted to relative posix paths"""
+        assert asset_service._sanitize_entry_name("tiles\\grass.png") == "tiles/grass.png"
+
+    def test_archive_detection(self):
+        """Archives are detected by suffix or content type"""
+        assert asset_service.is_archive("pack.tar.gz")
+        assert asset_service.is_archive("pack.bin", "application/zip")
+        assert not asset_service.is_archive("hero.png", "image/png")
+
+
+class TestEntryIteration:
+    """Test lazy extraction of uploaded parts"""
+
+    def test_zip_entries(self, zip_archive):
+        """Only safe regular files are yielded from zip archives"""
+        entries = list(asset_service.iter_upload_entries([("art.zip", zip_archive, None)]))
+        names = sorted(name for name, _, _ in entries)
+        assert names == ["audio/jump.wav", "sprites/hero.png"]
+
+    def test_tar_entries(self, tar_archive):
+        """Tar archives are streamed entry by entry"""
+        entries = list(asset_service.iter_upload_entries([("art.tar.gz", tar_archive, None)]))
+        assert [(name, content_type) for name, content_type, _ in entries] == [
+            ("tiles/grass.png", "image/png")
+        ]
+
+    def test_oversized_entries_are_not_read(self, zip_archive):
+        """Entries over the size limit are yielded without data"""
+        with patch.object(asset_service.settings, "max_upload_size", 8):
+            entries = list(asset_service.iter_upload_entries([("art.zip", zip_archive, None)]))
+        assert all(data is None for _, _, data in entries)
+
+
+class TestProcessBulkUpload:
+    """Test the bulk upload background job"""
+
+    @pytest.mark.asyncio
+    async def test_imports_all_entries_in_one_transaction(self, zip_archive):
+        """All assets are uploaded and inserted with a single commit"""
+        registry = JobRegistry()
+        job = registry.create("bulk_upload")
+        session = MagicMock()
+
+        with (
+            patch.object(asset_service, "job_registry", registry),
+            patch.object(asset_service, "upload_file_to_storage", return_value=True) as upload,
+            patch.object(asset_service, "_ensure_bucket_exists"),
+            patch.object(asset_service, "SessionLocal", return_value=session),
+            patch.object(asset_service, "extract_metadata_task") as extract,
+        ):
+            await asset_service.process_bulk_upload(
+                job["job_id"], "proj_001", [("art.zip", zip_archive, None)], tags=["forest"]
+            )
+
+        result = registry.get(job["job_id"])
+        assert result["status"] == JOB_COMPLETED
+        assert result["processed"] == 2
+        assert len(result["result"]["asset_ids"]) == 2
+        assert upload.call_count == 2
+        session.add_all.assert_called_once()
+        session.commit.assert_called_once()
+        # Only the audio asset needs background metadata extraction
+        extract.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_entries_are_reported(self, zip_archive):
+        """Storage failures are recorded per entry without failing the job"""
+        registry = JobRegistry()
+        job = registry.create("bulk_upload")
+
+        with (
+            patch.object(asset_service, "job_registry", registry),
+            patch.object(asset_service, "upload_file_to_storage", return_value=False),
+            patch.object(asset_service, "_ensure_bucket_exists"),
+            patch.object(asset_service, "SessionLocal") as session_factory,
+        ):
+            await asset_service.process_bulk_upload(
+                job["job_id"], "proj_001", [("art.zip", zip_archive, None)]
+            )
+
+        result = registry.get(job["job_id"])
+        assert result["status"] == JOB_COMPLETED
+        assert result["failed"] == 2
+        assert len(result["errors"]) == 2
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_broken_archive_removes_uploaded_objects(self):
+        """Objects uploaded before an archive turns out corrupt are deleted"""
+        registry = JobRegistry()
+        job = registry.create("bulk_upload")
+
+        def entries(_sources):
+            yield "a.png", "image/png", _png_bytes()
+            yield "b.png", "image/png", _png_bytes()
+            raise EOFError("truncated archive")
+
+        with (
+            patch.object(asset_service, "job_registry", registry),
+            patch.object(asset_service, "iter_upload_entries", entries),
+            patch.object(asset_service, "upload_file_to_storage", return_value=True) as upload,
+            patch.object(asset_service, "delete_file_from_storage") as delete,
+            patch.object(asset_service, "_ensure_bucket_exists"),
+            patch.object(asset_service, "SessionLocal") as session_factory,
+        ):
+            await asset_service.process_bulk_upload(job["job_id"], "proj_001", [])
+
+        assert registry.get(job["job_id"])["status"] == JOB_FAILED
+        uploaded = {call.kwargs["object_name"] for call in upload.call_args_list}
+        assert {call.args[1] for call in delete.call_args_list} == uploaded
+        session_factory.assert_not_called()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the model circuit breaker
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from app.services.inference_client import InferenceClient, inference_client
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from fastapi.testclient import TestClient
+
+
+def _fail(breaker: CircuitBreaker, error: type[BaseException] = ConnectionError):
+    with pytest.raises(error), breaker.guard():
+        raise error("down")
+
+
+class TestCircuitBreaker:
+    """Test state transitions of the breaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        _fail(breaker)
+        _fail(breaker)
+        with breaker.guard():
+            pass
+        _fail(breaker)
+        _fail(breaker)
+        assert breaker.state == "closed"
+        _fail(breaker, TimeoutError)
+        assert breaker.state == "open"
+
+        with pytest.raises(CircuitOpenError), breaker.guard():
+            pytest.fail("called while open")
+        snapshot = breaker.snapshot()
+        assert snapshot["opened"] == 1 and snapshot["short_circuited"] == 1
+        assert 0 < snapshot["retry_in"] <= 60
+
+    def test_other_errors_are_not_counted(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        _fail(breaker, ValueError)
+        assert breaker.state == "closed" and breaker.failures == 0
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        _fail(breaker)
+        time.sleep(0.02)
+        assert breaker.snapshot()["state"] == "half_open"
+
+        # A failed trial re-opens the circuit
+        _fail(breaker)
+        assert breaker.state == "open"
+        time.sleep(0.02)
+
+        # Only one trial call at a time, and its success closes the circuit
+        with breaker.guard(), pytest.raises(CircuitOpenError), breaker.guard():
+            pass
+        assert breaker.snapshot()["state"] == "closed"
+        assert breaker.stats["opened"] == 2
+
+
+class TestInferenceCircuit:
+    """Test that an open circuit falls back without calling the model"""
+
+    def test_open_circuit_skips_model(self):
+        client = InferenceClient()
+        client.use_local_model = True
+        client.pool.endpoints[0].breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        calls = 0
+
+        async def unreachable(*_):
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("Cannot connect to model")
+
+        client._request_model = unreachable
+
+        async def run():
+            return [await client.generate_scene({"user_prompt": "simple level"}) for _ in range(5)]
+
+        results = asyncio.run(run())
+        assert calls == 2
+        assert [result["metadata"]["status"] for result in results] == ["fail_fallback"] * 5
+        assert results[-1]["metadata"]["fallback_reason"].startswith("Circuit open")
+        assert results[-1]["metadata"]["latency_ms"] < 50
+
+        status = client.get_model_status()
+        assert status["status"] == "degraded"
+        breaker = status["routing"]["endpoints"][0]["circuit_breaker"]
+        assert breaker["state"] == "open"
+        assert breaker["opened"] == 1
+
+    def test_health_reports_open_circuit(self, test_db_session, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        _fail(breaker)
+        monkeypatch.setattr(inference_client.pool.endpoints[0], "breaker", breaker)
+        monkeypatch.setattr(settings, "use_local_model", True)
+        app.dependency_overrides[get_db] = lambda: test_db_session
+        try:
+            response = TestClient(app).get("/health")
+        finally:
+            app.dependency_overrides.clear()
+
+        inference = response.json()["services"]["inference"]
+        assert inference["status"] == "fallback"
+        assert inference["circuit_breaker"] == "open"
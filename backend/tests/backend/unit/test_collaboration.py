@@ -0,0 +1,280 @@
+"""
+Unit tests for real-time collaborative scene editing
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from app.services.collaboration import (
+    SceneChannel,
+    Submission,
+    Subscriber,
+    assign_entity_ids,
+    coalesce_operations,
+    collaboration_hub,
+)
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+
+def _scene() -> dict:
+    return {
+        "id": "scene_live",
+        "name": "Live",
+        "style": "platformer",
+        "entities": [
+            {
+                "id": f"platform_{i}",
+                "type": "platform",
+                "position": {"x": i * 200.0, "y": 500.0},
+                "size": {"width": 100.0, "height": 20.0},
+            }
+            for i in range(5)
+        ],
+    }
+
+
+class TestCoalesceOperations:
+    """Test merging of rapid updates"""
+
+    def test_drag_collapses_to_one_update(self):
+        operations = [
+            {"op": "update", "id": "a", "changes": {"position": {"x": float(i)}}} for i in range(50)
+        ]
+        operations.insert(10, {"op": "update", "id": "a", "changes": {"position": {"y": 3.0}}})
+        assert coalesce_operations(operations) == [
+            {"op": "update", "id": "a", "changes": {"position": {"x": 49.0, "y": 3.0}}}
+        ]
+
+    def test_add_and_remove_end_a_run(self):
+        operations = [
+            {"op": "update", "id": "a", "changes": {"name": "one"}},
+            {"op": "update", "id": "b", "changes": {"name": "b"}},
+            {"op": "remove", "id": "a"},
+            {"op": "add", "entity": {"id": "a", "type": "item"}},
+            {"op": "update", "id": "a", "changes": {"name": "two"}},
+            {"op": "update", "id": "b", "changes": {"name": "b2"}},
+        ]
+        assert coalesce_operations(operations) == [
+            {"op": "update", "id": "a", "changes": {"name": "one"}},
+            {"op": "update", "id": "b", "changes": {"name": "b2"}},
+            {"op": "remove", "id": "a"},
+            {"op": "add", "entity": {"id": "a", "type": "item"}},
+            {"op": "update", "id": "a", "changes": {"name": "two"}},
+        ]
+
+
+class TestAssignEntityIds:
+    """Test IDs given to added entities before operations are relayed"""
+
+    def test_only_missing_ids_are_assigned(self):
+        operations = [
+            {"op": "add", "entity": {"type": "coin"}},
+            {"op": "add", "entity": {"id": "kept", "type": "coin"}},
+            {"op": "update", "id": "other", "changes": {}},
+        ]
+        assign_entity_ids(operations)
+        assert operations[0]["entity"]["id"].startswith("entity_")
+        assert operations[1]["entity"]["id"] == "kept"
+        assert "entity" not in operations[2]
+
+
+class TestSubscriber:
+    """Test per-subscriber backpressure"""
+
+    def test_overflow_drops_backlog_and_signals_close(self, monkeypatch):
+        monkeypatch.setattr(settings, "collab_max_queue", 2)
+
+        async def scenario():
+            subscriber = Subscriber(client_id="slow")
+            assert subscriber.offer("1") and subscriber.offer("2")
+            assert not subscriber.offer("3")
+            assert not subscriber.offer("4")
+            return [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+
+        assert asyncio.run(scenario()) == [None]
+
+
+class _FlakyHub:
+    """Hub whose first save fails"""
+
+    def __init__(self):
+        self.failures = 1
+        self.saved: list[dict] = []
+        self.discarded = False
+
+    def load_scene(self, _scene_id):
+        return _scene(), 1
+
+    def save_scene(self, _scene_id, scene_data, base_version, _unsaved):
+        if self.failures:
+            self.failures -= 1
+            return None
+        self.saved.append(scene_data)
+        return base_version + 1, scene_data
+
+    def discard(self, _channel):
+        self.discarded = True
+
+
+class TestSceneChannel:
+    """Test a channel's saves without the WebSocket layer"""
+
+    def test_failed_save_is_retried_after_last_leave(self, monkeypatch):
+        monkeypatch.setattr(settings, "collab_tick_rate", 100)
+        monkeypatch.setattr(settings, "collab_persist_interval", 0.01)
+        hub = _FlakyHub()
+        update = {"op": "update", "id": "platform_0", "changes": {"position": {"x": 7.0}}}
+
+        async def scenario():
+            channel = SceneChannel(hub, "scene_live")
+            subscriber = await channel.join()
+            channel.submit(Submission(subscriber.client_id, 1, [update]))
+            await channel.leave(subscriber)
+            assert not hub.saved and not hub.discarded
+            for _ in range(200):
+                if hub.discarded:
+                    break
+                await asyncio.sleep(0.01)
+            return channel
+
+        channel = asyncio.run(scenario())
+        assert hub.discarded
+        assert len(hub.saved) == 1
+        assert hub.saved[0]["entities"][0]["position"]["x"] == 7.0
+        assert channel.version == 2
+
+
+class TestLiveEditing:
+    """Test the /api/scenes/{id}/live WebSocket channel"""
+
+    @pytest.fixture
+    def client(self, test_db_engine, monkeypatch):
+        monkeypatch.setattr(settings, "mock_mode", True)  # skip database init in lifespan
+        monkeypatch.setattr(settings, "collab_tick_rate", 10)
+        monkeypatch.setattr(settings, "collab_persist_interval", 60.0)
+        session_factory = sessionmaker(bind=test_db_engine)
+        monkeypatch.setattr(collaboration_hub, "session_factory", session_factory)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as client:
+            yield client
+        app.dependency_overrides.clear()
+
+    def _receive_until_ack(self, websocket, client_id, client_seq) -> list[dict]:
+        batches = []
+        while True:
+            message = websocket.receive_json()
+            if message["type"] == "batch":
+                batches.append(message)
+                if message["acks"].get(client_id) == client_seq:
+                    return batches
+
+    def test_edits_are_broadcast_coalesced_and_saved(self, client):
+        scene_id = client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": _scene()}
+        ).json()["id"]
+
+        with (
+            client.websocket_connect(f"/api/scenes/{scene_id}/live") as alice,
+            client.websocket_connect(f"/api/scenes/{scene_id}/live") as bob,
+        ):
+            alice_snapshot = alice.receive_json()
+            bob_snapshot = bob.receive_json()
+            assert alice_snapshot["type"] == bob_snapshot["type"] == "snapshot"
+            assert bob_snapshot["scene"] == _scene()
+            alice_id = alice_snapshot["client_id"]
+
+            for step in range(1, 21):
+                alice.send_json(
+                    {
+                        "type": "ops",
+                        "client_seq": step,
+                        "operations": [
+                            {
+                                "op": "update",
+                                "id": "platform_0",
+                                "changes": {"position": {"x": float(step)}},
+                            }
+                        ],
+                    }
+                )
+
+            batches = self._receive_until_ack(bob, alice_id, 20)
+            updates = [op for batch in batches for op in batch["operations"]]
+            assert len(updates) < 20
+            assert updates[-1]["changes"]["position"] == {"x": 20.0}
+            seqs = [batch["seq"] for batch in batches]
+            assert seqs == sorted(seqs)
+
+            bob.send_json({"type": "ops", "client_seq": 1, "operations": [{"op": "remove"}]})
+            error = bob.receive_json()
+            while error["type"] != "error":
+                error = bob.receive_json()
+            assert error["client_seq"] == 1
+            bob.send_json({"type": "hello"})
+            assert bob.receive_json()["type"] == "error"
+
+        # The last subscriber leaving persists the edits as a new version; the
+        # server may still be doing so after the client side has disconnected
+        deadline = time.monotonic() + 5
+        while scene_id in collaboration_hub._channels and time.monotonic() < deadline:
+            time.sleep(0.01)
+        latest = client.get(f"/api/scenes/{scene_id}")
+        assert latest.headers["x-scene-version"] == "2"
+        assert latest.json()["entities"][0]["position"] == {"x": 20.0, "y": 500.0}
+
+    def _wait_for_close(self, scene_id):
+        deadline = time.monotonic() + 5
+        while scene_id in collaboration_hub._channels and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_edits_made_outside_the_session_are_kept(self, client):
+        scene_id = client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": _scene()}
+        ).json()["id"]
+
+        with client.websocket_connect(f"/api/scenes/{scene_id}/live") as alice:
+            alice_id = alice.receive_json()["client_id"]
+            alice.send_json(
+                {
+                    "type": "ops",
+                    "client_seq": 1,
+                    "operations": [
+                        {"op": "update", "id": "platform_0", "changes": {"position": {"x": 1.0}}}
+                    ],
+                }
+            )
+            self._receive_until_ack(alice, alice_id, 1)
+
+            edited = client.patch(
+                f"/api/scenes/{scene_id}",
+                json={"operations": [{"op": "remove", "id": "platform_4"}]},
+            )
+            assert edited.status_code == 200
+
+        self._wait_for_close(scene_id)
+        latest = client.get(f"/api/scenes/{scene_id}")
+        assert latest.headers["x-scene-version"] == "3"
+        entities = {entity["id"]: entity for entity in latest.json()["entities"]}
+        assert "platform_4" not in entities
+        assert entities["platform_0"]["position"]["x"] == 1.0
+
+    def test_unknown_scene_is_rejected(self, client):
+        with (
+            pytest.raises(WebSocketDisconnect),
+            client.websocket_connect("/api/scenes/missing/live") as websocket,
+        ):
+            websocket.receive_json()
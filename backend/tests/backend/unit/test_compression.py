@@ -0,0 +1,166 @@
+"""
+Unit tests for response compression and precompressed scenes
+"""
+
+import gzip
+
+import pytest
+from app.main import app
+from app.services.scene_cache import SceneCache, scene_cache
+from app.utils.compression import (
+    SUPPORTED_ENCODINGS,
+    CompressionMiddleware,
+    compress,
+    negotiate_encoding,
+)
+from app.utils.serialization import loads
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        import brotli
+
+        return brotli.decompress(data)
+    import zstandard
+
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class TestNegotiation:
+    """Test Accept-Encoding negotiation"""
+
+    def test_no_header_means_identity(self):
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("identity") is None
+
+    def test_server_preference_breaks_ties(self):
+        assert negotiate_encoding("gzip, br, zstd", ("zstd", "br", "gzip")) == "zstd"
+        assert negotiate_encoding("gzip, br", ("zstd", "br", "gzip")) == "br"
+
+    def test_q_values(self):
+        available = ("zstd", "br", "gzip")
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+        assert negotiate_encoding("*;q=0.1, br;q=0", available) == "zstd"
+        assert negotiate_encoding("gzip;q=0", available) is None
+        assert negotiate_encoding("gzip;q=bogus, br", available) == "br"
+
+    def test_only_available_encodings(self):
+        assert negotiate_encoding("br, deflate", ("gzip",)) is None
+
+
+class TestCompress:
+    """Test the content codecs"""
+
+    @pytest.mark.parametrize("encoding", SUPPORTED_ENCODINGS)
+    def test_round_trip(self, encoding):
+        data = b'{"entities": []}' * 200
+        for precompress in (False, True):
+            compressed = compress(data, encoding, precompress=precompress)
+            assert len(compressed) < len(data)
+            assert _decompress(compressed, encoding) == data
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            compress(b"data", "deflate")
+
+
+class TestCompressionMiddleware:
+    """Test on-the-fly response compression"""
+
+    @pytest.fixture
+    def client(self):
+        test_app = FastAPI()
+        test_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+        @test_app.get("/large")
+        def large():
+            return JSONResponse({"items": ["entity"] * 500})
+
+        @test_app.get("/small")
+        def small():
+            return JSONResponse({"ok": True})
+
+        @test_app.get("/stream")
+        def stream():
+            return StreamingResponse(
+                iter([b"x" * 1000, b"y" * 1000]), media_type="application/json"
+            )
+
+        return TestClient(test_app)
+
+    def test_large_json_is_compressed(self, client):
+        with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-length"] == str(len(raw))
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert loads(gzip.decompress(raw)) == {"items": ["entity"] * 500}
+
+    def test_small_and_streamed_responses_pass_through(self, client):
+        headers = {"Accept-Encoding": "gzip"}
+        assert "content-encoding" not in client.get("/small", headers=headers).headers
+        response = client.get("/stream", headers=headers)
+        assert "content-encoding" not in response.headers
+        assert response.content == b"x" * 1000 + b"y" * 1000
+
+    def test_identity_when_not_accepted(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+
+class TestPrecompressedScenes:
+    """Test scenes compressed once and served as stored"""
+
+    def test_cache_stores_every_encoding(self):
+        cache = SceneCache(max_bytes=1024 * 1024)
+        scene = {"entities": [{"id": f"e{i}", "type": "platform"} for i in range(200)]}
+        first = cache.serialize("scene_1", scene, version=1)
+        assert first.encodings == {}
+
+        entry = cache.serialize("scene_1", scene, version=1, precompress=True)
+        assert set(entry.encodings) == set(SUPPORTED_ENCODINGS)
+        assert entry.json == first.json
+        assert cache.serialize("scene_1", scene, version=1) is entry
+        for encoding, data in entry.encodings.items():
+            assert _decompress(data, encoding) == entry.json
+
+        assert entry.body_for("gzip") == (entry.encodings["gzip"], "gzip")
+        assert entry.body_for(None) == (entry.json, None)
+
+    @pytest.mark.parametrize("encoding", SUPPORTED_ENCODINGS)
+    def test_sample_is_served_precompressed(self, encoding):
+        client = TestClient(app)
+        plain = client.get("/api/generation/samples/sample_simple_geometry")
+        assert plain.status_code == 200
+
+        with client.stream(
+            "GET",
+            "/api/generation/samples/sample_simple_geometry",
+            headers={"Accept-Encoding": encoding},
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"] == plain.headers["etag"]
+        assert loads(_decompress(raw, encoding)) == plain.json()
+
+    def test_saved_scene_is_compressed_on_first_read(self, test_client):
+        scene = {"id": "s", "entities": [{"id": f"e{i}", "type": "platform"} for i in range(200)]}
+        created = test_client.post(
+            "/api/scenes/", json={"project_id": "p1", "scene_data": scene}
+        ).json()
+        assert scene_cache.get(created["id"], 1).encodings == {}
+
+        with test_client.stream(
+            "GET", f"/api/scenes/{created['id']}", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["content-encoding"] == "gzip"
+        assert loads(gzip.decompress(raw)) == scene
+        assert set(scene_cache.get(created["id"], 1).encodings) == set(SUPPORTED_ENCODINGS)
@@ -0,0 +1,56 @@
+"""
+Unit tests for token-budgeted prompt context
+"""
+
+from app.services.context_builder import ContextBuilder
+from app.utils.tokens import count_tokens
+
+
+def _asset(i: int, filename: str, **metadata) -> dict:
+    return {
+        "id": f"asset_{i}",
+        "type": "image",
+        "updated_at": "2026-01-01T00:00:00",
+        "metadata": {"original_filename": filename, "width": 64, "height": 64, **metadata},
+    }
+
+
+ASSETS = [_asset(i, f"tile_{i:04}.png") for i in range(300)] + [
+    _asset(300, "lava_tile.png"),
+    _asset(301, "hero.png", tags=["castle", "knight"]),
+]
+
+
+class TestContextBudget:
+    """Test ranking and packing assets into the prompt"""
+
+    def test_prompt_stays_within_budget(self):
+        builder = ContextBuilder()
+        builder.max_context_length = 600
+        context = builder.build_generation_prompt(
+            "castle level with a lava pit", "proj_001", assets=ASSETS
+        )
+
+        prompt = context["engineered_prompt"]
+        prefix_tokens = count_tokens(context["prompt_prefix"])
+        assert abs(context["prompt_tokens"] - prefix_tokens - count_tokens(prompt)) <= 2
+        assert context["prompt_tokens"] <= 600
+        assert context["asset_count"] == 302
+        assert 0 < len(context["assets"]) < 302
+        assert f"incorporate {len(context['assets'])} available assets" in prompt
+        assert prompt.count("\n- ") == len(context["assets"])
+
+    def test_most_relevant_assets_come_first(self):
+        context = ContextBuilder().build_generation_prompt(
+            "castle level with a lava pit", "proj_001", assets=ASSETS
+        )
+        assert [asset["id"] for asset in context["assets"][:2]] == ["asset_300", "asset_301"]
+        assert context["assets"][0]["metadata"] == {"width": 64, "height": 64}
+
+    def test_no_room_for_assets(self):
+        builder = ContextBuilder()
+        builder.max_context_length = 10
+        context = builder.build_generation_prompt("castle level", "proj_001", assets=ASSETS)
+        assert context["assets"] == []
+        assert "Available assets" not in context["engineered_prompt"]
+        assert "incorporate" not in context["engineered_prompt"]
@@ -0,0 +1,84 @@
+"""
+Unit tests for model endpoint balancing and hedging
+"""
+
+import asyncio
+
+import pytest
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.endpoint_pool import Endpoint, EndpointPool
+from app.utils.limiter import AdaptiveLimiter
+
+
+def _endpoint(url: str, health: float = 1.0) -> Endpoint:
+    endpoint = Endpoint(url, limiter=AdaptiveLimiter(), breaker=CircuitBreaker(failure_threshold=1))
+    endpoint.health = health
+    return endpoint
+
+
+class TestEndpointChoice:
+    """Test picking an endpoint for a call"""
+
+    def test_prefers_healthy_endpoint(self):
+        healthy, flaky = _endpoint("http://a"), _endpoint("http://b", health=0.3)
+        pool = EndpointPool([healthy, flaky])
+        assert {pool.choose().url for _ in range(20)} == {"http://a"}
+
+    def test_skips_open_circuits(self):
+        down, up = _endpoint("http://a"), _endpoint("http://b")
+        pool = EndpointPool([down, up])
+
+        async def unreachable(endpoint):
+            raise ConnectionError(endpoint.url)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(pool._attempt(down, unreachable))
+        assert down.health < 1.0
+        assert pool.state() == "partial"
+        assert {pool.choose().url for _ in range(20)} == {"http://b"}
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(pool._attempt(up, unreachable))
+        assert pool.state() == "open"
+        with pytest.raises(CircuitOpenError):
+            pool.choose()
+
+
+class TestHedging:
+    """Test hedging slow calls onto a second endpoint"""
+
+    def test_slow_call_is_hedged_and_loser_cancelled(self):
+        slow, fast = _endpoint("http://slow"), _endpoint("http://fast", health=0.5)
+        pool = EndpointPool([slow, fast], hedge_min_samples=5)
+        pool._latencies.extend([0.01] * 5)
+        cancelled = []
+
+        async def request(endpoint):
+            try:
+                await asyncio.sleep(1.0 if endpoint is slow else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(endpoint.url)
+                raise
+            return endpoint.url
+
+        async def run():
+            result = await pool.call(request)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(run()) == "http://fast"
+        assert cancelled == ["http://slow"]
+        assert pool.stats == {"requests": 1, "hedged": 1, "hedge_wins": 1}
+        assert slow.in_flight == 0 and fast.in_flight == 0
+
+    def test_hedges_stay_within_budget(self):
+        pool = EndpointPool([_endpoint("http://a"), _endpoint("http://b")], hedge_min_samples=5)
+        pool._latencies.extend([0.01] * 5)
+        pool.stats.update(requests=10, hedged=1)
+        assert pool.hedge_delay() is None
+        pool.stats["requests"] = 11
+        assert pool.hedge_delay() == 0.01
+
+    def test_single_endpoint_never_hedges(self):
+        pool = EndpointPool([_endpoint("http://a")], hedge_min_samples=0)
+        assert pool.hedge_delay() is None
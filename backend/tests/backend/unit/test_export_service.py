@@ -0,0 +1,183 @@
+"""
+Unit tests for real-mode exports and the export cache
+"""
+
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services import export_service
+
+SCENE_DATA = {
+    "id": "scene_001",
+    "name": "Cached Scene",
+    "entities": [{"id": "player", "type": "player", "position": {"x": 1, "y": 2}, "size": {}}],
+    "assets": [{"id": "a1", "type": "image", "path": "projects/p/assets/a1.png"}],
+}
+
+
+def _fake_download(_bucket, object_name, file_path):
+    with open(file_path, "wb") as f:
+        f.write(object_name.encode())
+    return True
+
+
+class TestCacheKey:
+    """Test export cache keys"""
+
+    def test_key_ignores_key_order(self):
+        """Semantically equal scenes share a cache entry"""
+        reordered = dict(reversed(list(SCENE_DATA.items())))
+        assert export_service.export_cache_key(
+            SCENE_DATA, "html5", True
+        ) == export_service.export_cache_key(reordered, "html5", True)
+
+    def test_key_varies_by_engine_assets_and_runner(self):
+        """Engine, asset bundling and runner version are part of the key"""
+        html5 = export_service.export_cache_key(SCENE_DATA, "html5", True)
+        assert html5 != export_service.export_cache_key(SCENE_DATA, "godot", True)
+        assert html5 != export_service.export_cache_key(SCENE_DATA, "html5", False)
+        with patch.dict(export_service.RUNNER_VERSIONS, {"html5": "999"}):
+            assert html5 != export_service.export_cache_key(SCENE_DATA, "html5", True)
+
+    def test_referenced_asset_ids(self):
+        """Asset references are collected once each"""
+        scene = {"assets": [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"path": "x"}]}
+        assert export_service.referenced_asset_ids(scene) == ["a", "b"]
+
+
+class TestFetchAssets:
+    """Test parallel asset fetching"""
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_bounded(self, tmp_path):
+        """No more than the configured number of downloads run at once"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_download(bucket, object_name, file_path):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return _fake_download(bucket, object_name, file_path)
+
+        assets = [
+            SimpleNamespace(id=f"a{i}", path=f"projects/p/assets/a{i}.png") for i in range(12)
+        ]
+        with (
+            patch.object(export_service.settings, "export_asset_concurrency", 3),
+            patch.object(export_service, "download_file_to_path", side_effect=slow_download),
+        ):
+            files = await export_service.fetch_assets(assets, str(tmp_path))
+
+        assert len(files) == 12
+        assert peak <= 3
+        assert {path for path, _ in files} == {asset.path for asset in assets}
+
+
+class TestGetOrBuildExport:
+    """Test cached export building"""
+
+    @pytest.mark.asyncio
+    async def test_builds_then_serves_from_cache(self):
+        """The first export builds and uploads, the second streams the cached package"""
+        cache: dict[str, bytes] = {}
+
+        def upload(_bucket, key, data, _length, _content_type):
+            cache[key] = data.read()
+            return True
+
+        def stat(_bucket, key):
+            return SimpleNamespace(size=len(cache[key])) if key in cache else None
+
+        def stream(_bucket, key):
+            return iter([cache[key]])
+
+        scene = SimpleNamespace(id="s1", project_id="p", scene_data=SCENE_DATA)
+        asset = SimpleNamespace(id="a1", path="projects/p/assets/a1.png")
+
+        with (
+            patch.object(export_service, "stat_file_in_storage", side_effect=stat),
+            patch.object(export_service, "upload_file_to_storage", side_effect=upload),
+            patch.object(export_service, "stream_file_from_storage", side_effect=stream),
+            patch.object(export_service, "download_file_to_path", side_effect=_fake_download),
+            patch.object(export_service, "resolve_scene_assets", return_value=[asset]),
+        ):
+            first = await export_service.get_or_build_export(MagicMock(), scene, "html5")
+            first_bytes = b"".join(first.chunks)
+            second = await export_service.get_or_build_export(MagicMock(), scene, "html5")
+            second_bytes = b"".join(second.chunks)
+
+        assert not first.cache_hit
+        assert second.cache_hit
+        assert first_bytes == second_bytes
+        with zipfile.ZipFile(io.BytesIO(first_bytes)) as zf:
+            assert zf.read("assets/a1.png") == b"projects/p/assets/a1.png"
+            manifest = json.loads(zf.read("asset_manifest.json"))
+        assert manifest == {"projects/p/assets/a1.png": "assets/a1.png"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_exports_build_once(self):
+        """Simultaneous exports of one scene share a single build"""
+        cache: dict[str, bytes] = {}
+        builds = 0
+
+        def upload(_bucket, key, data, _length, _content_type):
+            nonlocal builds
+            builds += 1
+            cache[key] = data.read()
+            return True
+
+        scene = SimpleNamespace(id="s1", project_id="p", scene_data={"id": "x", "entities": []})
+        with (
+            patch.object(
+                export_service,
+                "stat_file_in_storage",
+                side_effect=lambda _b, k: (
+                    SimpleNamespace(size=len(cache[k])) if k in cache else None
+                ),
+            ),
+            patch.object(export_service, "upload_file_to_storage", side_effect=upload),
+            patch.object(
+                export_service,
+                "stream_file_from_storage",
+                side_effect=lambda _b, k: iter([cache[k]]),
+            ),
+        ):
+            packages = await asyncio.gather(
+                *(export_service.get_or_build_export(MagicMock(), scene, "godot") for _ in range(5))
+            )
+            for package in packages:
+                assert b"".join(package.chunks)
+
+        assert builds == 1
+        assert sum(not p.cache_hit for p in packages) == 1
+
+    @pytest.mark.asyncio
+    async def test_work_dir_removed_after_streaming(self, tmp_path):
+        """Fresh builds clean up their temp files once streamed"""
+        work_dir = tmp_path / "export_work"
+        work_dir.mkdir()
+        scene = SimpleNamespace(id="s1", project_id="p", scene_data={"id": "y", "entities": []})
+        with (
+            patch.object(export_service, "stat_file_in_storage", return_value=None),
+            patch.object(export_service, "upload_file_to_storage", return_value=False),
+            patch.object(export_service.tempfile, "mkdtemp", return_value=str(work_dir)),
+        ):
+            package = await export_service.get_or_build_export(MagicMock(), scene, "godot")
+            assert os.path.exists(work_dir)
+            b"".join(package.chunks)
+
+        assert not os.path.exists(work_dir)
@@ -0,0 +1,107 @@
+"""
+Unit tests for frozen golden samples and copy-on-write overlays
+"""
+
+import asyncio
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.services.inference_client import inference_client
+from app.services.postprocessor import Postprocessor
+from app.utils.frozen import FrozenDict, freeze, is_frozen, overlay, thaw
+
+ASSETS = [{"id": "asset_1", "type": "image", "path": "sprites/hero.png"}]
+
+
+@pytest.fixture
+def snapshots():
+    """Plain copies of every golden sample, to compare against afterwards"""
+    return {sample["name"]: thaw(sample["data"]) for sample in inference_client.golden_samples}
+
+
+class TestFrozen:
+    """Test frozen documents"""
+
+    def test_in_place_changes_are_refused(self):
+        document = freeze({"entities": [{"position": {"x": 1}}]})
+        with pytest.raises(TypeError):
+            document["name"] = "changed"
+        with pytest.raises(TypeError):
+            document["entities"].append({})
+        with pytest.raises(TypeError):
+            document["entities"][0]["position"].update(x=2)
+
+    def test_reads_like_plain_json(self):
+        data = {"id": "s", "entities": [{"size": {"width": 2}}, 3], "tags": ("a",)}
+        document = freeze(data)
+        assert isinstance(document, dict) and isinstance(document["entities"], list)
+        assert json.dumps(document) == json.dumps(data)
+
+    def test_deepcopy_is_writable(self):
+        copied = copy.deepcopy(freeze({"entities": [{"position": {"x": 1}}]}))
+        copied["entities"][0]["position"]["x"] = 2
+        assert not is_frozen(copied["entities"][0]["position"])
+
+    def test_overlay_shares_nested_values(self):
+        document = freeze({"id": "s", "entities": [{"id": "e", "position": {"x": 1}}]})
+        view = overlay(document)
+        view["entities"][0]["id"] = "changed"
+        view["entities"].append({"id": "new"})
+
+        assert document["entities"] == [{"id": "e", "position": {"x": 1}}]
+        assert view["entities"][0]["position"] is document["entities"][0]["position"]
+
+
+class TestFallbackGenerations:
+    """Test that generations never change the shared golden samples"""
+
+    def test_samples_are_frozen_and_shared(self):
+        context = {"user_prompt": "a simple platform level"}
+        first, name = inference_client._use_fallback_sample(context)
+        second, _ = inference_client._use_fallback_sample(context)
+        assert isinstance(first, FrozenDict)
+        assert first is second is inference_client.load_golden_sample(name)
+
+    def test_pipeline_leaves_sample_unchanged(self, snapshots):
+        sample = inference_client.load_golden_sample("sample_simple_geometry")
+        scene, _ = Postprocessor().run_pipeline(
+            sample, project_id="proj_001", assets=ASSETS, enhancements={"add_lighting": True}
+        )
+
+        assert thaw(sample) == snapshots["sample_simple_geometry"]
+        assert scene["project_id"] == "proj_001"
+        assert all("physics" in entity["properties"] for entity in scene["entities"])
+        # Untouched values are shared with the sample rather than copied
+        assert scene["description"] is sample["description"]
+
+    def test_concurrent_generations(self, snapshots):
+        postprocessor = Postprocessor()
+        prompts = ["simple platform", "forest with sprites", "complex puzzle", "empty sandbox"]
+
+        async def generate(prompt):
+            result = await inference_client.generate_scene({"user_prompt": prompt})
+            return result["scene"]
+
+        async def generate_all():
+            return await asyncio.gather(*(generate(prompt) for prompt in prompts * 8))
+
+        raw_scenes = asyncio.run(generate_all())
+
+        def process(index):
+            scene, _ = postprocessor.run_pipeline(
+                raw_scenes[index], project_id=f"proj_{index}", assets=ASSETS
+            )
+            return scene
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            scenes = list(executor.map(process, range(len(raw_scenes))))
+
+        for sample in inference_client.golden_samples:
+            assert thaw(sample["data"]) == snapshots[sample["name"]]
+        for index, scene in enumerate(scenes):
+            assert scene["project_id"] == f"proj_{index}"
+        # Each generation owns its entities
+        entities = [id(entity) for scene in scenes for entity in scene["entities"]]
+        assert len(entities) == len(set(entities))
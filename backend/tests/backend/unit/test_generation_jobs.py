@@ -0,0 +1,141 @@
+"""
+Unit tests for background generation jobs
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app import main
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.core_models import GenerationLog, Scene
+from app.services.generation_jobs import GenerationJobRunner, generation_jobs
+from app.services.inference_client import inference_client
+from app.services.job_registry import FINISHED_STATES, job_registry
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+REQUEST = {"prompt": "simple platform level", "project_id": "proj_001"}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on their own connections, as jobs save from several threads at once"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+async def _finish(runner: GenerationJobRunner, job_id: str) -> dict:
+    while job_registry.get(job_id)["status"] not in FINISHED_STATES:
+        await runner.wait_for_update(job_id, timeout=5)
+    return job_registry.get(job_id)
+
+
+class TestGenerationJobRunner:
+    """Test running generations in the background"""
+
+    def test_concurrency_is_capped_per_endpoint(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "generation_job_concurrency", 2)
+        runner = GenerationJobRunner(session_factory=session_factory)
+        active, peak = 0, 0
+
+        async def generate_scene(context, **_):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            scene, sample = inference_client._use_fallback_sample(context)
+            return {"scene": scene, "metadata": {"status": "test", "model_version": sample}}
+
+        async def run_jobs():
+            jobs = [runner.submit(REQUEST) for _ in range(5)]
+            return [await _finish(runner, job["job_id"]) for job in jobs]
+
+        with patch.object(inference_client, "generate_scene", side_effect=generate_scene):
+            jobs = asyncio.run(run_jobs())
+
+        assert peak == 2
+        assert [job["status"] for job in jobs] == ["completed"] * 5
+        assert all(job["processed"] == job["total"] for job in jobs)
+        stored = {job["result"]["stored_scene_id"] for job in jobs}
+        db = session_factory()
+        try:
+            assert {str(scene.id) for scene in db.query(Scene).all()} == stored
+            assert db.query(GenerationLog).count() == 5
+        finally:
+            db.close()
+
+    def test_change_while_busy_is_not_missed(self):
+        runner = GenerationJobRunner()
+        job_id = job_registry.create("generation", total=1)["job_id"]
+
+        async def change_then_wait():
+            changed = runner.watch(job_id)
+            # The job changes while the reader is still sending what it read
+            runner._update(job_id, status="running")
+            return await runner.wait_for_update(job_id, timeout=0.5, changed=changed)
+
+        assert asyncio.run(change_then_wait())
+
+    def test_failed_inference_fails_job(self, test_db_engine):
+        runner = GenerationJobRunner(session_factory=sessionmaker(bind=test_db_engine))
+
+        async def run_job():
+            return await _finish(runner, runner.submit(REQUEST)["job_id"])
+
+        with patch.object(
+            inference_client, "generate_scene", AsyncMock(side_effect=RuntimeError("model down"))
+        ):
+            job = asyncio.run(run_job())
+
+        assert job["status"] == "failed"
+        assert job["stage"] == "inference"
+        assert job["errors"] == ["model down"]
+
+
+class TestGenerationJobEndpoints:
+    """Test the job-mode generation API"""
+
+    @pytest.fixture
+    def client(self, test_db_engine, test_db_session, monkeypatch):
+        monkeypatch.setattr(main, "init_db", lambda: None)
+        monkeypatch.setattr(generation_jobs, "session_factory", sessionmaker(bind=test_db_engine))
+        app.dependency_overrides[get_db] = lambda: test_db_session
+        try:
+            # Jobs outlive their request, so keep one event loop for the whole test
+            with TestClient(app) as client:
+                yield client
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_submit_and_stream(self, client):
+        response = client.post("/api/generation/jobs", json=REQUEST)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        with client.stream("GET", f"/api/generation/jobs/{job_id}/events") as stream:
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            lines = list(stream.iter_lines())
+        events = [line for line in lines if line.startswith("event:")]
+        data = [json.loads(line[len("data:") :]) for line in lines if line.startswith("data:")]
+        assert events[-1] == "event: completed"
+        assert events.count("event: completed") == 1
+        assert data[-1]["result"]["scene_id"]
+
+        job = client.get(f"/api/generation/jobs/{job_id}").json()
+        assert job["stage"] == "completed"
+        assert job["result"]["scene"]["project_id"] == "proj_001"
+        assert "postprocessing" in job["result"]["metadata"]
+        scene = client.get(f"/api/scenes/{job['result']['stored_scene_id']}")
+        assert scene.status_code == 200
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/generation/jobs/missing").status_code == 404
+        assert client.get("/api/generation/jobs/missing/events").status_code == 404
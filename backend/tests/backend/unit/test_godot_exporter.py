@@ -0,0 +1,222 @@
+"""
+Unit tests for the Godot 4 scene exporter
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+from app.services import export_service, godot_exporter
+
+GOLDEN_SAMPLES = sorted(
+    (Path(godot_exporter.__file__).parent.parent / "golden_samples").glob("*.json")
+)
+
+
+def _load(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _walk_entities(scene: dict):
+    """Yield (entity, relative) for every entity, layer entity and child"""
+
+    def walk(entities, relative=False):
+        for entity in entities:
+            yield entity, relative
+            yield from walk(entity.get("children", []), relative=True)
+
+    yield from walk(scene.get("entities", []))
+    for layer in scene.get("layers", []):
+        yield from walk(layer.get("entities", []))
+
+
+def _position(node: dict) -> tuple[float, float]:
+    props = node["properties"]
+    vector = props.get("position") or props.get("offset")
+    if vector:
+        x, y = re.match(r"Vector2\((.+), (.+)\)", vector).groups()
+    else:
+        x, y = props["offset_left"], props["offset_top"]
+    return float(x), float(y)
+
+
+@pytest.mark.parametrize("sample", GOLDEN_SAMPLES, ids=lambda p: p.stem)
+class TestGoldenSampleRoundTrip:
+    """Export every golden sample and read it back"""
+
+    def test_every_entity_becomes_a_node(self, sample):
+        """Entity IDs, types and positions survive the round trip"""
+        scene = _load(sample)
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        nodes = {
+            json.loads(node["properties"]["metadata/entity_id"]): node
+            for node in parsed["nodes"]
+            if "metadata/entity_id" in node["properties"]
+        }
+
+        entities = list(_walk_entities(scene))
+        assert len(nodes) == len(entities)
+        for entity, relative in entities:
+            node = nodes[entity["id"]]
+            assert json.loads(node["properties"]["metadata/entity_type"]) == entity["type"]
+            source = entity.get("relative_position" if relative else "position") or entity.get(
+                "bounds"
+            )
+            if source:
+                assert _position(node) == (source["x"], source["y"])
+
+    def test_document_is_consistent(self, sample):
+        """Parents, resource references and load_steps all line up"""
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(_load(sample)))
+
+        ext_ids = {res["id"] for res in parsed["ext_resources"]}
+        sub_ids = {res["id"] for res in parsed["sub_resources"]}
+        assert int(parsed["header"]["load_steps"]) == len(ext_ids) + len(sub_ids) + 1
+        assert parsed["header"]["format"] == "3"
+
+        root, *children = parsed["nodes"]
+        assert "parent" not in root
+        paths = {"."}
+        for node in children:
+            assert node["parent"] in paths
+            path = node["name"] if node["parent"] == "." else f"{node['parent']}/{node['name']}"
+            assert path not in paths, f"duplicate node path {path}"
+            paths.add(path)
+
+        text = "\n".join(
+            value
+            for section in parsed["nodes"] + parsed["sub_resources"]
+            for value in section["properties"].values()
+        )
+        assert set(re.findall(r'ExtResource\("([^"]+)"\)', text)) <= ext_ids
+        assert set(re.findall(r'SubResource\("([^"]+)"\)', text)) <= sub_ids
+
+
+class TestNodeMapping:
+    """Test entity to node mapping"""
+
+    def test_simple_geometry(self):
+        """Bodies and areas get collision shapes, groups and layers"""
+        scene = _load(next(p for p in GOLDEN_SAMPLES if "simple_geometry" in p.stem))
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        by_name = {node["name"]: node for node in parsed["nodes"]}
+
+        player = by_name["player_start"]
+        assert player["type"] == "CharacterBody2D"
+        assert player["groups"] == ["player"]
+        assert player["properties"]["collision_layer"] == "1"
+        assert by_name["enemy_1"]["type"] == "CharacterBody2D"
+        assert by_name["platform_moving"]["type"] == "AnimatableBody2D"
+        assert by_name["coin_1"]["properties"]["collision_layer"] == "8"
+        assert by_name["goal"]["type"] == "Area2D"
+        # The camera follows its target
+        assert any(
+            n["type"] == "Camera2D" and n["parent"] == "player_start" for n in parsed["nodes"]
+        )
+        # Identical platform sizes share one shape
+        sizes = [res["properties"]["size"] for res in parsed["sub_resources"]]
+        assert len(sizes) == len(set(sizes))
+
+    def test_asset_references(self):
+        """Textures and sounds become ext_resources"""
+        scene = _load(next(p for p in GOLDEN_SAMPLES if "asset_intensive" in p.stem))
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        types = {res["type"] for res in parsed["ext_resources"]}
+        assert "Texture2D" in types
+        assert any(t.startswith("AudioStream") for t in types)
+        assert all(res["path"].startswith("res://assets/") for res in parsed["ext_resources"])
+
+    def test_node_names_are_sanitized_and_unique(self):
+        """Invalid characters are replaced and duplicate IDs suffixed"""
+        scene = {
+            "entities": [
+                {"id": "a.b", "type": "decoration", "position": {"x": 0, "y": 0}},
+                {"id": "a.b", "type": "decoration", "position": {"x": 1, "y": 0}},
+            ]
+        }
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        assert [n["name"] for n in parsed["nodes"][1:]] == ["a_b", "a_b2"]
+
+    def test_gradient_without_id(self):
+        """Entities without an ID find the resources registered for them"""
+        scene = {
+            "entities": [
+                {
+                    "type": "gradient_fill",
+                    "size": {"width": 100, "height": 50},
+                    "properties": {"colors": [{"position": 0, "color": "#000000"}]},
+                }
+            ]
+        }
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        node = parsed["nodes"][1]
+        assert node["type"] == "TextureRect"
+        texture_ids = {
+            res["id"] for res in parsed["sub_resources"] if res["type"] == "GradientTexture2D"
+        }
+        assert node["properties"]["texture"] == f'SubResource("{texture_ids.pop()}")'
+
+    @pytest.mark.parametrize("color", [[255, 0, 0], {"r": 1}, 16711680])
+    def test_malformed_colors_fall_back_to_white(self, color):
+        """Colors that are not hex strings do not fail the export"""
+        scene = {
+            "metadata": {"background_color": color},
+            "entities": [
+                {
+                    "id": "block",
+                    "type": "platform",
+                    "size": {"width": 10, "height": 10},
+                    "properties": {"color": color},
+                }
+            ],
+        }
+        tscn = godot_exporter.render_tscn(scene)
+        assert "Color(1, 1, 1, 1)" in tscn
+
+    def test_strings_are_escaped(self):
+        """Quotes in text survive the round trip"""
+        scene = {
+            "entities": [
+                {
+                    "id": "label",
+                    "type": "ui_element",
+                    "properties": {"element_type": "text", "text": 'Say "hi"\\n'},
+                }
+            ]
+        }
+        parsed = godot_exporter.parse_tscn(godot_exporter.render_tscn(scene))
+        assert json.loads(parsed["nodes"][1]["properties"]["text"]) == 'Say "hi"\\n'
+
+
+class TestExportIntegration:
+    """Test the exporter behind the export service"""
+
+    def test_streamed_output_matches_render(self):
+        """Batched chunks add up to the full document"""
+        scene = _load(next(p for p in GOLDEN_SAMPLES if "complex_structure" in p.stem))
+        chunks = list(godot_exporter.iter_tscn(scene, batch_size=2))
+        assert len(chunks) > 3
+        assert "".join(chunks) == export_service.render_godot_scene(scene)
+
+    def test_large_scene_is_fast(self):
+        """A 50k-node scene exports well under a second"""
+        kinds = ["platform", "collectible", "decoration", "enemy"]
+        entities = [
+            {
+                "id": f"entity_{i}",
+                "type": kinds[i % 4],
+                "position": {"x": i * 8, "y": i % 600},
+                "size": {"width": 32 + i % 5, "height": 16},
+                "properties": {"color": "#8B4513"},
+            }
+            for i in range(20_000)
+        ]
+        start = time.perf_counter()
+        chunks = list(godot_exporter.iter_tscn({"scene_name": "Large", "entities": entities}))
+        elapsed = time.perf_counter() - start
+
+        assert sum(chunk.count("[node ") for chunk in chunks) >= 50_000
+        assert elapsed < 1.0
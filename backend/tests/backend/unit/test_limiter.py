@@ -0,0 +1,124 @@
+"""
+Unit tests for the adaptive concurrency limiter
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.services.inference_client import InferenceClient
+from app.utils.limiter import AdaptiveLimiter, LimiterRejected
+
+
+async def _call(limiter: AdaptiveLimiter, seconds: float = 0.0, error: type | None = None):
+    async with limiter.acquire():
+        await asyncio.sleep(seconds)
+        if error is not None:
+            raise error("failed")
+
+
+class TestAdaptiveLimiter:
+    """Test AIMD limit changes and load shedding"""
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(initial=2, maximum=4)
+
+        async def run():
+            for _ in range(5):
+                await _call(limiter)
+
+        asyncio.run(run())
+        # 1/2 per success until 3, then 1/3
+        assert limiter.snapshot()["limit"] == 3
+        assert limiter.in_flight == 0
+
+    def test_burst_of_timeouts_halves_limit_once(self):
+        limiter = AdaptiveLimiter(initial=8, max_queue=0)
+
+        async def run():
+            calls = [_call(limiter, 0.01, TimeoutError) for _ in range(8)]
+            await asyncio.gather(*calls, return_exceptions=True)
+            # A call admitted after the cut can cut again
+            with pytest.raises(TimeoutError):
+                await _call(limiter, error=TimeoutError)
+
+        asyncio.run(run())
+        assert limiter.snapshot()["limit"] == 2
+        assert limiter.stats["decreases"] == 2
+
+    def test_slow_calls_count_as_congestion(self):
+        limiter = AdaptiveLimiter(initial=4, latency_target=0.005)
+        asyncio.run(_call(limiter, 0.01))
+        assert limiter.snapshot()["limit"] == 2
+
+    def test_other_errors_leave_limit(self):
+        limiter = AdaptiveLimiter(initial=4)
+        with pytest.raises(ValueError):
+            asyncio.run(_call(limiter, error=ValueError))
+        assert limiter.limit == 4 and limiter.in_flight == 0
+
+    def test_full_queue_rejects_at_once(self):
+        limiter = AdaptiveLimiter(initial=1, max_queue=1, queue_timeout=1.0)
+
+        async def run():
+            first = asyncio.create_task(_call(limiter, 0.05))
+            await asyncio.sleep(0)
+            queued = asyncio.create_task(_call(limiter))
+            await asyncio.sleep(0)
+            start = time.perf_counter()
+            with pytest.raises(LimiterRejected):
+                await _call(limiter)
+            rejected_after = time.perf_counter() - start
+            await asyncio.gather(first, queued)
+            return rejected_after
+
+        assert asyncio.run(run()) < 0.01
+        assert limiter.stats["rejected"] == 1
+        assert limiter.stats["admitted"] == 2
+
+    def test_queue_wait_is_bounded(self):
+        limiter = AdaptiveLimiter(initial=1, queue_timeout=0.01)
+
+        async def run():
+            first = asyncio.create_task(_call(limiter, 0.1))
+            await asyncio.sleep(0)
+            with pytest.raises(LimiterRejected):
+                await _call(limiter)
+            await first
+
+        asyncio.run(run())
+        assert limiter.snapshot()["queued"] == 0
+
+
+class TestInferenceBackpressure:
+    """Test that saturated model calls fall back fast"""
+
+    def test_excess_requests_fall_back_before_timeout(self):
+        client = InferenceClient()
+        client.use_local_model = True
+        client.pool.endpoints[0].limiter = AdaptiveLimiter(
+            initial=2, max_queue=1, queue_timeout=5.0
+        )
+
+        async def slow_model(*_):
+            await asyncio.sleep(0.2)
+            return {"id": "from_model"}
+
+        client._request_model = slow_model
+
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(client.generate_scene({"user_prompt": "simple level"}) for _ in range(5))
+            )
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(run())
+        statuses = [result["metadata"]["status"] for result in results]
+        assert statuses.count("success") == 3
+        assert statuses.count("fail_fallback") == 2
+        shed = [result for result in results if result["metadata"]["status"] == "fail_fallback"]
+        assert all(result["metadata"]["latency_ms"] < 50 for result in shed)
+        assert elapsed < 1.0
+        endpoint = client.get_model_status()["routing"]["endpoints"][0]
+        assert endpoint["concurrency"]["rejected"] == 2
@@ -0,0 +1,90 @@
+"""
+Unit tests for background model connectivity probes
+"""
+
+import asyncio
+
+import httpx
+from app.config import settings
+from app.services.inference_client import InferenceClient
+
+
+def _client(monkeypatch, endpoints: str) -> InferenceClient:
+    monkeypatch.setattr(settings, "model_endpoints", endpoints)
+    client = InferenceClient()
+    client.use_local_model = True
+    return client
+
+
+def _fake_get(probed: list[str]):
+    async def get(_, url, **__):
+        probed.append(url)
+        if url.startswith("http://down"):
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200 if url.startswith("http://up") else 503)
+
+    return get
+
+
+class TestModelProbe:
+    """Test that model status is answered from cached probes"""
+
+    def test_status_never_calls_model(self, monkeypatch):
+        client = _client(monkeypatch, "http://up:1")
+
+        def blocked(*_, **__):
+            raise AssertionError("status must not call the model server")
+
+        monkeypatch.setattr(httpx.Client, "get", blocked)
+        monkeypatch.setattr(httpx.AsyncClient, "get", blocked)
+        status = client.get_model_status()
+        assert status["model_connectivity"] == "unknown"
+        assert status["connectivity_checked_at"] is None
+
+    def test_probe_caches_results(self, monkeypatch):
+        client = _client(monkeypatch, "http://down:1,http://up:2")
+        probed = []
+        monkeypatch.setattr(httpx.AsyncClient, "get", _fake_get(probed))
+
+        asyncio.run(client.probe_connectivity())
+        assert sorted(probed) == ["http://down:1/api/tags", "http://up:2/api/tags"]
+        assert client.connectivity["http://down:1"]["status"] == "disconnected"
+        status = client.get_model_status()
+        assert status["model_connectivity"] == "connected"
+        assert status["connectivity_checked_at"] == client.connectivity["http://up:2"]["checked_at"]
+
+        monkeypatch.setattr(settings, "model_endpoints", "http://busy:3")
+        busy = InferenceClient()
+        busy.use_local_model = True
+        asyncio.run(busy.probe_connectivity())
+        assert busy.get_model_status()["model_connectivity"] == "unreachable"
+
+    def test_prober_refreshes_until_closed(self, monkeypatch):
+        client = _client(monkeypatch, "http://up:1")
+        monkeypatch.setattr(settings, "model_probe_interval", 0.01)
+        probed = []
+        monkeypatch.setattr(httpx.AsyncClient, "get", _fake_get(probed))
+
+        async def run():
+            client.start_prober()
+            while len(probed) < 2:
+                await asyncio.sleep(0.01)
+            await client.close()
+            count = len(probed)
+            await asyncio.sleep(0.02)
+            return count
+
+        count = asyncio.run(asyncio.wait_for(run(), timeout=5))
+        assert len(probed) == count
+        assert client._prober is None
+
+    def test_fallback_mode_does_not_probe(self):
+        client = InferenceClient()
+        client.use_local_model = False
+
+        async def run():
+            client.start_prober()
+            return client._prober
+
+        assert asyncio.run(run()) is None
+        assert "model_connectivity" not in client.get_model_status()
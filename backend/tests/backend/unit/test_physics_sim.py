@@ -0,0 +1,124 @@
+"""
+Unit tests for the headless physics simulation
+"""
+
+import copy
+import time
+
+import pytest
+from app.services.inference_client import inference_client
+from app.services.physics_sim import PhysicsSimulator
+from app.services.postprocessor import Postprocessor
+
+
+def _entity(entity_id: str, entity_type: str, x: float, y: float, w: float, h: float, **physics):
+    entity = {
+        "id": entity_id,
+        "type": entity_type,
+        "position": {"x": x, "y": y},
+        "size": {"width": w, "height": h},
+    }
+    if physics:
+        entity["properties"] = {"physics": physics}
+    return entity
+
+
+def _scene(*entities) -> dict:
+    ground = _entity("ground", "platform", 0, 500, 1000, 20)
+    return {"id": "scene_sim", "entities": [ground, *entities]}
+
+
+@pytest.fixture
+def simulator():
+    return PhysicsSimulator()
+
+
+def _issues(report) -> dict[str, str]:
+    return {issue.id: issue.issue for issue in report.issues}
+
+
+class TestPhysicsSimulator:
+    """Test flagging of misbehaving entities"""
+
+    def test_resting_entity_is_stable(self, simulator):
+        report = simulator.simulate(_scene(_entity("player", "player", 100, 452, 32, 48)))
+        assert report.stable
+        assert report.bodies == 1 and report.colliders == 1
+
+    def test_entity_placed_above_ground_is_displaced(self, simulator):
+        report = simulator.simulate(_scene(_entity("crate", "object", 100, 100, 32, 32)))
+        assert _issues(report) == {"crate": "displaced"}
+        assert report.issues[0].final_position == {"x": 100.0, "y": 468.0}
+
+    def test_small_drop_is_tolerated(self, simulator):
+        assert simulator.simulate(_scene(_entity("crate", "object", 100, 448, 32, 32))).stable
+
+    def test_entity_without_floor_falls_forever(self, simulator):
+        report = simulator.simulate(_scene(_entity("enemy", "enemy", 1200, 100, 32, 32)))
+        assert _issues(report) == {"enemy": "falls_forever"}
+
+    def test_entity_inside_platform(self, simulator):
+        stuck = _entity("coin", "item", 100, 490, 16, 16)
+        report = simulator.simulate(_scene(stuck))
+        # It falls through the platform it is stuck in, with nothing below
+        assert [issue.issue for issue in report.issues] == ["embedded", "falls_forever"]
+
+    def test_bouncy_entity_is_unstable(self, simulator):
+        ball = _entity("ball", "object", 100, 0, 20, 20, gravity=True, mass=1, restitution=1.0)
+        report = simulator.simulate(_scene(ball), steps=60)
+        assert _issues(report) == {"ball": "unstable"}
+
+    def test_lands_on_highest_platform_crossed(self, simulator):
+        ledge = _entity("ledge", "platform", 80, 300, 100, 10)
+        report = simulator.simulate(_scene(ledge, _entity("crate", "object", 100, 0, 32, 32)))
+        assert report.issues[0].final_position["y"] == 268.0
+
+    def test_static_and_trigger_entities_are_not_simulated(self, simulator):
+        floating = _entity("lamp", "object", 100, 0, 10, 10, gravity=False)
+        trigger = _entity("coin", "item", 200, 0, 10, 10, collision=False)
+        background = _entity("sky", "background", 0, 0, 800, 600)
+        report = simulator.simulate(_scene(floating, trigger, background))
+        assert report.stable
+        assert report.bodies == 0 and report.colliders == 2
+
+    def test_deterministic(self, simulator):
+        scene = _scene(
+            *(_entity(f"crate_{i}", "object", i * 40, i * 7, 32, 32) for i in range(30)),
+            _entity("ball", "object", 0, 0, 20, 20, restitution=0.6),
+        )
+        assert simulator.simulate(scene).issues == simulator.simulate(scene).issues
+
+    def test_large_scene(self, simulator):
+        """Fast enough to run on every generated scene"""
+        tiles = [
+            _entity(f"tile_{i}", "platform", i * 16, 500 + (i % 7) * 16, 16, 16)
+            for i in range(10000)
+        ]
+        crates = [_entity(f"crate_{i}", "object", i * 160, 0, 24, 24) for i in range(1000)]
+        scene = {"id": "big", "entities": tiles + crates}
+
+        start = time.perf_counter()
+        report = simulator.simulate(scene)
+        elapsed = time.perf_counter() - start
+
+        assert report.bodies == 1000
+        assert {issue.issue for issue in report.issues} == {"displaced"}
+        assert elapsed < 0.5
+
+
+class TestSimulationStage:
+    """Test the optional postprocessing stage"""
+
+    def test_enhancement_records_report(self):
+        postprocessor = Postprocessor()
+        # The postprocessor modifies entities in place
+        sample = copy.deepcopy(inference_client.load_golden_sample("sample_simple_geometry"))
+        scene = postprocessor.process_scene(sample, project_id="proj_001")
+
+        enhanced = postprocessor.enhance_scene(scene, {"simulate_physics": True})
+        simulation = enhanced["metadata"]["simulation"]
+        assert simulation["steps"] == 120
+        assert simulation["bodies"] > 0
+        assert all(issue["issue"] for issue in simulation["issues"])
+
+        assert "simulation" not in postprocessor.enhance_scene(scene)["metadata"]
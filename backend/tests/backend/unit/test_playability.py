@@ -0,0 +1,143 @@
+"""
+Unit tests for the playability validator
+"""
+
+import time
+
+import pytest
+from app.services.inference_client import inference_client
+from app.services.playability import PlayabilityValidator
+
+
+def _entity(entity_id: str, entity_type: str, x: float, y: float, w: float, h: float) -> dict:
+    return {
+        "id": entity_id,
+        "type": entity_type,
+        "position": {"x": x, "y": y},
+        "size": {"width": w, "height": h},
+    }
+
+
+def _level(*platforms: tuple[float, float, float], goal_at: tuple[float, float]) -> dict:
+    """Player on the first platform, goal standing at goal_at"""
+    entities = [
+        _entity(f"platform_{i}", "platform", x, y, width, 20)
+        for i, (x, y, width) in enumerate(platforms)
+    ]
+    x, y, _ = platforms[0]
+    entities.append(_entity("player", "player", x + 10, y - 48, 32, 48))
+    entities.append(_entity("goal", "goal", goal_at[0], goal_at[1] - 64, 32, 64))
+    return {"id": "level", "name": "Level", "style": "platformer", "entities": entities}
+
+
+@pytest.fixture
+def validator():
+    return PlayabilityValidator(cache_size=8)
+
+
+class TestPlayabilityValidator:
+    """Test reachability of goals"""
+
+    def test_golden_sample_is_playable(self, validator):
+        report = validator.validate(inference_client.load_golden_sample("sample_simple_geometry"))
+        assert report.playable
+        assert report.spawn == "player_start"
+        assert report.goals[0].id == "goal" and report.goals[0].reachable
+        # The path ends on the ground next to the goal (floors snap to grid cells)
+        assert report.goals[0].path[-1]["y"] == pytest.approx(900, abs=report.cell_size)
+
+    def test_jump_across_small_gap(self, validator):
+        report = validator.validate(_level((0, 500, 200), (320, 500, 200), goal_at=(450, 500)))
+        assert report.playable
+        assert len(report.goals[0].path) == 2
+
+    def test_gap_too_wide(self, validator):
+        report = validator.validate(_level((0, 500, 200), (600, 500, 200), goal_at=(700, 500)))
+        assert not report.playable
+        assert report.reason == "Unreachable goals: goal"
+
+    def test_ledge_too_high_unless_stepped(self, validator):
+        level = _level((0, 500, 200), (250, 300, 200), goal_at=(350, 300))
+        assert not validator.validate(level).playable
+
+        # A step halfway up makes the ledge reachable, and falling back down is allowed
+        level["entities"].append(_entity("step", "platform", 200, 400, 60, 20))
+        report = validator.validate(level)
+        assert report.playable
+        floors = [point["y"] for point in report.goals[0].path]
+        assert floors == pytest.approx([500, 400, 300], abs=report.cell_size)
+
+    def test_goal_floating_within_jump_reach(self, validator):
+        level = _level((0, 500, 400), goal_at=(300, 500))
+        goal = level["entities"][-1]
+        goal["position"]["y"] = 500 - 64 - 100
+        assert validator.validate(level).playable
+        goal["position"]["y"] = 500 - 64 - 300
+        assert not validator.validate(level).playable
+
+    def test_player_without_ground(self, validator):
+        level = _level((0, 500, 200), goal_at=(100, 500))
+        level["entities"][-2]["position"] = {"x": 500, "y": 0}
+        report = validator.validate(level)
+        assert not report.playable
+        assert report.reason == "Player has no ground to stand on"
+
+    def test_scene_without_player(self, validator):
+        report = validator.validate({"id": "empty", "entities": []})
+        assert not report.playable
+        assert report.reason == "Scene has no player"
+
+    def test_graph_is_cached_per_version(self, validator):
+        level = _level((0, 500, 200), (320, 500, 200), goal_at=(450, 500))
+        assert not validator.validate(level, cache_key=("level", 1)).cached
+        assert validator.validate(level, cache_key=("level", 1)).cached
+        assert not validator.validate(level, cache_key=("level", 2)).cached
+        assert not validator.validate(level).cached
+
+    def test_large_tiled_level(self, validator):
+        """A 10k-tile level validates in milliseconds"""
+        tiles = [
+            _entity(f"tile_{row}_{col}", "platform", col * 16, 1000 + row * 16, 16, 16)
+            for row in range(10)
+            for col in range(1000)
+        ]
+        # Pillars every 400 pixels that must be jumped over
+        tiles += [_entity(f"pillar_{i}", "platform", i * 400, 900, 32, 100) for i in range(1, 40)]
+        scene = {
+            "id": "tiled",
+            "entities": tiles
+            + [
+                _entity("player", "player", 20, 952, 32, 48),
+                _entity("goal", "goal", 15900, 936, 32, 64),
+            ],
+        }
+
+        start = time.perf_counter()
+        report = validator.validate(scene)
+        elapsed = time.perf_counter() - start
+
+        assert report.playable
+        assert elapsed < 0.25
+        assert report.surfaces == 40 + 39
+
+
+class TestPlayabilityEndpoint:
+    """Test GET /api/scenes/{id}/playability"""
+
+    def test_stored_scene_versions(self, test_client):
+        level = _level((0, 500, 200), (600, 500, 200), goal_at=(700, 500))
+        scene_id = test_client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": level}
+        ).json()["id"]
+
+        report = test_client.get(f"/api/scenes/{scene_id}/playability").json()
+        assert report["version"] == 1
+        assert report["playable"] is False
+
+        level["entities"].append(_entity("bridge", "platform", 200, 500, 400, 20))
+        test_client.put(f"/api/scenes/{scene_id}", json={"scene_data": level})
+        assert test_client.get(f"/api/scenes/{scene_id}/playability").json()["playable"] is True
+
+        past = test_client.get(f"/api/scenes/{scene_id}/playability?version=1").json()
+        assert past["playable"] is False and past["cached"] is True
+        assert test_client.get(f"/api/scenes/{scene_id}/playability?version=3").status_code == 404
@@ -0,0 +1,152 @@
+"""
+Unit tests for the postprocessing stage pipeline
+"""
+
+import copy
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.database import get_db
+from app.main import app
+from app.routers import generation as generation_router
+from app.services.inference_client import inference_client
+from app.services.postprocessor import PipelineStage, Postprocessor
+from fastapi.testclient import TestClient
+
+
+def _sample() -> dict:
+    return copy.deepcopy(inference_client.load_golden_sample("sample_simple_geometry"))
+
+
+def _names(passes) -> list[list[str]]:
+    return [[stage.name for stage in stages] for stages in passes]
+
+
+@pytest.fixture
+def postprocessor():
+    return Postprocessor()
+
+
+class TestPlan:
+    """Test grouping of stages into passes"""
+
+    def test_entity_stages_are_fused(self, postprocessor):
+        assert _names(postprocessor.plan()) == [
+            ["ensure_fields"],
+            ["normalize_entity", "validate_entity", "add_physics", "add_collision_box"],
+            ["incorporate_assets"],
+            ["metadata"],
+            ["optimize_placement"],
+        ]
+        assert _names(postprocessor.plan(("enhance",), {"add_audio": True})) == [
+            ["add_physics", "add_collision_box"],
+            ["optimize_placement"],
+            ["add_audio"],
+        ]
+
+    def test_new_entity_stage_joins_existing_pass(self, postprocessor):
+        postprocessor.register_stage(
+            PipelineStage(
+                "tag_entity",
+                lambda entity: entity.setdefault("tags", []),
+                "entity",
+                "enhance",
+                requires=frozenset({"entity.fields"}),
+            )
+        )
+        passes = _names(postprocessor.plan())
+        assert sum(len(stages) > 1 for stages in passes) == 1
+        assert passes[1][-1] == "tag_entity"
+
+    def test_stage_reading_placed_positions_stays_after_placement(self, postprocessor):
+        postprocessor.register_stage(
+            PipelineStage(
+                "snap_to_grid",
+                lambda _: None,
+                "entity",
+                "enhance",
+                requires=frozenset({"entity.position"}),
+            )
+        )
+        assert _names(postprocessor.plan())[-2:] == [["optimize_placement"], ["snap_to_grid"]]
+
+    def test_registration_checks(self, postprocessor):
+        with pytest.raises(ValueError, match="already registered"):
+            postprocessor.register_stage(
+                PipelineStage("metadata", lambda scene, _: scene, "scene", "process")
+            )
+        with pytest.raises(ValueError, match="requires scene.metadata"):
+            postprocessor.register_stage(
+                PipelineStage(
+                    "early",
+                    lambda scene, _: scene,
+                    "scene",
+                    "process",
+                    requires=frozenset({"scene.metadata"}),
+                ),
+                before="incorporate_assets",
+            )
+
+
+class TestRunPipeline:
+    """Test running the whole pipeline"""
+
+    def test_matches_separate_process_and_enhance(self, postprocessor):
+        scene, report = postprocessor.run_pipeline(_sample(), project_id="proj_001")
+        expected = postprocessor.enhance_scene(
+            postprocessor.process_scene(_sample(), project_id="proj_001")
+        )
+        for volatile in ("created_at", "metadata"):
+            del scene[volatile], expected[volatile]
+        assert scene == expected
+
+        assert report["entity_passes"] == 1
+        assert set(report["stages"]) == {
+            "ensure_fields",
+            "normalize_entity",
+            "validate_entity",
+            "add_physics",
+            "add_collision_box",
+            "incorporate_assets",
+            "metadata",
+            "optimize_placement",
+        }
+        # Once by run_pipeline and once by process_scene
+        assert postprocessor.get_stage_stats()["normalize_entity"]["calls"] == 2
+
+    def test_invalid_scene_is_replaced(self, postprocessor):
+        scene, report = postprocessor.run_pipeline({"entities": "oops"}, project_id="proj_001")
+        assert scene["name"] == "Minimal Scene"
+        # The replacement is still enhanced
+        assert "physics" in scene["entities"][0]["properties"]
+        assert "add_physics" in report["stages"]
+
+
+class TestGenerationMetadata:
+    """Test stage timings in the generation response"""
+
+    def test_response_reports_stage_latency(self):
+        result = {"scene": _sample(), "metadata": {"status": "fallback", "model_version": "test"}}
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        try:
+            with (
+                patch.object(
+                    generation_router.inference_client,
+                    "generate_scene",
+                    AsyncMock(return_value=result),
+                ),
+                patch.object(generation_router, "log_generation"),
+                patch.object(generation_router, "save_scene_to_db"),
+            ):
+                client = TestClient(app)
+                response = client.post(
+                    "/api/generation/", json={"prompt": "a level", "project_id": "proj_001"}
+                )
+                stats = client.get("/api/generation/status").json()["postprocessing_stages"]
+        finally:
+            app.dependency_overrides.clear()
+
+        postprocessing = response.json()["metadata"]["postprocessing"]
+        assert postprocessing["entity_passes"] == 1
+        assert "optimize_placement" in postprocessing["stages"]
+        assert stats["optimize_placement"]["calls"] >= 1
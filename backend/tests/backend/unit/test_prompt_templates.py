@@ -0,0 +1,61 @@
+"""
+Unit tests for file-based prompt templates
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from app.schemas.generation import GameStyle
+from app.services.context_builder import ContextBuilder
+
+TEMPLATES = Path(__file__).parents[3] / "app" / "prompt_templates"
+
+
+@pytest.fixture
+def builder(tmp_path):
+    builder = ContextBuilder()
+    builder.templates_path = tmp_path / "prompt_templates"
+    shutil.copytree(TEMPLATES, builder.templates_path)
+    return builder
+
+
+class TestPromptTemplates:
+    """Test rendering, caching and reloading prompt templates"""
+
+    def test_request_prompt_is_unchanged(self, builder):
+        context = builder.build_generation_prompt("a cave", "proj_001", style=GameStyle.RPG)
+        assert context["engineered_prompt"] == (
+            "Create a rpg game scene based on the following description: a cave"
+            " Generate a structured JSON scene with entities, positions, and properties."
+        )
+
+    def test_prefix_is_stable_per_style(self, builder):
+        first = builder.build_generation_prompt("a cave", "p1", style="rpg")["prompt_prefix"]
+        second = builder.build_generation_prompt("a tower", "p2", style="rpg")["prompt_prefix"]
+        platformer = builder.build_generation_prompt("a cave", "p1")["prompt_prefix"]
+        system = (builder.templates_path / "system.txt").read_text().strip()
+
+        assert first == second
+        assert first.startswith(system) and platformer.startswith(system)
+        assert "RPG" in first and "RPG" not in platformer
+
+    def test_unknown_style_gets_system_section_only(self, builder):
+        system = (builder.templates_path / "system.txt").read_text().strip()
+        for style in ("strategy", "../system"):
+            context = builder.build_generation_prompt("a cave", "p1", style=style)
+            assert context["prompt_prefix"] == system
+
+    def test_templates_compile_once_and_reload_on_change(self, builder):
+        builder.build_generation_prompt("a cave", "p1", style="rpg")
+        compiled = builder.template_cache["styles/rpg"][1]
+        builder.build_generation_prompt("a cave", "p1", style="rpg")
+        assert builder.template_cache["styles/rpg"][1] is compiled
+
+        path = builder.templates_path / "styles" / "rpg.txt"
+        path.write_text("Top-down, please.\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        prefix = builder.build_generation_prompt("a cave", "p1", style="rpg")["prompt_prefix"]
+        assert prefix.endswith("\n\nTop-down, please.")
@@ -0,0 +1,142 @@
+"""
+Unit tests for the binary scene codec
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from app.main import app
+from app.services.inference_client import inference_client
+from app.utils.scene_codec import (
+    SCENE_BINARY_MEDIA_TYPE,
+    SceneDecodeError,
+    decode_scene,
+    encode_scene,
+    wants_binary_scene,
+)
+from fastapi.testclient import TestClient
+
+GOLDEN_SAMPLES = sorted(
+    (Path(__file__).parents[3] / "app" / "golden_samples").glob("sample_*.json")
+)
+
+
+def _large_scene(count: int = 5000) -> dict:
+    kinds = ["platform", "decoration", "collectible", "enemy"]
+    return {
+        "id": "scene_large",
+        "scene_name": "Large Level",
+        "entities": [
+            {
+                "id": f"tile_{i}",
+                "type": kinds[i % 4],
+                "name": f"Tile {i % 50}",
+                "position": {"x": i * 32 % 8000, "y": i * 7 % 1080},
+                "size": {"width": 32, "height": 32},
+                "properties": {"color": "#8B4513", "collision": True, "layer": 2},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+class TestRoundTrip:
+    """Test that decoding returns the encoded scene"""
+
+    @pytest.mark.parametrize("sample", GOLDEN_SAMPLES, ids=lambda p: p.stem)
+    def test_golden_samples(self, sample):
+        """Golden samples, including layers and nested groups, round-trip exactly"""
+        with open(sample) as f:
+            scene = json.load(f)
+        decoded = decode_scene(encode_scene(scene))
+        assert decoded == scene
+        assert json.dumps(decoded, sort_keys=True) == json.dumps(scene, sort_keys=True)
+
+    def test_values_outside_columns_are_preserved(self):
+        """Non-float32 coordinates, odd entities and nested data stay exact"""
+        scene = {
+            "entities": [
+                {"id": "a", "type": "platform", "position": {"x": 0.1, "y": 2.5}},
+                {"id": "b", "position": {"x": 1 << 30, "y": -3}, "size": {"width": 1.5}},
+                {"id": 7, "name": None, "position": {"x": 1, "y": 2.0}},
+                {"id": "g", "type": "entity_group", "children": [{"id": "c", "type": "x"}]},
+            ],
+            "layers": [{"id": "bg", "entities": []}, {"id": "fg", "entities": ["raw"]}],
+            "metadata": {"big": -(1 << 70), "ratio": -0.25, "unicode": "héllo ✓", "tags": [1, "a"]},
+        }
+        assert decode_scene(encode_scene(scene)) == scene
+
+    def test_int_and_float_coordinates_keep_their_type(self):
+        """Integer columns decode as ints, float columns as floats"""
+        scene = {
+            "entities": [
+                {"id": "a", "position": {"x": 3, "y": 4}, "size": {"width": 0.5, "height": 2.0}}
+            ]
+        }
+        entity = decode_scene(encode_scene(scene))["entities"][0]
+        assert type(entity["position"]["x"]) is int
+        assert type(entity["size"]["width"]) is float
+
+
+class TestFormat:
+    """Test size and validation of the binary format"""
+
+    def test_large_scene_is_much_smaller(self):
+        """Large levels shrink at least 5x compared to the JSON export"""
+        scene = _large_scene()
+        binary = encode_scene(scene)
+        assert len(json.dumps(scene, indent=2)) / len(binary) >= 5
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"JSON" + bytes(24), encode_scene({"a": 1})[:-1]],
+        ids=["empty", "bad-magic", "truncated"],
+    )
+    def test_malformed_data(self, data):
+        """Malformed input raises SceneDecodeError"""
+        with pytest.raises(SceneDecodeError):
+            decode_scene(data)
+
+    def test_unknown_version(self):
+        """Future format versions are rejected"""
+        data = bytearray(encode_scene({"a": 1}))
+        data[4] = 99
+        with pytest.raises(SceneDecodeError, match="version"):
+            decode_scene(bytes(data))
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            (SCENE_BINARY_MEDIA_TYPE, True),
+            (f"application/json;q=0.5, {SCENE_BINARY_MEDIA_TYPE}", True),
+            (f"{SCENE_BINARY_MEDIA_TYPE};q=0", False),
+            (f"{SCENE_BINARY_MEDIA_TYPE}; q=0.0", False),
+            (f"{SCENE_BINARY_MEDIA_TYPE};Q=0.00", False),
+            (f"{SCENE_BINARY_MEDIA_TYPE};q=0.5", True),
+            (f"{SCENE_BINARY_MEDIA_TYPE};q=bogus", False),
+            ("application/json", False),
+            (None, False),
+        ],
+    )
+    def test_accept_negotiation(self, accept, expected):
+        """Binary is only served when explicitly accepted"""
+        assert wants_binary_scene(accept) is expected
+
+
+class TestSampleEndpoint:
+    """Test content negotiation on GET /api/generation/samples/{name}"""
+
+    def test_binary_and_json_responses_match(self):
+        """Binary responses decode to the JSON representation"""
+        client = TestClient(app)
+        name = inference_client.list_golden_samples()[0]["name"]
+        url = f"/api/generation/samples/{name}"
+
+        as_json = client.get(url)
+        as_binary = client.get(url, headers={"Accept": SCENE_BINARY_MEDIA_TYPE})
+
+        assert as_json.headers["content-type"] == "application/json"
+        assert as_binary.headers["content-type"] == SCENE_BINARY_MEDIA_TYPE
+        assert "Accept" in as_binary.headers["vary"]
+        assert decode_scene(as_binary.content) == as_json.json()
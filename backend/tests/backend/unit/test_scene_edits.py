@@ -0,0 +1,157 @@
+"""
+Unit tests for incremental scene edits
+"""
+
+import copy
+import time
+
+import pytest
+from app.services.postprocessor import Postprocessor, SceneEditError
+
+
+def _platform(i: int, x: float, y: float = 500) -> dict:
+    return {
+        "id": f"platform_{i}",
+        "type": "platform",
+        "position": {"x": x, "y": y},
+        "size": {"width": 100, "height": 20},
+    }
+
+
+def _processed_scene(count: int, enhance: bool = True) -> dict:
+    postprocessor = Postprocessor()
+    raw = {
+        "id": "scene_1",
+        "name": "Edits",
+        "style": "platformer",
+        # Rows of non-overlapping platforms
+        "entities": [_platform(i, (i % 100) * 150, (i // 100) * 50) for i in range(count)],
+    }
+    scene = postprocessor.process_scene(raw, project_id="proj_001")
+    # Full enhancement resolves overlaps pairwise, which is too slow for large scenes
+    return postprocessor.enhance_scene(scene) if enhance else scene
+
+
+@pytest.fixture
+def postprocessor():
+    return Postprocessor()
+
+
+class TestApplyEntityEdits:
+    """Test the incremental edit pipeline"""
+
+    def test_update_add_remove(self, postprocessor):
+        scene = _processed_scene(10)
+        original = copy.deepcopy(scene)
+        edited, touched = postprocessor.apply_entity_edits(
+            scene,
+            [
+                {"op": "update", "id": "platform_2", "changes": {"size": {"width": 40}}},
+                {"op": "add", "entity": {"id": "coin", "type": "item", "position": [1, 2]}},
+                {"op": "remove", "id": "platform_5"},
+            ],
+        )
+
+        assert scene == original
+        assert touched == ["platform_2", "coin"]
+        ids = [entity["id"] for entity in edited["entities"]]
+        assert "platform_5" not in ids and ids[-1] == "coin"
+        assert edited["metadata"]["entity_count"] == 10
+
+        resized = edited["entities"][2]
+        assert resized["size"] == {"width": 40.0, "height": 20.0}
+        assert resized["collision_box"]["size"] == resized["size"]
+        assert resized["properties"]["solid"] is True
+
+        coin = edited["entities"][-1]
+        # Normalized to the origin, then pushed clear of platform_0
+        assert coin["position"] == {"x": 110.0, "y": 0.0}
+        assert coin["properties"]["collectable"] is True
+        assert "physics" in coin["properties"] and "collision_box" in coin
+
+        # Untouched entities are shared, not copied
+        assert edited["entities"][0] is scene["entities"][0]
+
+    def test_touched_entity_is_pushed_clear_of_neighbours(self, postprocessor):
+        scene = _processed_scene(300)
+        edited, _ = postprocessor.apply_entity_edits(
+            scene,
+            [
+                {
+                    "op": "update",
+                    "id": "platform_1",
+                    "changes": {"position": {"x": 310}, "size": {"width": 30}},
+                }
+            ],
+        )
+        moved = edited["entities"][1]
+        # platform_2 spans x=300..400; the edited platform fits in the gap after it
+        assert moved["position"] == {"x": 410.0, "y": 0.0}
+        assert all(
+            not postprocessor._entities_overlap(moved, other)
+            for other in edited["entities"]
+            if other is not moved
+        )
+        assert edited["entities"][2] is scene["entities"][2]
+
+    @pytest.mark.parametrize(
+        "operation, message",
+        [
+            ({"op": "update", "id": "missing", "changes": {}}, "not found"),
+            ({"op": "remove", "id": "missing"}, "not found"),
+            ({"op": "add", "entity": {"id": "platform_0"}}, "already exists"),
+            ({"op": "update", "id": "platform_0", "changes": {"id": "other"}}, "cannot be changed"),
+            ({"op": "rotate", "id": "platform_0"}, "Unknown"),
+        ],
+    )
+    def test_invalid_edits(self, postprocessor, operation, message):
+        with pytest.raises(SceneEditError, match=message):
+            postprocessor.apply_entity_edits(_processed_scene(3), [operation])
+
+    def test_latency_does_not_follow_full_pipeline(self, postprocessor):
+        """An edit of a large scene stays far cheaper than reprocessing it"""
+        scene = _processed_scene(20000, enhance=False)
+        operations = [{"op": "update", "id": "platform_5", "changes": {"position": {"y": 7}}}]
+
+        start = time.perf_counter()
+        edited, _ = postprocessor.apply_entity_edits(scene, operations)
+        elapsed = time.perf_counter() - start
+
+        assert edited["entities"][5]["position"]["y"] == 7.0
+        assert elapsed < 0.1
+
+
+class TestEditEndpoint:
+    """Test PATCH /api/scenes/{id}"""
+
+    def test_edit_creates_version(self, test_client):
+        scene = _processed_scene(20)
+        scene_id = test_client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": scene}
+        ).json()["id"]
+
+        response = test_client.patch(
+            f"/api/scenes/{scene_id}",
+            json={
+                "operations": [
+                    {"op": "update", "id": "platform_3", "changes": {"name": "Ledge"}},
+                    {"op": "remove", "id": "platform_4"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
+        assert response.json()["touched_entities"] == ["platform_3"]
+
+        latest = test_client.get(f"/api/scenes/{scene_id}").json()
+        assert latest["entities"][3]["name"] == "Ledge"
+        assert len(latest["entities"]) == 19
+        assert test_client.get(f"/api/scenes/{scene_id}?version=1").json() == scene
+
+        versions = test_client.get(f"/api/scenes/{scene_id}/versions").json()
+        assert versions[1]["patch_size"] < 200
+
+        invalid = test_client.patch(
+            f"/api/scenes/{scene_id}", json={"operations": [{"op": "remove", "id": "nope"}]}
+        )
+        assert invalid.status_code == 422
@@ -0,0 +1,200 @@
+"""
+Unit tests for JSON Patch diffs and scene version history
+"""
+
+import copy
+
+import pytest
+from app.config import settings
+from app.services import scene_service
+from app.services.scene_cache import scene_cache
+from app.utils.json_patch import JsonPatchError, apply_patch, make_patch
+from app.utils.scene_codec import SCENE_BINARY_MEDIA_TYPE, decode_scene
+from app.utils.serialization import dumps
+
+
+def _scene(count: int) -> dict:
+    return {
+        "id": "scene_1",
+        "scene_name": "Versioned",
+        "style": "platformer",
+        "entities": [
+            {
+                "id": f"entity_{i}",
+                "type": "platform",
+                "position": {"x": i * 10, "y": 500},
+                "size": {"width": 100, "height": 20},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+class TestJsonPatch:
+    """Test structural diffs"""
+
+    def test_round_trip(self):
+        src = _scene(20)
+        dst = copy.deepcopy(src)
+        dst["entities"][3]["position"]["x"] = 999
+        del dst["entities"][7]
+        dst["entities"].insert(10, {"id": "new", "type": "goal"})
+        dst["entities"].append({"id": "tail", "type": "enemy"})
+        dst["metadata"] = {"width": 1920}
+        del dst["style"]
+        patch = make_patch(src, dst)
+        assert apply_patch(src, patch) == dst
+        assert src == _scene(20)
+
+    def test_patch_size_follows_edit_size(self):
+        src = _scene(2000)
+        dst = copy.deepcopy(src)
+        dst["entities"][1000]["position"]["y"] = 1
+        assert make_patch(src, dst) == [
+            {"op": "replace", "path": "/entities/1000/position/y", "value": 1}
+        ]
+
+        dst = copy.deepcopy(src)
+        del dst["entities"][500]
+        assert make_patch(src, dst) == [{"op": "remove", "path": "/entities/500"}]
+
+    def test_equal_documents(self):
+        assert make_patch(_scene(5), _scene(5)) == []
+
+    def test_pointer_escaping(self):
+        src = {"a/b": 1, "c~d": 2}
+        dst = {"a/b": 2}
+        patch = make_patch(src, dst)
+        assert {"op": "replace", "path": "/a~1b", "value": 2} in patch
+        assert {"op": "remove", "path": "/c~0d"} in patch
+        assert apply_patch(src, patch) == dst
+
+    def test_rfc_operations(self):
+        doc = {"foo": ["bar", "baz"], "qux": {"a": 1}}
+        patched = apply_patch(
+            doc,
+            [
+                {"op": "test", "path": "/qux/a", "value": 1},
+                {"op": "add", "path": "/foo/-", "value": "end"},
+                {"op": "move", "from": "/qux/a", "path": "/moved"},
+                {"op": "copy", "from": "/foo/0", "path": "/first"},
+            ],
+        )
+        assert patched == {"foo": ["bar", "baz", "end"], "qux": {}, "moved": 1, "first": "bar"}
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/foo/5", "value": 1},
+            {"op": "test", "path": "/foo/0", "value": "nope"},
+            {"op": "add", "path": "foo", "value": 1},
+            {"op": "frobnicate", "path": "/foo"},
+        ],
+    )
+    def test_invalid_operations(self, op):
+        with pytest.raises(JsonPatchError):
+            apply_patch({"foo": ["bar"]}, [op])
+
+
+class TestSceneService:
+    """Test versioned scene storage"""
+
+    def _edit_versions(self, db, count):
+        scene = scene_service.create_scene(db, "proj_001", _scene(50))
+        expected = [_scene(50)]
+        for i in range(1, count):
+            data = copy.deepcopy(expected[-1])
+            data["entities"][i % 50]["position"]["x"] = -i
+            scene_service.update_scene(db, scene, data)
+            expected.append(data)
+        return scene, expected
+
+    def test_rebuilds_every_version(self, test_db_session, monkeypatch):
+        monkeypatch.setattr(settings, "scene_snapshot_interval", 4)
+        scene, expected = self._edit_versions(test_db_session, 10)
+
+        assert scene_service.head_version(test_db_session, scene.id) == 10
+        for version, data in enumerate(expected, start=1):
+            assert scene_service.get_scene_version(test_db_session, scene, version) == data
+        assert scene_service.get_scene_version(test_db_session, scene, 11) is None
+
+        rows = scene_service.list_versions(test_db_session, scene.id)
+        assert [row.version for row in rows if row.snapshot] == [1, 5, 9]
+        assert all(0 < row.patch_size < 200 for row in rows[1:])
+
+    def test_unchanged_data_is_not_a_version(self, test_db_session):
+        scene = scene_service.create_scene(test_db_session, "proj_001", _scene(3))
+        assert scene_service.update_scene(test_db_session, scene, _scene(3), name="Renamed") == 1
+        assert scene.name == "Renamed"
+
+    def test_created_scene_serves_its_own_data(self, test_db_session):
+        """Bytes cached under the generated scene's own ID are not reused"""
+        scene_cache.serialize("scene_1", {"id": "scene_1", "scene_name": "Another request"})
+        scene = scene_service.create_scene(test_db_session, "proj_001", _scene(3))
+
+        _, serialized = scene_service.serialize_scene_version(test_db_session, scene)
+        assert serialized.json == dumps(_scene(3))
+
+    def test_delete_removes_history(self, test_db_session):
+        scene, _ = self._edit_versions(test_db_session, 3)
+        scene_id = scene.id
+        scene_service.delete_scene(test_db_session, scene)
+        assert scene_service.get_scene(test_db_session, scene_id) is None
+        assert scene_service.list_versions(test_db_session, scene_id) == []
+
+
+class TestScenesRouter:
+    """Test the scenes API"""
+
+    def test_crud_and_versions(self, test_client):
+        created = test_client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": _scene(10)}
+        )
+        assert created.status_code == 201
+        scene_id = created.json()["id"]
+        assert created.json()["name"] == "Versioned"
+        assert created.json()["version"] == 1
+
+        edited = _scene(10)
+        edited["entities"][2]["position"]["x"] = 1234
+        updated = test_client.put(f"/api/scenes/{scene_id}", json={"scene_data": edited})
+        assert updated.status_code == 200
+        assert updated.json()["version"] == 2
+
+        latest = test_client.get(f"/api/scenes/{scene_id}")
+        assert latest.json() == edited
+        assert latest.headers["x-scene-version"] == "2"
+        original = test_client.get(f"/api/scenes/{scene_id}", params={"version": 1})
+        assert original.json() == _scene(10)
+        assert original.headers["x-scene-version"] == "1"
+        assert test_client.get(f"/api/scenes/{scene_id}?version=3").status_code == 404
+
+        versions = test_client.get(f"/api/scenes/{scene_id}/versions").json()
+        assert [v["version"] for v in versions] == [1, 2]
+        assert versions[0]["snapshot"] and not versions[1]["snapshot"]
+        assert versions[1]["patch_size"] < len(dumps(edited))
+
+        listed = test_client.get("/api/scenes/", params={"project_id": "proj_001"}).json()
+        assert [(s["id"], s["version"]) for s in listed] == [(scene_id, 2)]
+
+        assert test_client.delete(f"/api/scenes/{scene_id}").status_code == 204
+        assert test_client.get(f"/api/scenes/{scene_id}").status_code == 404
+
+    def test_negotiation_and_conditional_requests(self, test_client):
+        scene_id = test_client.post(
+            "/api/scenes/", json={"project_id": "proj_001", "scene_data": _scene(50)}
+        ).json()["id"]
+
+        response = test_client.get(f"/api/scenes/{scene_id}", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        cached = test_client.get(f"/api/scenes/{scene_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        binary = test_client.get(
+            f"/api/scenes/{scene_id}", headers={"Accept": SCENE_BINARY_MEDIA_TYPE}
+        )
+        assert binary.headers["content-type"] == SCENE_BINARY_MEDIA_TYPE
+        assert binary.headers["etag"] != etag
+        assert decode_scene(binary.content)["entities"] == _scene(50)["entities"]
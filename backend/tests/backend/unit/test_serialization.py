@@ -0,0 +1,147 @@
+"""
+Unit tests for fast JSON serialization and the scene cache
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.database import get_db
+from app.main import app
+from app.routers import generation as generation_router
+from app.schemas.generation import GenerationResponse
+from app.services.inference_client import inference_client
+from app.services.scene_cache import SceneCache
+from app.utils.serialization import dumps, json_fragment, loads
+from fastapi.testclient import TestClient
+
+
+class TestDumps:
+    """Test the orjson-backed serializer"""
+
+    def test_matches_stdlib_for_scenes(self):
+        """Golden samples serialize to the same data as the stdlib encoder"""
+        for sample in inference_client.golden_samples:
+            assert loads(dumps(sample["data"])) == json.loads(json.dumps(sample["data"]))
+
+    def test_extended_types(self):
+        """Datetimes, UUIDs, models, sets and non-string keys are supported"""
+        value = {
+            "when": datetime(2024, 1, 2, tzinfo=timezone.utc),
+            "id": uuid.UUID(int=1),
+            "response": GenerationResponse(scene_id="s", scene={}, generation_time=0.5),
+            "tags": {"a"},
+            1: "one",
+        }
+        data = loads(dumps(value))
+        assert data["when"] == "2024-01-02T00:00:00+00:00"
+        assert data["id"] == str(uuid.UUID(int=1))
+        assert data["response"]["generation_time"] == 0.5
+        assert data["tags"] == ["a"]
+        assert data["1"] == "one"
+
+    def test_sort_keys_and_indent(self):
+        """Canonical and pretty output options"""
+        assert dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+        assert dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+    def test_fragments_are_embedded_verbatim(self):
+        """Pre-serialized bytes are not re-encoded"""
+        scene = dumps({"id": "scene_1", "entities": []})
+        assert loads(dumps({"scene": json_fragment(scene)})) == {
+            "scene": {"id": "scene_1", "entities": []}
+        }
+
+
+class TestSceneCache:
+    """Test the serialized scene cache"""
+
+    def test_hits_return_cached_bytes(self):
+        """Repeated serialization of the same version is a cache hit"""
+        cache = SceneCache(max_bytes=1024)
+        first = cache.serialize("scene_1", {"a": 1}, version=1)
+        assert cache.serialize("scene_1", {"ignored": True}, version=1) is first
+        assert first.json == b'{"a":1}'
+
+    def test_new_version_replaces_old(self):
+        """Edited scenes are re-serialized and the old bytes dropped"""
+        cache = SceneCache(max_bytes=1024)
+        cache.serialize("scene_1", {"a": 1}, version=1)
+        updated = cache.serialize("scene_1", {"a": 2}, version=2)
+        assert updated.json == b'{"a":2}'
+        assert cache.get("scene_1", version=1) is None
+
+    def test_evicts_least_recently_used(self):
+        """The cache stays under its byte budget"""
+        cache = SceneCache(max_bytes=30)
+        cache.serialize("a", {"v": "x" * 5})
+        cache.serialize("b", {"v": "y" * 5})
+        cache.get("a")
+        cache.serialize("c", {"v": "z" * 5})
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_invalidate_and_oversized(self):
+        """Invalidated and oversized scenes are not kept"""
+        cache = SceneCache(max_bytes=16)
+        cache.serialize("a", {"v": 1})
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        cache.serialize("big", {"v": "x" * 100})
+        assert cache.get("big") is None
+
+
+class TestGenerationResponse:
+    """Test the pre-serialized generation response"""
+
+    def _generate(self, results, project_ids):
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        try:
+            with (
+                patch.object(
+                    generation_router.inference_client,
+                    "generate_scene",
+                    AsyncMock(side_effect=results),
+                ),
+                patch.object(generation_router, "log_generation"),
+                patch.object(generation_router, "save_scene_to_db"),
+            ):
+                client = TestClient(app)
+                return [
+                    client.post(
+                        "/api/generation/", json={"prompt": "a level", "project_id": project_id}
+                    )
+                    for project_id in project_ids
+                ]
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_scene_is_embedded(self):
+        """The response carries the scene and matches the response schema"""
+        sample = inference_client.golden_samples[0]["data"]
+        result = {"scene": sample, "metadata": {"status": "fallback", "model_version": "test"}}
+
+        (response,) = self._generate([result], ["proj_001"])
+
+        assert response.status_code == 200
+        body = GenerationResponse(**response.json())
+        assert body.scene["id"] == sample["id"]
+
+    def test_scenes_sharing_an_id_are_not_mixed_up(self):
+        """Each request gets its own scene, even when scene IDs repeat"""
+        sample = inference_client.golden_samples[0]["data"]
+        results = [
+            {
+                "scene": {**sample, "scene_name": name},
+                "metadata": {"status": "fallback", "model_version": "test"},
+            }
+            for name in ("first", "second")
+        ]
+
+        first, second = self._generate(results, ["proj_a", "proj_b"])
+
+        assert first.json()["scene_id"] == second.json()["scene_id"]
+        assert first.json()["scene"]["scene_name"] == "first"
+        assert second.json()["scene"]["scene_name"] == "second"
@@ -0,0 +1,75 @@
+"""
+Unit tests for the streaming zip writer and HTML5 export stream
+"""
+
+import io
+import zipfile
+
+from app.services.export_service import create_html5_export, iter_html5_export
+from app.utils.zip_stream import stream_zip
+
+
+def _chunks(count: int, size: int = 64 * 1024):
+    for i in range(count):
+        yield bytes([i % 256]) * size
+
+
+class TestStreamZip:
+    """Test incremental zip encoding"""
+
+    def test_archive_is_valid(self):
+        """Mixed bytes, text and chunked entries round-trip through zipfile"""
+        archive = b"".join(
+            stream_zip(
+                [
+                    ("a.txt", "hello"),
+                    ("b.bin", b"\x00\x01"),
+                    ("big.dat", _chunks(8)),
+                    ("sprite.png", _chunks(2)),
+                ]
+            )
+        )
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            assert zf.read("a.txt") == b"hello"
+            assert zf.read("b.bin") == b"\x00\x01"
+            assert zf.read("big.dat") == b"".join(_chunks(8))
+            assert zf.getinfo("sprite.png").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("big.dat").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_output_is_incremental(self):
+        """No yielded chunk grows with the total archive size"""
+        total = 64 * 1024 * 64
+        largest = max(len(chunk) for chunk in stream_zip([("asset.png", _chunks(64))]))
+        assert largest < total // 16
+
+    def test_entries_are_consumed_lazily(self):
+        """Entry content is not started until the stream reaches it"""
+        started = []
+
+        def lazy():
+            started.append(True)
+            yield b"data"
+
+        stream = stream_zip([("first.txt", "x"), ("second.bin", lazy())])
+        next(stream)
+        assert not started
+        list(stream)
+        assert started
+
+
+class TestHtml5ExportStream:
+    """Test the HTML5 export package stream"""
+
+    def test_bundles_assets(self):
+        """Asset entries are written under assets/"""
+        scene = {"id": "scene_001", "name": "Test", "entities": []}
+        archive = b"".join(iter_html5_export(scene, [("/sprites/hero.png", _chunks(1, 10))]))
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            names = set(zf.namelist())
+        assert {"index.html", "scene.json", "README.md", "assets/sprites/hero.png"} <= names
+
+    def test_bytes_helper_matches_stream(self):
+        """create_html5_export still returns a complete archive"""
+        archive = create_html5_export({"id": "scene_001", "entities": []})
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            assert "index.html" in zf.namelist()